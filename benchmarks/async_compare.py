@@ -0,0 +1,93 @@
+"""
+Wall time, worker utilization and final thrust of the asynchronous
+steady-state DE (optimization.algorithm "async_de") against the
+generational DE, over the same seeds and evaluation budget, with solve
+times that vary from design to design. Utilization is the time the
+workers spent in XROTOR's operate() over workers x wall time. Uses the
+stand-in solver unless --real-xrotor is given.
+
+Example (from the repository root):
+    python benchmarks/async_compare.py --workers 4 --latency 0.01 --latency-spread 20
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(ROOT, "benchmarks", "stub")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asynchronous steady-state DE vs generational DE")
+    parser.add_argument("-f", "--file", default="thrust-cruise.json", help="Input JSON filename in processing/inputs")
+    parser.add_argument("--seeds", type=int, default=3, help="Number of seeds (runs per variant)")
+    parser.add_argument("--generations", type=int, default=20, help="Generations per run")
+    parser.add_argument("--pop-size", type=int, default=16, help="Population size")
+    parser.add_argument("--workers", type=int, default=4, help="Evaluation workers")
+    parser.add_argument("--latency", type=float, default=0.01, help="Stand-in solver: seconds per solve (fastest design)")
+    parser.add_argument("--latency-spread", type=float, default=20.0, help="Stand-in solver: slowest / fastest solve time")
+    parser.add_argument("--real-xrotor", action="store_true", help="Use the installed xrotor package instead of the stand-in")
+    parser.add_argument("--out", help="Write the per-run results to this JSON file")
+    args = parser.parse_args()
+
+    if not args.real_xrotor:
+        sys.path.insert(0, STUB_DIR)
+        # Worker processes import the stand-in too
+        os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [STUB_DIR, os.environ.get("PYTHONPATH")]))
+        os.environ["XROTOR_STUB_LATENCY"] = str(args.latency)
+        os.environ["XROTOR_STUB_LATENCY_SPREAD"] = str(args.latency_spread)
+    sys.path.insert(0, ROOT)
+    from src.multistart import restart_seeds
+    from src.optimizer import run_optimization
+
+    with open(os.path.join(ROOT, "processing", "inputs", args.file)) as f:
+        cfg = json.load(f)
+    cfg.pop("evaluationCache", None)
+    cfg["profiling"] = {"enabled": True}
+    opt_cfg = cfg.setdefault("optimization", {})
+    for block in ("checkpoint", "surrogate", "multi_fidelity", "distributed"):
+        opt_cfg.pop(block, None)
+    opt_cfg["n_workers"] = args.workers
+
+    variants = ("de", "async_de")
+    runs = []
+    for seed in restart_seeds(0, args.seeds):
+        for name in variants:
+            c = copy.deepcopy(cfg)
+            c["optimization"]["algorithm"] = name
+            t0 = time.perf_counter()
+            res = run_optimization(c, n_gen=args.generations, pop_size=args.pop_size, seed=seed, verbose=False)
+            wall = time.perf_counter() - t0
+            busy = res.profile["stages"].get("operate", [0, 0.0])[1]
+            runs.append({
+                "variant": name,
+                "seed": seed,
+                "evaluations": res.algorithm.evaluator.n_eval,
+                "seconds": wall,
+                "utilization": busy / (args.workers * wall),
+                "thrust": None if res.F is None else float(-res.F[0]),
+            })
+
+    print(f"\n{'variant':<10} | {'evaluations':>11} | {'seconds':>8} | {'evals/s':>8} | {'utilization':>11} | {'thrust mean (N)':>15}")
+    print("-" * 80)
+    for name in variants:
+        rows = [r for r in runs if r["variant"] == name]
+        evals = np.mean([r["evaluations"] for r in rows])
+        seconds = np.mean([r["seconds"] for r in rows])
+        util = np.mean([r["utilization"] for r in rows])
+        thrust = np.array([r["thrust"] for r in rows if r["thrust"] is not None])
+        thrust_text = f"{thrust.mean():>15.2f}" if len(thrust) else f"{'-':>15}"
+        print(f"{name:<10} | {evals:>11.0f} | {seconds:>8.2f} | {evals / seconds:>8.1f} | {100.0 * util:>10.1f}% | {thrust_text}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(runs, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Throughput benchmarks for the evaluation pipeline.
+
+By default the solver is the deterministic stand-in in benchmarks/stub,
+so the suite runs without an XROTOR install; pass --real-xrotor to use
+the installed package instead. benchmarks/baselines/stub.json is a
+reference run with the default options; timings are machine-specific, so
+compare changes against a baseline recorded on the same machine.
+
+Examples (from the repository root):
+    python benchmarks/run_benchmarks.py --save benchmarks/baselines/local.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baselines/local.json
+    python benchmarks/run_benchmarks.py --latency 0.002 --failure-rate 0.05 --workers 4
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(ROOT, "benchmarks", "stub")
+
+DEFAULT_SIZES = [16, 64, 256, 1024, 4096]
+
+# Peak memory differences below this are noise, whatever the tolerance
+MEMORY_FLOOR_MB = 0.5
+
+
+def _timeit(fn, repeat):
+    """Best wall time of `repeat` calls of fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak_memory_mb(fn):
+    """Peak Python heap allocation (MB) during one call of fn()."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def bench_decode(cfg, n_calls, repeat):
+    from src.geometry_param import decode_design
+
+    X = np.random.default_rng(0).random((n_calls, 10))
+    bounds, geom = cfg["geometryBounds"], cfg["geometryGlobal"]
+
+    def run():
+        for x in X:
+            decode_design(x, bounds, geom)
+
+    seconds = _timeit(run, repeat)
+    return {"calls": n_calls, "seconds": seconds, "calls_per_sec": n_calls / seconds}
+
+
+def bench_objective(cfg, n_calls, repeat):
+    from src.objective_function import ThrustCruiseObjective
+
+    obj = ThrustCruiseObjective(cfg)
+    X = np.random.default_rng(1).random((n_calls, 10))
+
+    def run():
+        with obj.xr.quiet():
+            for x in X:
+                obj(x)
+
+    seconds = _timeit(run, repeat)
+    return {"calls": n_calls, "seconds": seconds, "evals_per_sec": n_calls / seconds}
+
+
+def bench_evaluate(cfg, sizes, repeat):
+    from src.optimizer import ThrustCruiseProblem
+
+    results = {}
+    problem = ThrustCruiseProblem(cfg)
+    try:
+        for n in sizes:
+            X = np.random.default_rng(n).random((n, problem.n_var))
+
+            def run():
+                problem._evaluate(X, {})
+
+            seconds = _timeit(run, repeat)
+            results[f"evaluate_{n}"] = {
+                "designs": n,
+                "seconds": seconds,
+                "evals_per_sec": n / seconds,
+                "peak_mem_mb": _peak_memory_mb(run),
+            }
+    finally:
+        problem.close()
+    return results
+
+
+def bench_run(cfg, n_gen, pop_size):
+    from src.optimizer import run_optimization
+
+    t0 = time.perf_counter()
+    res = run_optimization(cfg, n_gen=n_gen, pop_size=pop_size, seed=1, verbose=False)
+    seconds = time.perf_counter() - t0
+    n_eval = res.algorithm.evaluator.n_eval
+    return {
+        "generations": n_gen,
+        "pop_size": pop_size,
+        "evaluations": n_eval,
+        "seconds": seconds,
+        "evals_per_sec": n_eval / seconds,
+        "best_f": None if res.F is None else float(res.F[0]),
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, tolerance):
+    """
+    Print a comparison table and return the names of the benchmarks that
+    lost more than `tolerance` (fraction) of their throughput or grew their
+    peak memory by more than `tolerance` (and more than MEMORY_FLOOR_MB).
+    """
+    regressions = []
+    print(f"\n{'benchmark':<20} | {'baseline/s':>12} | {'current/s':>12} | {'ratio':>6} | memory")
+    print("-" * 72)
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+
+        key = "calls_per_sec" if "calls_per_sec" in cur else "evals_per_sec"
+        ratio = cur[key] / base[key]
+        flag = ""
+        if ratio < 1.0 - tolerance:
+            flag = "  SLOWER"
+            regressions.append(name)
+
+        mem = ""
+        if "peak_mem_mb" in cur and "peak_mem_mb" in base:
+            mem = f"{base['peak_mem_mb']:.1f} -> {cur['peak_mem_mb']:.1f} MB"
+            growth = cur["peak_mem_mb"] - base["peak_mem_mb"]
+            if growth > MEMORY_FLOOR_MB and growth > base["peak_mem_mb"] * tolerance:
+                flag += "  MORE MEMORY"
+                if name not in regressions:
+                    regressions.append(name)
+
+        print(f"{name:<20} | {base[key]:>12.1f} | {cur[key]:>12.1f} | {ratio:>6.2f} | {mem}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluation pipeline benchmarks")
+    parser.add_argument("-f", "--file", default="thrust-cruise.json", help="Input JSON filename in processing/inputs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Population sizes for _evaluate")
+    parser.add_argument("--calls", type=int, default=500, help="Designs for the decode/objective benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per benchmark (best time is kept)")
+    parser.add_argument("--workers", type=int, default=1, help="Evaluation workers for _evaluate and the short run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stand-in solver: seconds per solve")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Stand-in solver: fraction of failing designs")
+    parser.add_argument("--run-gen", type=int, default=5, help="Generations of the short optimization run")
+    parser.add_argument("--run-pop", type=int, default=16, help="Population of the short optimization run")
+    parser.add_argument("--real-xrotor", action="store_true", help="Use the installed xrotor package instead of the stand-in")
+    parser.add_argument("--save", help="Write the results to this JSON baseline")
+    parser.add_argument("--compare", help="Compare against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional slowdown/memory growth before flagging")
+    args = parser.parse_args()
+
+    # Worker processes inherit sys.path and the environment
+    if not args.real_xrotor:
+        sys.path.insert(0, STUB_DIR)
+    sys.path.insert(0, ROOT)
+    os.environ["XROTOR_STUB_LATENCY"] = str(args.latency)
+    os.environ["XROTOR_STUB_FAILURE_RATE"] = str(args.failure_rate)
+
+    with open(os.path.join(ROOT, "processing", "inputs", args.file)) as f:
+        cfg = json.load(f)
+
+    # Measure the solver path itself: no cache, no profiling hooks
+    cfg = copy.deepcopy(cfg)
+    cfg.pop("evaluationCache", None)
+    cfg.pop("profiling", None)
+    opt_cfg = cfg.setdefault("optimization", {})
+    opt_cfg["n_workers"] = args.workers
+    opt_cfg.pop("checkpoint", None)
+
+    results = {}
+    print("decode_design ...")
+    results["decode_design"] = bench_decode(cfg, args.calls, args.repeat)
+    print("objective call ...")
+    results["objective_call"] = bench_objective(cfg, args.calls, args.repeat)
+    print(f"_evaluate at sizes {args.sizes} ...")
+    results.update(bench_evaluate(cfg, args.sizes, args.repeat))
+    print(f"run_optimization ({args.run_gen} x {args.run_pop}) ...")
+    results["run_optimization"] = bench_run(cfg, args.run_gen, args.run_pop)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "config": args.file,
+            "solver": "xrotor" if args.real_xrotor else "stub",
+            "latency": args.latency,
+            "failure_rate": args.failure_rate,
+            "workers": args.workers,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    print(f"\n{'benchmark':<20} | {'rate (/s)':>12} | {'seconds':>9} | memory")
+    print("-" * 60)
+    for name, r in results.items():
+        rate = r.get("calls_per_sec", r.get("evals_per_sec"))
+        mem = f"{r['peak_mem_mb']:.1f} MB" if "peak_mem_mb" in r else ""
+        print(f"{name:<20} | {rate:>12.1f} | {r['seconds']:>9.4f} | {mem}")
+
+    if args.save:
+        dirname = os.path.dirname(args.save)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nBaseline saved to: {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {100 * args.tolerance:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
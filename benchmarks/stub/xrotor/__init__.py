@@ -0,0 +1,90 @@
+"""
+Deterministic stand-in for the xrotor package, for benchmarking only.
+
+Implements the small part of the xrotor API used by XRotorWrapper
+(XRotor()._lib.init, XRotor.case, XRotor.operate, XRotor.performance and
+xrotor.model.Case.from_dict). Performance comes from a blade-element
+estimate without induction, so results depend only on the geometry.
+
+Environment variables (read on every solve, so worker processes follow
+the parent's settings):
+- XROTOR_STUB_LATENCY      : extra seconds spent in every operate() call
+- XROTOR_STUB_LATENCY_SPREAD : ratio of the slowest to the fastest solve;
+                             each design's latency is scaled by a factor
+                             between 1 and this, chosen by a hash of the geometry
+- XROTOR_STUB_FAILURE_RATE : fraction of designs whose solve raises,
+                             chosen by a hash of the geometry
+"""
+import hashlib
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from .model import Case
+
+
+class _Lib:
+    def init(self):
+        pass
+
+
+class XRotor:
+    def __init__(self):
+        self._lib = _Lib()
+        self.case = None
+        self._performance = None
+
+    def operate(self, rpm):
+        latency = float(os.environ.get("XROTOR_STUB_LATENCY", 0.0))
+        failure_rate = float(os.environ.get("XROTOR_STUB_FAILURE_RATE", 0.0))
+
+        cond = self.case.conditions
+        geom = self.case.disk.blade.geometry
+        radii = np.asarray(geom.radii, dtype=float)
+        chord = np.asarray(geom.chord, dtype=float)
+        twist = np.asarray(geom.twist, dtype=float)
+
+        # Like XROTOR, write some iteration output to the console
+        print(" Iter     dGmax  @Imax    gGmax  @Igmax   CTmax     rlx")
+
+        if latency > 0:
+            spread = float(os.environ.get("XROTOR_STUB_LATENCY_SPREAD", 1.0))
+            if spread > 1.0:
+                digest = hashlib.sha1(b"latency" + chord.tobytes() + twist.tobytes()).digest()
+                latency *= spread ** (int.from_bytes(digest[:8], "little") / 2.0**64)
+            time.sleep(latency)
+
+        if failure_rate > 0:
+            digest = hashlib.sha1(chord.tobytes() + twist.tobytes()).digest()
+            if int.from_bytes(digest[:8], "little") / 2.0**64 < failure_rate:
+                raise RuntimeError("stub: solution did not converge")
+
+        # Blade-element estimate on the undisturbed inflow
+        R = geom.r_tip
+        r = radii * R
+        c = chord * R
+        omega = 2.0 * np.pi * rpm / 60.0
+        Vt = omega * r
+        phi = np.arctan2(cond.vel, Vt)
+        alpha = np.radians(twist) - phi
+        cl = np.clip(2.0 * np.pi * alpha, -1.2, 1.4)
+        cd = 0.01 + 0.02 * alpha**2
+
+        q = 0.5 * cond.rho * (cond.vel**2 + Vt**2) * c * self.case.disk.n_blds
+        dT = q * (cl * np.cos(phi) - cd * np.sin(phi))
+        dQ = q * (cl * np.sin(phi) + cd * np.cos(phi)) * r
+        thrust = float(np.sum(0.5 * (dT[1:] + dT[:-1]) * np.diff(r)))
+        torque = float(np.sum(0.5 * (dQ[1:] + dQ[:-1]) * np.diff(r)))
+        power = torque * omega
+
+        self._performance = SimpleNamespace(
+            thrust=thrust,
+            power=power,
+            efficiency=thrust * cond.vel / power if power > 0 else 0.0,
+        )
+
+    @property
+    def performance(self):
+        return self._performance
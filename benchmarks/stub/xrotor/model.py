@@ -0,0 +1,22 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class Case:
+    """Stand-in for xrotor.model.Case: the nested case dict as attributes."""
+
+    @classmethod
+    def from_dict(cls, d):
+        case = cls()
+        case.conditions = SimpleNamespace(**d["conditions"])
+        case.settings = SimpleNamespace(**d["settings"])
+        geometry = SimpleNamespace(**{
+            key: np.asarray(value) if isinstance(value, (list, np.ndarray)) else value
+            for key, value in d["disk"]["blade"]["geometry"].items()
+        })
+        case.disk = SimpleNamespace(
+            n_blds=d["disk"]["n_blds"],
+            blade=SimpleNamespace(geometry=geometry, polars={}),
+        )
+        return case
@@ -0,0 +1,86 @@
+"""
+Solver calls and final thrust of surrogate-assisted DE against plain DE,
+over the same seeds: plain DE for the same number of generations, and
+plain DE stopped at the surrogate run's number of solver calls
+("plain_budget"). Uses the stand-in solver unless --real-xrotor is given.
+
+Example (from the repository root):
+    python benchmarks/surrogate_compare.py --seeds 5 --generations 60 --keep-fraction 0.3
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(ROOT, "benchmarks", "stub")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Surrogate-assisted vs plain DE")
+    parser.add_argument("-f", "--file", default="thrust-cruise.json", help="Input JSON filename in processing/inputs")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of seeds (runs per variant)")
+    parser.add_argument("--generations", type=int, default=60, help="Generations per run")
+    parser.add_argument("--pop-size", type=int, default=16, help="Population size")
+    parser.add_argument("--keep-fraction", type=float, default=0.3, help="Fraction of each generation sent to the solver")
+    parser.add_argument("--min-points", type=int, default=50, help="Solved designs before the surrogate starts filtering")
+    parser.add_argument("--real-xrotor", action="store_true", help="Use the installed xrotor package instead of the stand-in")
+    parser.add_argument("--out", help="Write the per-run results to this JSON file")
+    args = parser.parse_args()
+
+    if not args.real_xrotor:
+        sys.path.insert(0, STUB_DIR)
+    sys.path.insert(0, ROOT)
+    from src.multistart import restart_seeds
+    from src.optimizer import run_optimization
+
+    with open(os.path.join(ROOT, "processing", "inputs", args.file)) as f:
+        cfg = json.load(f)
+    cfg.pop("evaluationCache", None)
+    cfg.setdefault("optimization", {}).pop("checkpoint", None)
+
+    variants = ("plain", "surrogate", "plain_budget")
+    cfg["optimization"].pop("surrogate", None)
+
+    def run(name, seed, c):
+        res = run_optimization(c, n_gen=args.generations, pop_size=args.pop_size, seed=seed, verbose=False)
+        thrust = None if res.F is None else float(-res.F[0])
+        runs.append({"variant": name, "seed": seed, "solver_calls": res.solver_calls, "thrust": thrust})
+
+    runs = []
+    for seed in restart_seeds(0, args.seeds):
+        run("plain", seed, copy.deepcopy(cfg))
+
+        c = copy.deepcopy(cfg)
+        c["optimization"]["surrogate"] = {"keep_fraction": args.keep_fraction, "min_points": args.min_points}
+        run("surrogate", seed, c)
+
+        c = copy.deepcopy(cfg)
+        c["optimization"].setdefault("termination", {})["max_evals"] = runs[-1]["solver_calls"]
+        run("plain_budget", seed, c)
+
+    print(f"\n{'variant':<12} | {'solver calls':>12} | {'thrust mean (N)':>15} | {'best':>8} | {'worst':>8} | feasible")
+    print("-" * 80)
+    for name in variants:
+        rows = [r for r in runs if r["variant"] == name]
+        thrust = np.array([r["thrust"] for r in rows if r["thrust"] is not None])
+        calls = np.mean([r["solver_calls"] for r in rows])
+        if len(thrust):
+            print(f"{name:<12} | {calls:>12.0f} | {thrust.mean():>15.2f} | {thrust.max():>8.2f} | {thrust.min():>8.2f} | {len(thrust)}/{len(rows)}")
+        else:
+            print(f"{name:<12} | {calls:>12.0f} | {'-':>15} | {'-':>8} | {'-':>8} | 0/{len(rows)}")
+
+    plain = np.mean([r["solver_calls"] for r in runs if r["variant"] == "plain"])
+    assisted = np.mean([r["solver_calls"] for r in runs if r["variant"] == "surrogate"])
+    print(f"\nSolver calls saved: {100.0 * (1.0 - assisted / plain):.1f}%")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(runs, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,36 @@
 import json
+import os
+import sys
 import argparse
-from src.optimizer import run_optimization
-from src.output_process import save_results
+import numpy as np
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "evaluate":
+        return evaluate_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "sweep":
+        return sweep_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "study":
+        return study_main(sys.argv[2:])
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        return worker_main(sys.argv[2:])
+
+    # Imported here so the lightweight subcommands skip pymoo and matplotlib
+    from src.archive import EliteArchive
+    from src.checkpoint import load_manifest, write_manifest
+    from src.multistart import restart_seeds, run_multistart, select_best
+    from src.objective_function import check_tip_mach
+    from src.output_process import save_results
+    from src.profiling import merge_profiles, write_profile_report
+
     parser = argparse.ArgumentParser()
     parser.add_argument("-f", "--file", required=True, help="Input JSON filename")
     parser.add_argument("--generations", type=int, default=10000, help="Number of generations")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel evaluation workers (overrides config)")
+    parser.add_argument("--seed", type=int, default=None, help="Master seed for the restarts (overrides config)")
+    parser.add_argument("--restart-workers", type=int, default=None, help="Number of restarts run at the same time (overrides config)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoints of a previous run of this config")
+    parser.add_argument("--refine", action="store_true", help="Polish the best design with a local gradient-based refinement")
     args = parser.parse_args()
 
     input_path = f"processing/inputs/{args.file}"
@@ -18,50 +41,313 @@ def main():
     n_gen = opt_cfg.get("n_gen", 100)
     pop_size = opt_cfg.get("pop_size", 50)
     n_restarts = opt_cfg.get("n_restarts", 5)  # Default to 5 restarts
+    if args.workers is not None:
+        opt_cfg["n_workers"] = args.workers
+    if args.seed is not None:
+        opt_cfg["seed"] = args.seed
+    if args.restart_workers is not None:
+        opt_cfg["restart_workers"] = args.restart_workers
+    cfg["optimization"] = opt_cfg
+    n_workers = opt_cfg.get("n_workers", 1)
+    restart_workers = opt_cfg.get("restart_workers", 1)
+
+    # A config that fails the tip Mach limit cannot produce a feasible design
+    try:
+        check_tip_mach(cfg)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+    # Checkpointing: on when configured, or when resuming
+    ckpt_dir = None
+    if "checkpoint" in opt_cfg or args.resume:
+        stem = os.path.splitext(os.path.basename(args.file))[0]
+        ckpt_dir = opt_cfg.get("checkpoint", {}).get("dir", f"processing/checkpoints/{stem}")
+
+    # Optional on-disk population history, one directory per restart
+    history_dir = None
+    history_cfg = opt_cfg.get("history", {})
+    if history_cfg.get("enabled", bool(history_cfg)):
+        stem = os.path.splitext(os.path.basename(args.file))[0]
+        history_dir = history_cfg.get("dir", f"processing/outputs/history/{stem}")
+
+    # One seed per restart, all derived from the master seed
+    master_seed = opt_cfg.get("seed")
+    manifest = load_manifest(ckpt_dir) if args.resume else None
+    if manifest is not None:
+        # The restarts must be rebuilt with the seeds they were started with
+        master_seed = manifest["master_seed"]
+        n_restarts = manifest["n_restarts"]
+    elif args.resume:
+        print(f"No checkpoint found in {ckpt_dir}, starting a new run.")
+    if master_seed is None:
+        import secrets
+        master_seed = secrets.randbits(32)
+    seeds = restart_seeds(master_seed, n_restarts)
+
+    if ckpt_dir is not None and manifest is None:
+        write_manifest(ckpt_dir, {
+            "file": args.file,
+            "master_seed": master_seed,
+            "n_restarts": n_restarts,
+        })
 
     print(f"Running optimization using: {args.file}")
-    print(f"Generations: {n_gen}, Population: {pop_size}, Restarts: {n_restarts}")
-    
-    best_res = None
-    best_f = float("inf")
-    
-    results_summary = []
-
-    for i in range(n_restarts):
-        print(f"\n--- Run {i+1}/{n_restarts} ---")
-        # Use random seed for each run
-        res = run_optimization(cfg, n_gen=n_gen, pop_size=pop_size, seed=None)
-        
-        # Store result
+    print(f"Generations: {n_gen}, Population: {pop_size}, Restarts: {n_restarts}, Workers: {n_workers}")
+    print(f"Master seed: {master_seed} (pass --seed {master_seed} to reproduce), Restart workers: {restart_workers}")
+
+    # Optional elite archive: seeds restarts from earlier runs of this (or a nearby) config
+    archive = EliteArchive.from_config(cfg)
+    if archive is not None:
+        print(f"Elite archive: {archive.path} ({len(archive.entries)} configs)")
+
+    results = []
+
+    for res in run_multistart(cfg, n_gen, pop_size, seeds, restart_workers, ckpt_dir, args.resume, history_dir,
+                              archive):
+        results.append(res)
+        i = res.run_id
+
+        # Stream each result as it finishes
         if res.X is not None:
-            thrust = -res.F[0]
-            results_summary.append((i+1, thrust))
-            print(f"  -> Run {i+1} Result: T = {thrust:.2f} N")
-            
-            # Update best
-            if res.F[0] < best_f:
-                best_f = res.F[0]
-                best_res = res
-                print(f"  -> New Best Found!")
+            print(f"  -> Run {i} Result: T = {-res.F[0]:.2f} N (seed {res.seed}, stopped on {res.termination_reason}) [{len(results)}/{n_restarts} done]")
         else:
-            results_summary.append((i+1, 0.0))
-            print(f"  -> Run {i+1} Failed (No feasible solution)")
+            print(f"  -> Run {i} Failed (No feasible solution) [{len(results)}/{n_restarts} done]")
+
+    results.sort(key=lambda r: r.run_id)
+    best_res = select_best(results)
 
     print("\n" + "="*40)
     print("MULTI-START SUMMARY")
     print("="*40)
     print(f"{'Run':<5} | {'Thrust (N)':<15}")
     print("-" * 25)
-    for run_id, t_val in results_summary:
-        print(f"{run_id:<5} | {t_val:.2f}")
+    for res in results:
+        t_val = -res.F[0] if res.X is not None else 0.0
+        print(f"{res.run_id:<5} | {t_val:.2f}")
     print("="*40)
 
+    refine_cfg = opt_cfg.get("refine", {})
+    if best_res is not None and (args.refine or refine_cfg.get("enabled", bool(refine_cfg))):
+        from src.refine import refine
+        print("\nRefining the best design (SLSQP, finite-difference gradients)...")
+        ref = refine(
+            cfg, best_res.X,
+            max_iter=refine_cfg.get("max_iter", 20),
+            fd_step=refine_cfg.get("fd_step", 1e-3),
+            ftol=refine_cfg.get("ftol", 1e-6),
+            n_workers=refine_cfg.get("n_workers"),
+        )
+        print(f"  {ref.n_iter} iterations, {ref.n_designs} designs in {ref.n_batches} batches, {ref.seconds:.1f} s ({ref.message})")
+        if ref.improved:
+            print(f"  T = {-ref.F0:.2f} N -> {-ref.F:.2f} N (+{ref.thrust_gain:.2f} N, +{100.0 * ref.thrust_gain / max(abs(ref.F0), 1e-12):.2f}%)")
+            best_res.X = ref.x
+            best_res.F = np.array([ref.F])
+            best_res.G = ref.G
+            if archive is not None:
+                archive.add(cfg, ref.x[None, :], [ref.F])
+                archive.save()
+        else:
+            print(f"  No feasible improvement; keeping T = {-ref.F0:.2f} N")
+
     if best_res is not None:
-        print(f"\nBest Result: T = {-best_f:.2f} N")
+        print(f"\nBest Result: T = {-best_res.F[0]:.2f} N (run {best_res.run_id})")
         save_results(best_res, cfg)
     else:
         print("\nNo feasible solution found in any run.")
 
+    # Stage timings and failure counters, summed over all restarts
+    report = merge_profiles([res.profile for res in results])
+    if report is not None:
+        write_profile_report(report)
+        print("Profiling report saved to: processing/outputs/profile.json")
+
+
+def evaluate_main(argv):
+    """
+    python main.py evaluate -f <config> [DESIGNS | -] [--stream] [--json]
+
+    Thrust, power and efficiency of given designs at every operating point,
+    without loading the optimizer or plotting stacks.
+    """
+    from src.evaluate import DesignEvaluator, format_rows, parse_designs, stream_designs
+
+    parser = argparse.ArgumentParser(prog="main.py evaluate")
+    parser.add_argument("-f", "--file", required=True, help="Input JSON filename")
+    parser.add_argument("designs", nargs="?", default="-",
+                        help="best_chord_pitch.csv or file of control-point vectors, one per line ('-' or omitted: stdin)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Evaluate each stdin line as it arrives and flush its result (long-lived process)")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per line instead of CSV")
+    args = parser.parse_args(argv)
+
+    cfg = json.load(open(f"processing/inputs/{args.file}"))
+    evaluator = DesignEvaluator(cfg)
+    stream = sys.stdin if args.designs == "-" else open(args.designs)
+
+    if not args.json:
+        print("design,point,T,P,eta", flush=True)
+    if args.stream:
+        return stream_designs(evaluator, stream, sys.stdout, args.json)
+
+    try:
+        chords, betas = parse_designs(stream.readlines(), cfg)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    for d in range(len(chords)):
+        for line in format_rows(d, evaluator.evaluate(chords[d], betas[d]), args.json):
+            print(line)
+
+
+def sweep_main(argv):
+    """
+    python main.py sweep -f <config> [--designs FILE] [--workers N] [-o OUT.npz]
+
+    Performance maps of one or more designs over the operating grid in the
+    config's "sweep" block.
+    """
+    from src.sweep import load_designs, run_sweep, save_sweep
+
+    parser = argparse.ArgumentParser(prog="main.py sweep")
+    parser.add_argument("-f", "--file", required=True, help="Input JSON filename")
+    parser.add_argument("--designs", default="processing/outputs/best_chord_pitch.csv",
+                        help="Designs to sweep: a best_chord_pitch.csv, or .npy/text file of design vectors")
+    parser.add_argument("--workers", type=int, default=None, help="Number of sweep worker processes (overrides config)")
+    parser.add_argument("-o", "--output", default=None, help="Output .npz file")
+    args = parser.parse_args(argv)
+
+    cfg = json.load(open(f"processing/inputs/{args.file}"))
+    n_workers = args.workers
+    if n_workers is None:
+        n_workers = cfg.get("sweep", {}).get("n_workers", cfg.get("optimization", {}).get("n_workers", 1))
+
+    stem = os.path.splitext(os.path.basename(args.file))[0]
+    output = args.output or f"processing/outputs/sweep_{stem}.npz"
+
+    try:
+        chords, betas = load_designs(args.designs, cfg)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+    result = run_sweep(cfg, chords, betas, n_workers=n_workers)
+    save_sweep(result, output)
+
+    n_rpm, n_col = result["rpm"].shape
+    print(f"Swept {len(chords)} design(s) over {n_rpm} x {n_col} operating points ({n_workers} workers)")
+    for d in range(len(chords)):
+        T = result["T"][d]
+        n_failed = int(np.isnan(T).sum())
+        if n_failed < T.size:
+            i, j = np.unravel_index(np.nanargmax(T), T.shape)
+            print(f"  Design {d}: max T = {T[i, j]:.2f} N at V = {result['V'][i, j]:.2f} m/s, "
+                  f"rpm = {result['rpm'][i, j]:.0f} ({n_failed} failed points)")
+        else:
+            print(f"  Design {d}: all points failed")
+    print("Sweep saved to:", output)
+
+
+def study_main(argv):
+    """
+    python main.py study (--configs DIR | --grid GRID.json) [--workers N] [--seed S] [--resume]
+
+    Optimize many configs on one shared worker pool and collect the best
+    result of each into processing/outputs/studies/<name>/results.csv.
+    """
+    from src.checkpoint import load_manifest, write_manifest
+    from src.study import cases_from_dir, cases_from_grid, run_study
+
+    parser = argparse.ArgumentParser(prog="main.py study")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--configs", help="Directory of input JSON configs, one study case each")
+    source.add_argument("--grid", help="Parameter grid JSON: a base config and value lists per config path")
+    parser.add_argument("--name", default=None, help="Study name (default: the directory or grid file name)")
+    parser.add_argument("--workers", type=int, default=None, help="Size of the shared worker pool (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None, help="Master seed of the study")
+    parser.add_argument("--resume", action="store_true", help="Skip the cases a previous run of this study finished")
+    args = parser.parse_args(argv)
+
+    if args.configs is not None:
+        cases = cases_from_dir(args.configs)
+        source_path = os.path.normpath(args.configs)
+    else:
+        grid = json.load(open(args.grid))
+        base_cfg = json.load(open(f"processing/inputs/{grid['base']}"))
+        cases = cases_from_grid(grid, base_cfg)
+        source_path = args.grid
+    if not cases:
+        raise SystemExit("Error: the study has no cases")
+
+    name = args.name or os.path.splitext(os.path.basename(source_path))[0]
+    out_dir = f"processing/outputs/studies/{name}"
+    n_workers = args.workers or os.cpu_count()
+
+    # The master seed is kept with the study so a resumed study reuses it
+    manifest = load_manifest(out_dir) if args.resume else None
+    if manifest is not None:
+        master_seed = manifest["master_seed"]
+    else:
+        master_seed = args.seed
+        if master_seed is None:
+            import secrets
+            master_seed = secrets.randbits(32)
+        write_manifest(out_dir, {
+            "source": source_path,
+            "master_seed": master_seed,
+            "cases": [case["case_id"] for case in cases],
+        })
+
+    print(f"Running study '{name}': {len(cases)} cases on {n_workers} shared workers")
+    print(f"Master seed: {master_seed} (pass --seed {master_seed} to reproduce)")
+
+    records = run_study(cases, out_dir, n_workers=n_workers, master_seed=master_seed, resume=args.resume)
+
+    n_ok = sum(r["status"] == "ok" for r in records.values())
+    print(f"\n{n_ok}/{len(cases)} cases found a feasible design")
+    n_failed = sum(r["status"] == "failed" for r in records.values())
+    if n_failed:
+        print(f"{n_failed} cases failed (see the error column; --resume runs them again)")
+    print("Results table saved to:", os.path.join(out_dir, "results.csv"))
+
+
+def worker_main(argv):
+    """
+    python main.py worker [--host HOST] [--port PORT] [--workers N] [--authkey KEY]
+
+    Evaluation daemon for optimization.distributed: serves designs sent by a
+    coordinator over TCP. With --workers N, one daemon per port is started
+    on PORT to PORT + N - 1.
+    """
+    import multiprocessing as mp
+    from src.distributed import AUTHKEY_ENV, resolve_authkey, serve
+
+    parser = argparse.ArgumentParser(prog="main.py worker")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Interface to listen on (default: this machine only; use 0.0.0.0 for all interfaces)")
+    parser.add_argument("--port", type=int, default=6000, help="Port of the first daemon")
+    parser.add_argument("--workers", type=int, default=1, help="Number of daemons, one per port")
+    parser.add_argument("--authkey", default=None,
+                        help=f"Shared key, as in optimization.distributed.authkey (default: ${AUTHKEY_ENV})")
+    args = parser.parse_args(argv)
+
+    try:
+        args.authkey = resolve_authkey(args.authkey)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+    if args.workers == 1:
+        return serve(args.host, args.port, args.authkey)
+
+    procs = [
+        mp.Process(target=serve, args=(args.host, args.port + k, args.authkey))
+        for k in range(args.workers)
+    ]
+    for proc in procs:
+        proc.start()
+    try:
+        for proc in procs:
+            proc.join()
+    except KeyboardInterrupt:
+        for proc in procs:
+            proc.terminate()
+
 
 if __name__ == "__main__":
     main()
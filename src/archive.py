@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+# Config blocks that define the design problem (and so what a good design is)
+PROBLEM_BLOCKS = ("operatingConditions", "operatingPoints", "geometryGlobal", "geometryBounds", "solver")
+
+
+def _flatten(node, prefix, out):
+    if isinstance(node, dict):
+        for key in sorted(node):
+            _flatten(node[key], f"{prefix}{key}.", out)
+    elif isinstance(node, (list, tuple)):
+        for i, value in enumerate(node):
+            _flatten(value, f"{prefix}{i}.", out)
+    else:
+        out[prefix[:-1]] = node
+
+
+def config_signature(cfg):
+    """
+    Normalized description of the design problem defined by cfg.
+
+    Returns (key, structure, features): features maps every numeric leaf of
+    the problem blocks (e.g. "geometryGlobal.diameter") to a float rounded
+    to 10 significant digits; structure hashes everything else (the feature
+    names, strings, booleans), so only configs with the same structure are
+    comparable; key hashes structure and features together and identifies
+    the exact problem, independent of key order and int/float spelling.
+    """
+    problem = {block: cfg[block] for block in PROBLEM_BLOCKS if block in cfg}
+    problem["aggregate"] = cfg.get("optimization", {}).get("aggregate", "weighted_sum")
+
+    leaves = {}
+    _flatten(problem, "", leaves)
+    features = {}
+    labels = {}
+    for name, value in leaves.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            features[name] = float(f"{float(value):.10g}")
+        else:
+            labels[name] = value
+
+    structure = hashlib.sha1(
+        json.dumps([sorted(features), labels], sort_keys=True).encode()
+    ).hexdigest()
+    key = hashlib.sha1(
+        json.dumps([structure, features], sort_keys=True).encode()
+    ).hexdigest()
+    return key, structure, features
+
+
+def feature_distance(a, b):
+    """Mean relative difference between two feature dicts with the same names."""
+    d = [abs(a[n] - b[n]) / max(abs(a[n]), abs(b[n]), 1e-12) for n in a]
+    return float(np.mean(d)) if d else 0.0
+
+
+class EliteArchive:
+    """
+    Persistent archive of the best feasible design vectors found per problem.
+
+    Stored as one JSON file mapping a config signature key to the config's
+    structure, features and up to max_elites distinct elites (X in [0, 1]
+    space and F), best first. Designs live in the normalized design space,
+    so elites of a nearby config (same structure, e.g. another diameter or
+    rpm) are valid starting points too.
+    """
+
+    def __init__(self, path, max_elites=20, neighbours=3, max_distance=0.25):
+        self.path = path
+        self.max_elites = int(max_elites)
+        self.neighbours = int(neighbours)
+        self.max_distance = max_distance
+        self.entries = self._load()
+
+    @classmethod
+    def from_config(cls, cfg):
+        """The archive configured in optimization.archive, or None when not enabled."""
+        arch_cfg = cfg.get("optimization", {}).get("archive", {})
+        if not arch_cfg.get("enabled", bool(arch_cfg)):
+            return None
+        return cls(
+            arch_cfg.get("path", "processing/archive/elites.json"),
+            max_elites=arch_cfg.get("max_elites", 20),
+            neighbours=arch_cfg.get("neighbours", 3),
+            max_distance=arch_cfg.get("max_distance", 0.25),
+        )
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _merge_elites(self, elites):
+        """Best-first, de-duplicated, truncated list of elites."""
+        merged = []
+        seen = set()
+        for elite in sorted(elites, key=lambda e: e["F"]):
+            tag = tuple(np.round(elite["X"], 9))
+            if tag not in seen:
+                seen.add(tag)
+                merged.append(elite)
+        return merged[:self.max_elites]
+
+    def add(self, cfg, X, F):
+        """Record feasible designs X (m x n_var) with objective values F (m) for cfg."""
+        key, structure, features = config_signature(cfg)
+        entry = self.entries.setdefault(key, {"structure": structure, "features": features, "elites": []})
+        new = [{"X": [float(x) for x in xi], "F": float(fi)} for xi, fi in zip(np.atleast_2d(X), np.ravel(F))]
+        entry["elites"] = self._merge_elites(entry["elites"] + new)
+
+    def save(self):
+        """
+        Write the archive, merging in entries another process saved to the
+        same file since it was loaded.
+        """
+        on_disk = self._load()
+        for key, entry in on_disk.items():
+            if key in self.entries:
+                self.entries[key]["elites"] = self._merge_elites(entry["elites"] + self.entries[key]["elites"])
+            else:
+                self.entries[key] = entry
+
+        dirname = os.path.dirname(self.path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(self.entries, f)
+        os.replace(self.path + ".tmp", self.path)
+
+    def lookup(self, cfg, n):
+        """
+        Up to n distinct elite design vectors for cfg, as an (m x n_var)
+        array: the exact config's elites first, then those of the nearest
+        comparable configs (at most `neighbours` of them, within
+        max_distance), each best first.
+        """
+        key, structure, features = config_signature(cfg)
+        candidates = []
+        for other_key, entry in self.entries.items():
+            if entry["structure"] != structure:
+                continue
+            d = 0.0 if other_key == key else feature_distance(features, entry["features"])
+            if d <= self.max_distance:
+                candidates.append((d, other_key, entry))
+        candidates.sort(key=lambda c: (c[0], c[1]))
+
+        X = []
+        seen = set()
+        for _, _, entry in candidates[:self.neighbours]:
+            for elite in entry["elites"]:
+                tag = tuple(np.round(elite["X"], 9))
+                if len(X) < n and tag not in seen:
+                    seen.add(tag)
+                    X.append(elite["X"])
+        return np.array(X, dtype=float) if X else np.empty((0, 0))
+
+
+def initial_population(elites, pop_size, n_var, seed):
+    """
+    Initial DE population: the elites followed by uniform random designs
+    drawn from a generator seeded with the restart's seed.
+    """
+    rng = np.random.default_rng(seed)
+    n_random = pop_size - len(elites)
+    return np.vstack((elites.reshape(-1, n_var), rng.random((n_random, n_var))))
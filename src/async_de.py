@@ -0,0 +1,175 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from pymoo.core.individual import calc_cv
+from pymoo.core.population import Population
+from pymoo.core.result import Result
+
+
+def is_better(f_new, cv_new, f_old, cv_old):
+    """
+    DE replacement rule (as pymoo's ImprovementReplacement): lower
+    constraint violation while infeasible, then feasibility, then lower F.
+    """
+    if cv_old > 0.0:
+        return cv_new < cv_old
+    return cv_new <= 0.0 and f_new < f_old
+
+
+class AsyncDE:
+    """
+    Asynchronous, steady-state differential evolution for ThrustCruiseProblem.
+
+    The generational DE of run_optimization waits for the slowest solve of
+    each generation. Here a new trial vector is submitted as soon as a
+    worker frees up, and each result competes with its target as soon as
+    it comes back, so fast solves never wait for slow ones.
+
+    Trials are DE/rand/1/bin with the generational settings (CR, F with
+    per-vector dither, random re-initialization of out-of-bound values),
+    targeting the population members in turn. Every pop_size completed
+    evaluations count as one generation for the termination criteria, the
+    history callback and the profiler.
+
+    With a single evaluation slot (no worker pool) a run is reproducible
+    from its seed; with several, results arrive in the order the workers
+    finish, which varies from run to run.
+    """
+
+    def __init__(self, problem, pop_size, CR=0.9, F=0.8, seed=None, sampling=None):
+        self.problem = problem
+        self.pop_size = pop_size
+        self.CR = CR
+        self.F = F
+        self.random_state = np.random.default_rng(seed)
+        self.sampling = sampling
+
+        # The attributes read by ConvergenceTermination and HistoryCallback
+        self.n_gen = 0
+        self.evaluator = SimpleNamespace(n_eval=0)
+        self.start_time = None
+        self.termination = None
+        self.pop = None
+        self.opt = None
+
+    def _trial(self, X, i):
+        """DE/rand/1/bin trial vector for target i."""
+        rng = self.random_state
+        n_var = X.shape[1]
+        others = np.delete(np.arange(len(X)), i)
+        r1, r2, r3 = rng.choice(others, 3, replace=False)
+
+        F = self.F + rng.random() * (1.0 - self.F)
+        donor = X[r1] + F * (X[r2] - X[r3])
+
+        # Out-of-bound values are redrawn between the bound and the base vector
+        low = donor < 0.0
+        donor[low] = rng.random(low.sum()) * X[r1, low]
+        high = donor > 1.0
+        donor[high] = X[r1, high] + rng.random(high.sum()) * (1.0 - X[r1, high])
+
+        cross = rng.random(n_var) < self.CR
+        cross[rng.integers(n_var)] = True
+        return np.where(cross, donor, X[i])
+
+    def _generation(self, X, F, G, CV, verbose, callback):
+        """Bookkeeping after every pop_size evaluations."""
+        self.n_gen += 1
+        self.pop = Population.new(X=X.copy(), F=F[:, None].copy(), G=G.copy(), CV=CV[:, None].copy())
+        best = np.lexsort((F, CV))[0]
+        self.opt = self.pop[[best]]
+        self.termination.update(self)
+        if callback is not None:
+            callback(self)
+
+        now = time.perf_counter()
+        n_solved = self.problem.n_solved
+        self.problem.profiler.generation(self.pop_size, n_solved - self._gen_solved, now - self._gen_start)
+        self._gen_start, self._gen_solved = now, n_solved
+
+        if verbose:
+            if self.n_gen == 1:
+                print("n_gen  |  n_eval  |     cv_min    |     cv_avg    |     f_avg     |     f_min    ")
+                print("=" * 82)
+            print(
+                f"{self.n_gen:>6} | {self.evaluator.n_eval:>8} | {CV.min():.7E} | {CV.mean():.7E} | "
+                f"{F.mean():.7E} | {F[best]:.7E}"
+            )
+
+    def run(self, termination, callback=None, verbose=True):
+        problem = self.problem
+        rng = self.random_state
+        pop_size = self.pop_size
+        self.termination = termination
+        self.start_time = time.time()
+        self._gen_start = time.perf_counter()
+        self._gen_solved = problem.n_solved
+
+        X = rng.random((pop_size, problem.n_var))
+        if self.sampling is not None:
+            X = np.array(self.sampling, dtype=float)
+        F = np.empty(pop_size)
+        G = np.empty((pop_size, problem.n_ieq_constr))
+        CV = np.empty(pop_size)
+
+        def counted():
+            self.evaluator.n_eval += 1
+            if self.evaluator.n_eval % pop_size == 0:
+                self._generation(X, F, G, CV, verbose, callback)
+
+        # Initial population: everything is queued at once
+        for i in range(pop_size):
+            problem.submit(i, X[i:i + 1])
+        n_left = pop_size
+        while n_left:
+            for i, f, g in problem.collect():
+                F[i], G[i], CV[i] = f, g, calc_cv(g)
+                n_left -= 1
+                counted()
+
+        # Steady state: one trial per evaluation slot, plus one queued behind
+        # them with a worker pool so a worker never waits for the next trial
+        n_in_flight = problem.n_slots + (problem.pool is not None)
+        budget = termination.n_gen * pop_size
+        if termination.max_evals:
+            budget = min(budget, termination.max_evals)
+        n_submitted = pop_size
+        trials = {}     # key -> (target, trial vector)
+        target = 0
+        while True:
+            while (not termination.has_terminated() and n_submitted < budget
+                   and len(trials) < n_in_flight):
+                x = self._trial(X, target)
+                trials[n_submitted] = (target, x)
+                problem.submit(n_submitted, x[None, :])
+                n_submitted += 1
+                target = (target + 1) % pop_size
+            if not trials:
+                break
+
+            for key, f, g in problem.collect():
+                i, x = trials.pop(key)
+                cv = calc_cv(g)
+                if is_better(f, cv, F[i], CV[i]):
+                    X[i], F[i], G[i], CV[i] = x, f, g, cv
+                counted()
+
+        if self.evaluator.n_eval % pop_size:
+            # Evaluations after the last full generation
+            self._generation(X, F, G, CV, verbose, callback)
+
+        res = Result()
+        best = np.lexsort((F, CV))[0]
+        res.X = X[best].copy()
+        res.F = F[best:best + 1].copy()
+        res.G = G[best].copy()
+        res.CV = CV[best:best + 1].copy()
+        res.pop = self.pop
+        res.opt = self.opt
+        res.problem = problem
+        res.algorithm = self
+        res.start_time = self.start_time
+        res.end_time = time.time()
+        res.exec_time = res.end_time - res.start_time
+        return res
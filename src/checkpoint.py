@@ -0,0 +1,144 @@
+import json
+import os
+import time
+
+import numpy as np
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(ckpt_dir):
+    """
+    Run-level settings (master seed, restart count) saved next to the
+    per-restart checkpoints, or None if the directory has none.
+    """
+    path = os.path.join(ckpt_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(ckpt_dir, manifest):
+    if not os.path.exists(ckpt_dir):
+        os.makedirs(ckpt_dir)
+    path = os.path.join(ckpt_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def restart_checkpoint_path(ckpt_dir, run_id):
+    return os.path.join(ckpt_dir, f"restart_{run_id:03d}.npz")
+
+
+class Checkpointer:
+    """
+    Periodic snapshots of the DE state for one optimization run.
+
+    A checkpoint holds the population (X, F, G), the generation and
+    evaluation counters, the algorithm's RNG state, the elapsed time and
+    the termination criterion's convergence history.
+    It is written as a compressed .npz to a temporary file and then moved
+    into place, so a job killed mid-write never leaves a corrupt checkpoint.
+    """
+
+    def __init__(self, path, every_gen=10, every_sec=None, seed=None):
+        self.path = path
+        self.every_gen = every_gen
+        self.every_sec = every_sec
+        self.seed = seed
+        self._last_gen = 0
+        self._last_time = time.monotonic()
+
+    @classmethod
+    def from_config(cls, cfg, path, seed=None):
+        ckpt_cfg = cfg.get("optimization", {}).get("checkpoint", {})
+        return cls(
+            path,
+            every_gen=ckpt_cfg.get("every_gen", 10),
+            every_sec=ckpt_cfg.get("every_sec"),
+            seed=seed,
+        )
+
+    def due(self, algorithm):
+        if self.every_gen and algorithm.n_gen - self._last_gen >= self.every_gen:
+            return True
+        if self.every_sec and time.monotonic() - self._last_time >= self.every_sec:
+            return True
+        return False
+
+    def save(self, algorithm, finished=False):
+        X, F, G = algorithm.pop.get("X", "F", "G")
+        rng_state = algorithm.random_state.bit_generator.state
+
+        dirname = os.path.dirname(self.path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                X=X,
+                F=F,
+                G=G,
+                n_gen=algorithm.n_gen,
+                n_eval=algorithm.evaluator.n_eval,
+                elapsed=time.time() - algorithm.start_time,
+                seed=-1 if self.seed is None else self.seed,
+                finished=finished,
+                rng_state=json.dumps(rng_state),
+                term_history=np.array(getattr(algorithm.termination, "history", []), dtype=float),
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        self._last_gen = algorithm.n_gen
+        self._last_time = time.monotonic()
+
+    def load(self):
+        """
+        Return the saved state as a dict, or None if there is no checkpoint.
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        with np.load(self.path) as data:
+            state = {key: data[key] for key in data.files}
+        state["rng_state"] = json.loads(str(state["rng_state"]))
+        state["n_gen"] = int(state["n_gen"])
+        state["n_eval"] = int(state["n_eval"])
+        state["elapsed"] = float(state["elapsed"])
+        state["finished"] = bool(state["finished"])
+        return state
+
+
+def restore(algorithm, state):
+    """
+    Put a freshly set-up DE algorithm back into the checkpointed state,
+    so the next call to algorithm.next() produces the generation that
+    would have followed in the original run.
+    """
+    from pymoo.core.population import Population
+
+    pop = Population.new(X=state["X"], F=state["F"], G=state["G"])
+    pop.apply(lambda ind: ind.evaluated.update({"F", "G"}))
+
+    algorithm._initialize()
+    algorithm.pop = pop
+    algorithm._initialize_advance(infills=pop)
+    algorithm.is_initialized = True
+    algorithm.n_gen = state["n_gen"]
+    algorithm.evaluator.n_eval = state["n_eval"]
+    algorithm.start_time = time.time() - state["elapsed"]
+    algorithm.random_state.bit_generator.state = state["rng_state"]
+
+    algorithm._set_optimum()
+    algorithm.termination.update(algorithm)
+
+    # Stall detection continues from the saved window rather than starting over
+    if hasattr(algorithm.termination, "history") and "term_history" in state:
+        algorithm.termination.history = [tuple(row) for row in state["term_history"].tolist()]
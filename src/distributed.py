@@ -0,0 +1,373 @@
+import copy
+import glob
+import hashlib
+import json
+import math
+import os
+import socket
+import time
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, wait
+
+from .parallel import EvaluationPool
+from .polars import PolarDatabase
+from .profiling import Profiler
+
+
+# Bumped whenever the messages below change
+PROTOCOL_VERSION = 1
+
+# Environment variable holding the shared key when it is not given explicitly
+AUTHKEY_ENV = "THRUSTPROP_AUTHKEY"
+
+# Seconds before reconnecting to a worker that dropped out
+RETRY_SECONDS = 30.0
+
+# Coordinator -> worker:  ("hello", version, fingerprint, cfg, solve_timeout)
+#                         ("batch", [(index, point, chords, betas_le), ...])
+#                         None (goodbye)
+# Worker -> coordinator:  ("ready", fingerprint, name) or ("error", message)
+#                         ("result", index, perf) for each design, as it is solved
+#                         ("done", profiler stats, n_timeouts, n_crashes) after each batch
+
+
+def code_version():
+    """Hash of the solver sources, so nodes running different code are refused."""
+    h = hashlib.sha1()
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(src_dir, "*.py"))):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def worker_config(cfg):
+    """
+    The config as sent to workers: without optimization.distributed, whose
+    authkey must never go over the (unencrypted) connection.
+    """
+    cfg = copy.deepcopy(cfg)
+    cfg.get("optimization", {}).pop("distributed", None)
+    return cfg
+
+
+def fingerprint(cfg):
+    """
+    Identifies a config together with the code and polar data that solve it.
+    Each node computes it on its own files, and results are only exchanged
+    when the coordinator's and the worker's match.
+    """
+    cfg = worker_config(cfg)
+    polars = PolarDatabase.from_config(cfg).signature if cfg.get("polarDatabase") else None
+    blob = json.dumps([cfg, code_version(), polars, PROTOCOL_VERSION], sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def resolve_authkey(authkey=None):
+    """
+    The shared key: authkey if given, else the THRUSTPROP_AUTHKEY environment
+    variable. There is no default: messages are unpickled on arrival, so
+    anyone holding the key can run code on a worker.
+    """
+    authkey = authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        raise ValueError(
+            f"distributed evaluation needs a shared key: set optimization.distributed.authkey, "
+            f"pass --authkey or set {AUTHKEY_ENV}"
+        )
+    return authkey
+
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or "localhost", int(port)
+
+
+def serve(host, port, authkey=None, verbose=True):
+    """
+    Worker daemon: accept one coordinator at a time on (host, port) and
+    solve the designs it sends.
+
+    The solvers live in a single-worker EvaluationPool (so a hung or
+    crashing XROTOR solve is killed and replaced as in local runs) that is
+    kept across batches, and across coordinators as long as the config
+    fingerprint does not change.
+
+    Refuses to start without a shared key (see resolve_authkey).
+    """
+    authkey = resolve_authkey(authkey)
+    pool = None
+    pool_key = None
+    name = f"{socket.gethostname()}:{port}"
+
+    with Listener((host, port), authkey=authkey.encode()) as listener:
+        if verbose:
+            print(f"Worker listening on {host}:{port}", flush=True)
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                # Failed handshake (e.g. wrong authkey)
+                if verbose:
+                    print(f"Rejected connection: {e}", flush=True)
+                continue
+
+            try:
+                _, version, fp, cfg, solve_timeout = conn.recv()
+                if version != PROTOCOL_VERSION or fp != fingerprint(cfg):
+                    conn.send(("error", f"{name}: config, code or polar data differ from the coordinator's"))
+                    continue
+
+                if pool_key != (fp, solve_timeout):
+                    if pool is not None:
+                        pool.close()
+                    pool = EvaluationPool(cfg, 1, timeout=solve_timeout, profiler=Profiler.from_config(cfg))
+                    pool_key = (fp, solve_timeout)
+                conn.send(("ready", fp, name))
+                if verbose:
+                    print(f"Coordinator connected (config {fp[:8]})", flush=True)
+
+                while True:
+                    message = conn.recv()
+                    if message is None:
+                        break
+                    n_timeouts, n_crashes = pool.n_timeouts, pool.n_crashes
+                    for i, point, chords, betas_le in message[1]:
+                        perf = pool.map(chords[None, :], betas_le[None, :], [point])[0]
+                        conn.send(("result", i, perf))
+                    conn.send((
+                        "done", pool.profiler.drain(),
+                        pool.n_timeouts - n_timeouts, pool.n_crashes - n_crashes,
+                    ))
+            except (EOFError, OSError):
+                pass
+            finally:
+                conn.close()
+                if verbose:
+                    print("Coordinator disconnected", flush=True)
+
+
+class _RemoteWorker:
+    def __init__(self, address):
+        self.address = address
+        self.conn = None
+        self.name = address
+        self.rate = None        # designs per second, moving average
+        self.batch = {}         # key -> task, for the designs not yet returned
+        self.batch_len = 0      # size of the batch in flight (0: idle)
+        self.sent_at = 0.0
+        self.dropped_at = None
+
+
+class DistributedPool:
+    """
+    Evaluation over worker daemons on other machines (see serve), with the
+    map(), submit() and collect() interface of EvaluationPool.
+
+    Designs go out in batches, sized from each worker's measured throughput
+    so fast and slow nodes finish together; results stream back one design
+    at a time and are stored by row index, so the output never depends on
+    which worker solved what. When a worker disconnects, the unfinished
+    designs of its batch are handed to the remaining workers.
+    """
+
+    def __init__(self, cfg, addresses, authkey=None, batch_size=4, batch_seconds=2.0,
+                 timeout=None, profiler=None):
+        self.cfg = worker_config(cfg)
+        self.authkey = resolve_authkey(authkey).encode()
+        self.batch_size = int(batch_size)
+        self.batch_seconds = batch_seconds
+        self.timeout = timeout
+        self.profiler = profiler
+        self.fingerprint = fingerprint(cfg)
+        self.n_timeouts = 0
+        self.n_crashes = 0
+        self.n_disconnects = 0
+        self._queue = deque()   # (key, point, chords, betas_le) not yet sent
+
+        self.workers = [_RemoteWorker(address) for address in addresses]
+        for worker in self.workers:
+            self._connect(worker)
+        if not any(w.conn is not None for w in self.workers):
+            raise RuntimeError(f"could not connect to any distributed worker of {list(addresses)}")
+
+    @classmethod
+    def from_config(cls, cfg, timeout=None, profiler=None):
+        """The pool described by optimization.distributed, or None when not configured."""
+        dist_cfg = cfg.get("optimization", {}).get("distributed", {})
+        if not dist_cfg.get("workers"):
+            return None
+        return cls(
+            cfg, dist_cfg["workers"],
+            authkey=dist_cfg.get("authkey"),
+            batch_size=dist_cfg.get("batch_size", 4),
+            batch_seconds=dist_cfg.get("batch_seconds", 2.0),
+            timeout=timeout,
+            profiler=profiler,
+        )
+
+    def _connect(self, worker):
+        try:
+            conn = Client(parse_address(worker.address), authkey=self.authkey)
+            conn.send(("hello", PROTOCOL_VERSION, self.fingerprint, self.cfg, self.timeout))
+            reply = conn.recv()
+        except (OSError, EOFError, AuthenticationError) as e:
+            print(f"Distributed worker {worker.address} unavailable: {e}")
+            worker.dropped_at = time.monotonic()
+            return
+        if reply[0] != "ready" or reply[1] != self.fingerprint:
+            conn.close()
+            raise RuntimeError(reply[1] if reply[0] == "error" else f"{worker.address}: fingerprint mismatch")
+        worker.conn = conn
+        worker.name = reply[2]
+
+    def _drop(self, worker):
+        """Disconnect a worker and requeue its unfinished designs, in order."""
+        self.n_disconnects += 1
+        if self.profiler is not None:
+            self.profiler.count("worker_disconnects")
+        print(f"Distributed worker {worker.name} disconnected; reassigning {len(worker.batch)} designs")
+        self._queue.extendleft(reversed(list(worker.batch.values())))
+        worker.batch = {}
+        worker.batch_len = 0
+        worker.dropped_at = time.monotonic()
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        worker.conn = None
+
+    def _reconnect(self):
+        """Give workers lost earlier a chance to come back."""
+        for worker in self.workers:
+            if worker.conn is None and time.monotonic() - worker.dropped_at >= RETRY_SECONDS:
+                self._connect(worker)
+
+    @property
+    def n_slots(self):
+        """Number of connected workers."""
+        return sum(w.conn is not None for w in self.workers)
+
+    def _batch_size(self, worker, n_pending, alive):
+        """
+        Designs for the worker's next batch: about batch_seconds of work at its
+        measured rate, and no more than its throughput share of what is left.
+        """
+        rates = [w.rate for w in alive if w.rate is not None]
+        mean_rate = sum(rates) / len(rates) if rates else 1.0
+        rate = worker.rate if worker.rate is not None else mean_rate
+        total = sum(w.rate if w.rate is not None else mean_rate for w in alive)
+
+        size = self.batch_size if worker.rate is None else max(1, round(rate * self.batch_seconds))
+        share = math.ceil(n_pending * rate / total)
+        return max(1, min(size, share, n_pending))
+
+    def _dispatch(self):
+        """Send a batch to every idle worker while designs are queued."""
+        alive = [w for w in self.workers if w.conn is not None]
+        for worker in alive:
+            if not self._queue:
+                return
+            if worker.batch_len or worker.conn is None:
+                continue
+            size = self._batch_size(worker, len(self._queue), alive)
+            tasks = [self._queue.popleft() for _ in range(size)]
+            worker.batch = {task[0]: task for task in tasks}
+            worker.batch_len = size
+            try:
+                worker.conn.send(("batch", tasks))
+                worker.sent_at = time.monotonic()
+            except OSError:
+                self._drop(worker)
+
+    def submit(self, key, chords, betas_le, point=0):
+        """
+        Queue one design at one operating point without waiting for it; its
+        result comes back from collect() as (key, perf).
+        """
+        self._reconnect()
+        self._queue.append((key, point, chords, betas_le))
+        self._dispatch()
+
+    def _busy(self):
+        return [w for w in self.workers if w.conn is not None and w.batch_len]
+
+    def collect(self):
+        """
+        (key, perf) of the designs finished since the last call, waiting
+        for at least one if none has finished yet. Returns an empty list
+        only when nothing is outstanding.
+        """
+        done = []
+        while not done and (self._queue or self._busy()):
+            if not any(w.conn is not None for w in self.workers):
+                raise RuntimeError("all distributed workers disconnected")
+            self._dispatch()
+            busy = self._busy()
+            if not busy:
+                continue
+
+            for conn in wait([w.conn for w in busy]):
+                worker = next(w for w in busy if w.conn is conn)
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    self._drop(worker)
+                    continue
+
+                if message[0] == "result":
+                    _, key, perf = message
+                    if worker.batch.pop(key, None) is not None:
+                        done.append((key, perf))
+                    continue
+
+                # Batch finished: update the worker's throughput and refill it
+                _, stats, n_timeouts, n_crashes = message
+                if self.profiler is not None:
+                    self.profiler.merge(stats)
+                self.n_timeouts += n_timeouts
+                self.n_crashes += n_crashes
+                elapsed = max(time.monotonic() - worker.sent_at, 1e-6)
+                rate = worker.batch_len / elapsed
+                worker.rate = rate if worker.rate is None else 0.5 * (worker.rate + rate)
+                worker.batch_len = 0
+                self._dispatch()
+        return done
+
+    def map(self, chords, betas_le, points=None):
+        """
+        Evaluate row i of (chords, betas_le) for every i, at operating point
+        points[i] (default: the first point for every row).
+        Returns the list of performance dicts (None on failure) in row order.
+        """
+        n = len(chords)
+        if points is None:
+            points = [0] * n
+        results = [None] * n
+        self._reconnect()
+        self._queue.extend((i, points[i], chords[i], betas_le[i]) for i in range(n))
+        self._dispatch()
+
+        # Runs until every batch has been closed by its "done" message, so
+        # nothing is left unread on the connections for the next call
+        while self._queue or self._busy():
+            for i, perf in self.collect():
+                results[i] = perf
+        return results
+
+    def close(self):
+        for worker in self.workers:
+            if worker.conn is not None:
+                try:
+                    worker.conn.send(None)
+                    worker.conn.close()
+                except OSError:
+                    pass
+                worker.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+import numpy as np
+
+from .polars import PolarDatabase
+
+
+# One cache per (conditions, disk path) so restarts in the same process
+# share the in-memory tier instead of starting cold.
+_SHARED_CACHES = {}
+
+
+def conditions_hash(cfg):
+    """
+    Hash of the config entries that change the XROTOR result for a given geometry.
+    """
+    geom = cfg["geometryGlobal"]
+    oc = cfg["operatingConditions"]
+    conditions = {
+        "V": oc["V"],
+        "rho": oc["rho"],
+        "rpm": oc["rpm"],
+        "diameter": geom["diameter"],
+        "bladeCount": geom["bladeCount"],
+        "rStations": list(geom["rStations"]),
+    }
+    if cfg.get("polarDatabase"):
+        conditions["polars"] = PolarDatabase.from_config(cfg).signature
+    blob = json.dumps(conditions, sort_keys=True).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def combined_stats(caches):
+    """
+    stats() summed over several caches (e.g. one per operating point),
+    counting a cache shared by several solvers once. None if there are none.
+    """
+    unique = list({id(c): c for c in caches if c is not None}.values())
+    if not unique:
+        return None
+    stats = [c.stats() for c in unique]
+    total = {key: sum(s[key] for s in stats) for key in ("hits", "disk_hits", "misses", "entries")}
+    n = total["hits"] + total["misses"]
+    total["hit_rate"] = total["hits"] / n if n else 0.0
+    return total
+
+
+class EvaluationCache:
+    """
+    Memoization of XROTOR results keyed on the quantized (chords, betas_le)
+    arrays plus a hash of the operating conditions.
+
+    Two tiers:
+    - in-memory LRU (max_entries)
+    - optional SQLite file that persists across runs
+    """
+
+    def __init__(self, cond_hash, max_entries=10000, decimals=9, path=None):
+        self.cond_hash = cond_hash
+        self.max_entries = int(max_entries)
+        self.decimals = int(decimals)
+        self.path = path
+
+        self._lru = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path:
+            dirname = os.path.dirname(path)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname)
+            self._db = sqlite3.connect(path, timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, perf TEXT)"
+            )
+            self._db.commit()
+
+    @classmethod
+    def from_config(cls, cfg):
+        """
+        Build (or reuse) the cache described by the optional "evaluationCache"
+        config block. Returns None when caching is disabled.
+        """
+        cache_cfg = cfg.get("evaluationCache")
+        if not cache_cfg or not cache_cfg.get("enabled", True):
+            return None
+
+        cond_hash = conditions_hash(cfg)
+        path = cache_cfg.get("path")
+        key = (cond_hash, path)
+        if key not in _SHARED_CACHES:
+            _SHARED_CACHES[key] = cls(
+                cond_hash,
+                max_entries=cache_cfg.get("maxEntries", 10000),
+                decimals=cache_cfg.get("decimals", 9),
+                path=path,
+            )
+        return _SHARED_CACHES[key]
+
+    def key(self, chords, betas_le):
+        q = np.round(
+            np.concatenate((np.asarray(chords, dtype=float), np.asarray(betas_le, dtype=float))),
+            self.decimals,
+        )
+        q += 0.0  # fold -0.0 into 0.0 so both hash the same
+        h = hashlib.sha1(self.cond_hash.encode())
+        h.update(q.tobytes())
+        return h.hexdigest()
+
+    def get(self, chords, betas_le):
+        """
+        Return the cached performance dict, or None on a miss.
+        """
+        key = self.key(chords, betas_le)
+
+        perf = self._lru.get(key)
+        if perf is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return dict(perf)
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT perf FROM evaluations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                perf = json.loads(row[0])
+                self._remember(key, perf)
+                self.hits += 1
+                self.disk_hits += 1
+                return dict(perf)
+
+        self.misses += 1
+        return None
+
+    def put(self, chords, betas_le, perf):
+        key = self.key(chords, betas_le)
+        self._remember(key, dict(perf))
+
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations (key, perf) VALUES (?, ?)",
+                (key, json.dumps(perf)),
+            )
+            self._db.commit()
+
+    def _remember(self, key, perf):
+        self._lru[key] = perf
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._lru),
+        }
+
+    def __getstate__(self):
+        # SQLite connections cannot cross process boundaries; reopen on the other side
+        state = self.__dict__.copy()
+        state["_db"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.path:
+            self._db = sqlite3.connect(self.path, timeout=30.0)
@@ -0,0 +1,107 @@
+import json
+import sys
+
+import numpy as np
+
+from .geometry_param import decode_population
+from .operating_points import operating_points
+from .solvers import make_point_solvers
+from .xrotor_interface import PENALTY_RESULT
+
+
+# Control points per distribution (chord, pitch), as in ThrustCruiseProblem
+N_CONTROL_POINTS = 5
+
+
+def _parse_row(line):
+    return [float(v) for v in line.replace(",", " ").split()]
+
+
+def parse_designs(lines, cfg):
+    """
+    Decoded (chords, betas_le) of the designs in lines, which hold either
+    - a best_chord_pitch.csv written by save_results (one design), or
+    - one design vector of 10 control points in [0, 1] per line, comma or
+      whitespace separated.
+    Blank lines and lines starting with '#' are skipped.
+    """
+    lines = [line for line in lines if line.strip() and not line.startswith("#")]
+    n_stations = len(cfg["geometryGlobal"]["rStations"])
+
+    if lines and lines[0].startswith("Global_Efficiency"):
+        data = np.array([_parse_row(line) for line in lines[2:]])
+        if data.shape != (n_stations, 2):
+            raise ValueError(f"expected {n_stations} rows of chord,pitch to match rStations")
+        return data[:, 0][None, :], data[:, 1][None, :]
+
+    X = [_parse_row(line) for line in lines]
+    for row in X:
+        if len(row) != 2 * N_CONTROL_POINTS:
+            raise ValueError(f"expected {2 * N_CONTROL_POINTS} control-point values, got {len(row)}")
+    X = np.array(X, dtype=float).reshape(len(X), 2 * N_CONTROL_POINTS)
+    return decode_population(X, cfg["geometryBounds"], cfg["geometryGlobal"])
+
+
+class DesignEvaluator:
+    """
+    Solver-only evaluation of decoded designs at every operating point of a
+    config. Imports neither the optimizer (pymoo) nor the plotting stack,
+    and keeps its solvers (and their evaluation caches) for its lifetime.
+    """
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.points = operating_points(cfg)
+        self.solvers = make_point_solvers(cfg)
+
+    def failed(self):
+        return [{"point": p["name"], "T": np.nan, "P": np.nan, "eta": np.nan} for p in self.points]
+
+    def evaluate(self, chords, betas_le):
+        """
+        One result {"point", "T", "P", "eta"} per operating point for one
+        design; a failed solve gives NaN values. Solvers report most failures
+        by returning PENALTY_RESULT rather than raising, and that result must
+        not be read as a real zero-thrust design.
+        """
+        rows = self.failed()
+        with self.solvers[0].quiet():
+            for row, solver in zip(rows, self.solvers):
+                try:
+                    perf = solver.evaluate(chords, betas_le)
+                except Exception:
+                    continue
+                if perf is None or perf == PENALTY_RESULT:
+                    continue
+                row.update(T=float(perf["T"]), P=float(perf["P"]), eta=float(perf["eta"]))
+        return rows
+
+
+def format_rows(design, rows, as_json=False):
+    """Output lines for the results of one design."""
+    if as_json:
+        return [json.dumps({"design": design, **row}) for row in rows]
+    return [f"{design},{row['point']},{row['T']:.6g},{row['P']:.6g},{row['eta']:.6g}" for row in rows]
+
+
+def stream_designs(evaluator, lines, out, as_json=False):
+    """
+    Evaluate one design vector per input line as it arrives, writing its
+    results (one line per operating point) and flushing after each design,
+    so a caller can keep one process open and talk to it through pipes.
+    A line that cannot be parsed gives NaN results and a message on stderr.
+    """
+    design = 0
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        try:
+            chords, betas = parse_designs([line], evaluator.cfg)
+            rows = evaluator.evaluate(chords[0], betas[0])
+        except ValueError as e:
+            print(f"design {design}: {e}", file=sys.stderr)
+            rows = evaluator.failed()
+        for text in format_rows(design, rows, as_json):
+            out.write(text + "\n")
+        out.flush()
+        design += 1
@@ -0,0 +1,53 @@
+import copy
+
+import numpy as np
+
+
+def multi_fidelity_config(cfg):
+    """The optimization.multi_fidelity block, or None when not enabled."""
+    mf_cfg = cfg.get("optimization", {}).get("multi_fidelity", {})
+    if not mf_cfg.get("enabled", bool(mf_cfg)):
+        return None
+    return mf_cfg
+
+
+def coarse_stations(cfg):
+    """
+    Radial stations of the coarse grid: multi_fidelity.coarse_stations, a
+    list of r/R values or a number of evenly spaced stations (default 6).
+
+    The coarse grid must span the same [first, last] range as the fine
+    rStations, so the Bezier curves decoded on it are the same curves.
+    """
+    fine = np.asarray(cfg["geometryGlobal"]["rStations"], dtype=float)
+    spec = multi_fidelity_config(cfg).get("coarse_stations", 6)
+
+    if isinstance(spec, int):
+        if spec < 2:
+            raise ValueError("multi_fidelity: coarse_stations needs at least 2 stations")
+        return np.linspace(fine[0], fine[-1], spec)
+
+    coarse = np.asarray(spec, dtype=float)
+    if not (np.isclose(coarse[0], fine[0]) and np.isclose(coarse[-1], fine[-1])):
+        raise ValueError(
+            f"multi_fidelity: coarse_stations must start at {fine[0]} and end at {fine[-1]} "
+            f"like geometryGlobal.rStations"
+        )
+    return coarse
+
+
+def coarse_config(cfg):
+    """Copy of cfg whose geometryGlobal.rStations is the coarse grid."""
+    coarse_cfg = copy.deepcopy(cfg)
+    coarse_cfg["geometryGlobal"]["rStations"] = [float(r) for r in coarse_stations(cfg)]
+    return coarse_cfg
+
+
+def fidelity_configs(cfg):
+    """
+    Configs of the solver grids in use: [cfg], followed by the coarse-grid
+    config when multi-fidelity evaluation is enabled.
+    """
+    if multi_fidelity_config(cfg) is None:
+        return [cfg]
+    return [cfg, coarse_config(cfg)]
@@ -1,14 +1,28 @@
 import numpy as np
+from functools import lru_cache
+from math import comb
 
 
-from scipy.special import comb
-
 def bernstein_poly(i, n, t):
     """
     The Bernstein polynomial of n, i as a function of t
     """
     return comb(n, i) * (t**(n-i)) * (1 - t)**i
 
+@lru_cache(maxsize=64)
+def _bernstein_basis(nPoints, t_key):
+    """
+    Bernstein basis matrix (nPoints x len(t)) for the parameter values t.
+    Cached per (nPoints, t) pair; t is passed as a tuple so it can be hashed.
+    """
+    t = np.array(t_key)
+    basis = np.array([bernstein_poly(i, nPoints-1, t) for i in range(0, nPoints)])
+    basis.flags.writeable = False
+    return basis
+
+def bernstein_basis(nPoints, t):
+    return _bernstein_basis(int(nPoints), tuple(np.asarray(t, dtype=float).tolist()))
+
 def bezier_curve(points, nTimes=100):
     """
     Given a set of control points, return the
@@ -19,76 +33,61 @@ def bezier_curve(points, nTimes=100):
               [4,5], ..[Xn, Yn] ]
     nTimes is the number of time steps, defaults to 1000
     """
+    points = np.asarray(points, dtype=float)
     nPoints = len(points)
-    xPoints = np.array([p[0] for p in points])
-    yPoints = np.array([p[1] for p in points])
 
     t = np.linspace(0.0, 1.0, nTimes)
 
-    polynomial_array = np.array([bernstein_poly(i, nPoints-1, t) for i in range(0, nPoints)])
+    polynomial_array = bernstein_basis(nPoints, t)
 
-    xvals = np.dot(xPoints, polynomial_array)
-    yvals = np.dot(yPoints, polynomial_array)
+    xvals, yvals = points.T @ polynomial_array
 
     return xvals, yvals
 
-def decode_design(x, bounds, geom):
+def station_basis(n_cp, r_stations):
     """
-    Map normalized optimizer vector x (Control Points)
-    to smooth chord and pitch distributions using Bezier curves.
-    
-    x structure:
-    - First half: Chord Control Points (y-values only, x is assumed uniform)
-    - Second half: Twist Control Points (y-values only)
+    Bernstein basis evaluated at the radial stations (n_cp x Ns).
+    r_stations (e.g. 0.15 to 1.0) are mapped to t (0 to 1).
     """
-    Ns = len(geom["rStations"])
-    r_stations = np.array(geom["rStations"])
-    
-    # Determine number of control points
-    # We assume x is split 50/50 between chord and twist
-    n_cp = len(x) // 2
-    
-    # 1. Chord Distribution
-    cmin_frac = bounds["chordMin"]
-    cmax_frac = bounds["chordMax"]
-    D = geom["diameter"]
-    
-    # Control points for chord (normalized 0-1)
-    cp_chord_norm = x[:n_cp]
-    
-    # Create Bezier curve for Chord
-    # X-coords of CPs: evenly spaced from 0 to 1 (representing r_stations)
-    # Y-coords of CPs: the optimizer values
-    cp_x = np.linspace(0, 1, n_cp)
-    points_chord = list(zip(cp_x, cp_chord_norm))
-    
-    # Evaluate Bezier at the specific r_stations
-    # We need to map r_stations (e.g. 0.15 to 1.0) to t (0 to 1)
+    r_stations = np.asarray(r_stations, dtype=float)
     r_min = r_stations[0]
     r_max = r_stations[-1]
     t_vals = (r_stations - r_min) / (r_max - r_min)
-    
-    # Calculate Bezier values manually for specific t_vals
-    # (Re-using logic from bezier_curve but for specific t)
-    nPoints = n_cp
-    polynomial_array = np.array([bernstein_poly(i, nPoints-1, t_vals) for i in range(0, nPoints)])
-    chord_curve_norm = np.dot(cp_chord_norm, polynomial_array)
-    
-    # Scale to physical dimensions
-    chords = (cmin_frac * D) + chord_curve_norm * (cmax_frac * D - cmin_frac * D)
+    return bernstein_basis(n_cp, t_vals)
 
-    # 2. Twist Distribution
+def decode_population(X, bounds, geom):
+    """
+    Batched version of decode_design.
+    Maps a population matrix X (N x 2*n_cp) to chord and pitch
+    matrices (N x Ns) with one matrix multiply per distribution.
+    """
+    X = np.atleast_2d(np.asarray(X, dtype=float))
+
+    # We assume x is split 50/50 between chord and twist
+    n_cp = X.shape[1] // 2
+    basis = station_basis(n_cp, geom["rStations"])
+
+    # 1. Chord Distribution, scaled to physical dimensions
+    D = geom["diameter"]
+    cmin = bounds["chordMin"] * D
+    cmax = bounds["chordMax"] * D
+    chords = cmin + (X[:, :n_cp] @ basis) * (cmax - cmin)
+
+    # 2. Twist Distribution, scaled to degrees
     pmin = bounds["pitchDegMin"]
     pmax = bounds["pitchDegMax"]
-    
-    # Control points for twist
-    cp_twist_norm = x[n_cp:]
-    points_twist = list(zip(cp_x, cp_twist_norm))
-    
-    # Evaluate Bezier for Twist
-    twist_curve_norm = np.dot(cp_twist_norm, polynomial_array)
-    
-    # Scale to degrees
-    betas_le = pmin + twist_curve_norm * (pmax - pmin)
+    betas_le = pmin + (X[:, n_cp:] @ basis) * (pmax - pmin)
 
     return chords, betas_le
+
+def decode_design(x, bounds, geom):
+    """
+    Map normalized optimizer vector x (Control Points)
+    to smooth chord and pitch distributions using Bezier curves.
+    
+    x structure:
+    - First half: Chord Control Points (y-values only, x is assumed uniform)
+    - Second half: Twist Control Points (y-values only)
+    """
+    chords, betas_le = decode_population(x, bounds, geom)
+    return chords[0], betas_le[0]
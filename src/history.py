@@ -0,0 +1,174 @@
+import json
+import os
+import time
+
+import numpy as np
+from pymoo.core.callback import Callback
+
+
+META_NAME = "meta.json"
+
+# Per-generation summary columns (gens.bin)
+GEN_COLUMNS = ("gen", "n_eval", "elapsed", "best_f", "best_cv", "n_feasible", "pop_size", "mean_cv")
+
+# Per-design columns: file name -> (dtype, width key in meta)
+POP_COLUMNS = {
+    "gen": ("<i4", None),
+    "X": ("<f8", "n_var"),
+    "F": ("<f8", None),
+    "G": ("<f8", "n_constr"),
+}
+
+
+def _column_path(path, name):
+    return os.path.join(path, f"{name}.bin")
+
+
+class HistoryWriter:
+    """
+    Append-only, on-disk optimization history.
+
+    Every column is a raw little-endian binary file that only ever grows
+    by whole rows, plus a small meta.json describing the row widths, so a
+    run of any length holds just one generation in memory and the files
+    can be memory-mapped while the run is still going.
+    """
+
+    def __init__(self, path, n_var, n_constr, truncate_after=None):
+        self.path = path
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        meta = {
+            "n_var": int(n_var),
+            "n_constr": int(n_constr),
+            "gen_columns": list(GEN_COLUMNS),
+            "pop_columns": list(POP_COLUMNS),
+        }
+        with open(os.path.join(path, META_NAME), "w") as f:
+            json.dump(meta, f, indent=4)
+
+        self._widths = {
+            col: 1 if key is None else meta[key] for col, (_, key) in POP_COLUMNS.items()
+        }
+
+        if truncate_after is not None:
+            self._truncate(truncate_after)
+        else:
+            # A fresh run starts a fresh history
+            for name in ["gens"] + [f"pop_{col}" for col in POP_COLUMNS]:
+                if os.path.exists(_column_path(path, name)):
+                    os.remove(_column_path(path, name))
+
+    def _truncate(self, last_gen):
+        """
+        Drop rows written after generation last_gen (e.g. by a run that went
+        on past its last checkpoint before being killed).
+        """
+        reader = HistoryReader(self.path)
+        n_gens = int(np.searchsorted(reader.generations()["gen"], last_gen, side="right"))
+        n_rows = int(np.searchsorted(reader.gen, last_gen, side="right"))
+        del reader
+
+        sizes = {"gens": n_gens * len(GEN_COLUMNS) * 8}
+        for col, (dtype, _) in POP_COLUMNS.items():
+            sizes[f"pop_{col}"] = n_rows * self._widths[col] * np.dtype(dtype).itemsize
+
+        for name, size in sizes.items():
+            file = _column_path(self.path, name)
+            if os.path.exists(file):
+                with open(file, "r+b") as f:
+                    f.truncate(size)
+
+    def append(self, gen, n_eval, elapsed, X, F, G):
+        """Write one generation: its population (X, F, G) and summary row."""
+        F = np.asarray(F, dtype="<f8").reshape(len(X), -1)[:, 0]
+        G = np.asarray(G, dtype="<f8").reshape(len(X), -1)
+        CV = np.maximum(G, 0.0).sum(axis=1)
+
+        feasible = CV <= 0.0
+        if feasible.any():
+            best = np.flatnonzero(feasible)[np.argmin(F[feasible])]
+        else:
+            best = np.argmin(CV)
+
+        rows = {
+            "gen": np.full(len(X), gen, dtype="<i4"),
+            "X": np.asarray(X, dtype="<f8"),
+            "F": F,
+            "G": G,
+        }
+        for col, (dtype, _) in POP_COLUMNS.items():
+            with open(_column_path(self.path, f"pop_{col}"), "ab") as f:
+                f.write(np.ascontiguousarray(rows[col], dtype=dtype).tobytes())
+
+        summary = np.array([
+            gen, n_eval, elapsed, F[best], CV[best], feasible.sum(), len(X), CV.mean()
+        ], dtype="<f8")
+        with open(_column_path(self.path, "gens"), "ab") as f:
+            f.write(summary.tobytes())
+
+
+class HistoryReader:
+    """
+    Read-only view of a history directory. All columns are memory-mapped,
+    so nothing is loaded until it is indexed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_NAME)) as f:
+            self.meta = json.load(f)
+
+        widths = {col: 1 if key is None else self.meta[key] for col, (_, key) in POP_COLUMNS.items()}
+        # A run killed mid-append may leave one column a row ahead of the others
+        n_rows = min(
+            self._n_rows(f"pop_{col}", widths[col], np.dtype(dtype).itemsize)
+            for col, (dtype, _) in POP_COLUMNS.items()
+        )
+
+        for col, (dtype, _) in POP_COLUMNS.items():
+            data = self._map(f"pop_{col}", dtype, n_rows, widths[col])
+            setattr(self, col, data[:, 0] if widths[col] == 1 else data)
+
+    def _n_rows(self, name, width, itemsize):
+        file = _column_path(self.path, name)
+        if not os.path.exists(file):
+            return 0
+        return os.path.getsize(file) // (width * itemsize)
+
+    def _map(self, name, dtype, n_rows, width):
+        if n_rows == 0:
+            return np.empty((0, width), dtype=dtype)
+        return np.memmap(_column_path(self.path, name), dtype=dtype, mode="r", shape=(n_rows, width))
+
+    def generations(self):
+        """Per-generation summary as a dict of (n_gen,) memory-mapped arrays."""
+        n = self._n_rows("gens", len(GEN_COLUMNS), 8)
+        data = self._map("gens", "<f8", n, len(GEN_COLUMNS))
+        return {name: data[:, i] for i, name in enumerate(self.meta["gen_columns"])}
+
+
+class HistoryCallback(Callback):
+    """pymoo callback streaming every generation's population to a HistoryWriter."""
+
+    def __init__(self, path, resume_gen=None):
+        super().__init__()
+        self.path = path
+        self.resume_gen = resume_gen
+        self.writer = None
+
+    def initialize(self, algorithm):
+        problem = algorithm.problem
+        self.writer = HistoryWriter(
+            self.path, problem.n_var, problem.n_ieq_constr, truncate_after=self.resume_gen
+        )
+
+    def notify(self, algorithm):
+        X, F, G = algorithm.pop.get("X", "F", "G")
+        self.writer.append(
+            algorithm.n_gen,
+            algorithm.evaluator.n_eval,
+            time.time() - algorithm.start_time,
+            X, F, G,
+        )
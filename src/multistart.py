@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+import numpy as np
+
+from .checkpoint import Checkpointer, restart_checkpoint_path
+from .optimizer import run_optimization
+
+
+def restart_seeds(master_seed, n_restarts):
+    """
+    One independent seed per restart, derived from a single master seed.
+    The seed of restart i depends only on (master_seed, i).
+    """
+    children = np.random.SeedSequence(master_seed).spawn(n_restarts)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+# Best feasible designs of each restart's final population kept for the elite archive
+N_RESTART_ELITES = 5
+
+
+class RestartResult:
+    """
+    Picklable summary of one restart: the best design and the final
+    optimum population, without the problem or its worker pool attached.
+    Provides the attributes used by save_results (X, F, algorithm.opt).
+    """
+
+    def __init__(self, res, run_id, seed):
+        self.run_id = run_id
+        self.seed = seed
+        self.X = res.X
+        self.F = res.F
+        self.G = res.G
+        self.CV = res.CV
+        self.exec_time = res.exec_time
+        self.termination_reason = res.termination_reason
+        self.profile = res.profile
+        self.solver_calls = res.solver_calls
+        self.history_path = res.history_path
+        self.algorithm = SimpleNamespace(opt=res.algorithm.opt)
+
+        X, F, CV = res.pop.get("X", "F", "CV")
+        feasible = np.flatnonzero(CV[:, 0] <= 0.0)
+        best = feasible[np.argsort(F[feasible, 0], kind="stable")][:N_RESTART_ELITES]
+        self.elites_X = X[best]
+        self.elites_F = F[best, 0]
+
+
+def run_restart(cfg, run_id, seed, n_gen, pop_size, verbose=True, ckpt_dir=None, resume=False,
+                history_dir=None, elites=None):
+    checkpoint = None
+    if ckpt_dir is not None:
+        checkpoint = Checkpointer.from_config(
+            cfg, restart_checkpoint_path(ckpt_dir, run_id), seed=seed
+        )
+
+    history = None
+    if history_dir is not None:
+        history = os.path.join(history_dir, f"restart_{run_id:03d}")
+
+    res = run_optimization(
+        cfg, n_gen=n_gen, pop_size=pop_size, seed=seed, verbose=verbose,
+        checkpoint=checkpoint, resume=resume, history=history, elites=elites
+    )
+    return RestartResult(res, run_id, seed)
+
+
+def n_seeded(cfg, pop_size):
+    """Number of initial designs taken from the elite archive."""
+    fraction = cfg.get("optimization", {}).get("archive", {}).get("seed_fraction", 0.2)
+    return min(int(round(fraction * pop_size)), pop_size)
+
+
+def run_multistart(cfg, n_gen, pop_size, seeds, restart_workers=1, ckpt_dir=None, resume=False,
+                   history_dir=None, archive=None):
+    """
+    Run one restart per seed and yield each RestartResult as it finishes.
+
+    With restart_workers > 1 the restarts run concurrently in separate
+    processes (progress output is silenced to keep the console readable);
+    completion order may vary, but each restart's result depends only on its seed.
+
+    With ckpt_dir set, each restart checkpoints to its own file there;
+    resume=True continues every restart from its checkpoint (finished
+    restarts return immediately).
+
+    With history_dir set, each restart streams its per-generation
+    population to history_dir/restart_NNN.
+
+    With an EliteArchive, the restarts run in waves of
+    optimization.archive.wave_size (default restart_workers, so every
+    worker stays busy): every restart of a wave seeds part of its initial
+    population from the archive as it stood when the wave started, and the
+    wave's elites are added (in run order) and saved before the next wave
+    starts, so later restarts build on earlier ones. With wave_size set
+    explicitly, results do not depend on restart_workers.
+    """
+    runs = list(enumerate(seeds, start=1))
+    if archive is None:
+        waves = [runs]
+    else:
+        wave_size = max(int(cfg.get("optimization", {}).get("archive", {}).get("wave_size", restart_workers)), 1)
+        waves = [runs[i:i + wave_size] for i in range(0, len(runs), wave_size)]
+
+    executor = ProcessPoolExecutor(max_workers=restart_workers) if restart_workers > 1 else None
+    try:
+        for wave in waves:
+            elites = None if archive is None else archive.lookup(cfg, n_seeded(cfg, pop_size))
+            results = []
+
+            if executor is None:
+                for run_id, seed in wave:
+                    print(f"\n--- Run {run_id}/{len(seeds)} ---")
+                    res = run_restart(cfg, run_id, seed, n_gen, pop_size, True, ckpt_dir, resume, history_dir, elites)
+                    results.append(res)
+                    yield res
+            else:
+                futures = [
+                    executor.submit(run_restart, cfg, run_id, seed, n_gen, pop_size, False, ckpt_dir, resume,
+                                    history_dir, elites)
+                    for run_id, seed in wave
+                ]
+                for future in as_completed(futures):
+                    res = future.result()
+                    results.append(res)
+                    yield res
+
+            if archive is not None:
+                for res in sorted(results, key=lambda r: r.run_id):
+                    archive.add(cfg, res.elites_X, res.elites_F)
+                archive.save()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def select_best(results):
+    """
+    Best restart by objective; ties go to the lowest run id so the choice
+    does not depend on completion order. Returns None if no run found a design.
+    """
+    feasible = [r for r in results if r.X is not None]
+    if not feasible:
+        return None
+    return min(feasible, key=lambda r: (r.F[0], r.run_id))
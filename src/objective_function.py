@@ -1,6 +1,7 @@
 import numpy as np
 from .geometry_param import decode_design
-from .xrotor_interface import XRotorWrapper
+from .operating_points import AGGREGATES, operating_points, point_weights
+from .solvers import make_point_solvers
 
 M_TIP_LIMIT = 0.75  # maximum allowable tip Mach number
 
@@ -12,17 +13,64 @@ def compute_tip_mach(D, rpm, V, a=340.0):
     return V_tip / a
 
 
+def check_tip_mach(cfg):
+    """
+    Fail fast when an operating point alone already violates the tip Mach
+    limit: no blade shape can make such a config feasible.
+    """
+    D = cfg["geometryGlobal"]["diameter"]
+    for point in operating_points(cfg):
+        V = point["V"]
+        rpm = point["rpm"]
+        M_tip = compute_tip_mach(D, rpm, V)
+        if M_tip > M_TIP_LIMIT:
+            raise ValueError(
+                f"Tip Mach number {M_tip:.3f} exceeds the limit {M_TIP_LIMIT} at "
+                f"operating point '{point['name']}' (D={D} m, rpm={rpm}, V={V} m/s); "
+                f"no design can be feasible."
+            )
+
+
 class ThrustCruiseObjective:
+    """
+    Thrust objective and constraints over one or more operating points.
+
+    Per-point quantities are arrays with one entry (or column) per point:
+    thrust and power are (N x K) for N designs and K points. The objective
+    aggregates the thrust over the points, and each of the 6 constraints is
+    the worst violation over the points.
+    """
+
     def __init__(self, cfg):
         self.cfg = cfg
-        self.Pmax = cfg["operatingConditions"]["maxPower"]
-        self.xr = XRotorWrapper(cfg)
-
-        # Required thrust constraint
-        self.T_req = cfg["operatingConditions"].get("requiredThrust", 5.0)
-        
-        # Minimum efficiency constraint
-        self.min_eta = cfg["operatingConditions"].get("minEfficiency", 0.5)
+        self.points = operating_points(cfg)
+        self.weights = point_weights(self.points)
+        self.aggregate = cfg.get("optimization", {}).get("aggregate", "weighted_sum")
+        if self.aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{self.aggregate}', expected one of {AGGREGATES}")
+
+        # One solver per operating point; xr is the first (design) point
+        self.solvers = make_point_solvers(cfg)
+        self.xr = self.solvers[0]
+
+        # Power limit, required thrust and minimum efficiency per point
+        self.Pmax_k = np.array([p["maxPower"] for p in self.points], dtype=float)
+        self.T_req_k = np.array([p.get("requiredThrust", 5.0) for p in self.points], dtype=float)
+        self.min_eta_k = np.array([p.get("minEfficiency", 0.5) for p in self.points], dtype=float)
+        self.V_k = np.array([p["V"] for p in self.points], dtype=float)
+
+        # Tip Mach depends only on the config, so compute it once
+        D = cfg["geometryGlobal"]["diameter"]
+        self.M_tip_k = np.array([compute_tip_mach(D, p["rpm"], p["V"]) for p in self.points])
+        self.g_tip_mach_k = np.maximum(0, (self.M_tip_k - M_TIP_LIMIT) / M_TIP_LIMIT)
+
+        # Values at the design (first) point
+        self.Pmax = self.Pmax_k[0]
+        self.T_req = self.T_req_k[0]
+        self.min_eta = self.min_eta_k[0]
+        self.V = self.V_k[0]
+        self.M_tip = self.M_tip_k[0]
+        self.g_tip_mach = self.g_tip_mach_k[0]
 
     def __call__(self, x):
         # Decode geometry: fixed chord, optimized pitch
@@ -30,79 +78,170 @@ class ThrustCruiseObjective:
             x, self.cfg["geometryBounds"], self.cfg["geometryGlobal"]
         )
 
-        # 1) Run XROTOR
+        # 1) Run XROTOR at every operating point
+        T, P = self.solve(chords, betas_le)
+
+        return self.constraints(T, P, chords, betas_le)
+
+    def solve(self, chords, betas_le):
+        """
+        Run XROTOR on one decoded design and return (T, P) arrays, one entry per point.
+        """
+        TP = np.array([
+            self.thrust_power(self.run_solver(chords, betas_le, k), k)
+            for k in range(len(self.points))
+        ], dtype=float)
+        return TP[:, 0], TP[:, 1]
+
+    def solve_batch(self, chords, betas_le):
+        """
+        (N x K) thrust and power for a whole population, using the solvers'
+        vectorized evaluate_batch (BEMT backend).
+        """
+        T = np.empty((len(chords), len(self.points)))
+        P = np.empty_like(T)
+        for k, solver in enumerate(self.solvers):
+            perf = solver.evaluate_batch(chords, betas_le)
+            T[:, k] = perf["T"]
+            P[:, k] = perf["P"]
+
+        # Hard failure: treat as poor design
+        failed = np.isnan(T) | np.isnan(P)
+        self.xr.profiler.count("nan_results", int(failed.sum()))
+        T_pen, P_pen = self.penalty()
+        T = np.where(failed, T_pen, T)
+        P = np.where(failed, P_pen, P)
+        return T, P
+
+    def run_solver(self, chords, betas_le, point=0):
+        """
+        Run XROTOR on one decoded design at one operating point.
+        Returns the performance dict, or None on a hard failure.
+        """
         try:
-            perf = self.xr.evaluate(chords, betas_le)
-            T = perf["T"]
-            P = perf["P"]
-            
-            # Debug print removed for cleaner output
-            # import sys
-            # print(f"  -> T={T:.2f} N, P={P:.2f} W", file=sys.stderr)
-
-            if np.isnan(T) or np.isnan(P):
-                raise ValueError("NaN returned from XROTOR")
-
-        except:
+            return self.solvers[point].evaluate(chords, betas_le)
+        except Exception:
+            self.xr.profiler.count("solver_errors")
+            return None
+
+    def penalty(self):
+        """(T, P) arrays (K,) assigned to a failed or skipped solve at each point."""
+        return np.zeros(len(self.points)), 10.0 * self.Pmax_k
+
+    def thrust_power(self, perf, point=0):
+        """
+        Extract (T, P) from an XROTOR performance dict.
+        A missing result (None) or NaN output is treated as a poor design.
+        """
+        if perf is None:
             # Hard failure: treat as poor design
-            T = 0.0
-            P = 10.0 * self.Pmax
+            return 0.0, 10.0 * self.Pmax_k[point]
 
-        # 2) Constraint calculations
-        D = self.cfg["geometryGlobal"]["diameter"]
-        V = self.cfg["operatingConditions"]["V"]
-        rpm = self.cfg["operatingConditions"]["rpm"]
+        if np.isnan(perf["T"]) or np.isnan(perf["P"]):
+            self.xr.profiler.count("nan_results")
+            return 0.0, 10.0 * self.Pmax_k[point]
 
-        M_tip = compute_tip_mach(D, rpm, V)
+        return perf["T"], perf["P"]
 
-        # Constraint vector: g <= 0 is feasible
-        g = np.zeros(6)
+    def thrust_power_batch(self, perfs, point=0):
+        """
+        (T, P) arrays for a list of performance dicts (None for failed solves)
+        at one operating point.
+        """
+        TP = np.array([self.thrust_power(perf, point) for perf in perfs], dtype=float).reshape(-1, 2)
+        return TP[:, 0], TP[:, 1]
+
+    def constraints(self, T, P, chords, betas_le):
+        """
+        Objective and constraint vector for a single design with thrust T and
+        power P (scalars, or one entry per operating point).
+        """
+        F, G = self.evaluate_batch(
+            np.reshape(T, (1, -1)), np.reshape(P, (1, -1)),
+            np.atleast_2d(chords), np.atleast_2d(betas_le)
+        )
+        return F[0], G[0]
+
+    def evaluate_batch(self, T, P, chords, betas_le, clip=True):
+        """
+        Vectorized objective and constraints for a whole population.
+
+        T, P           : (N x K) thrust and power per operating point
+                         ((N,) is accepted for a single-point problem)
+        chords, betas_le : (N x Ns) decoded geometry matrices
+        Returns F (N,) and G (N x 6), with g <= 0 feasible. With clip=False,
+        G holds the signed margins instead of max(0, g), so satisfied
+        constraints still have a gradient (used by the local refinement).
+        """
+        T = np.asarray(T, dtype=float)
+        P = np.asarray(P, dtype=float)
+        if T.ndim == 1:
+            T = T[:, None]
+            P = P[:, None]
+        G = np.empty((len(T), 6))
 
         # g[0] Power constraint (allow slight violation)
-        g[0] = max(0, (P - self.Pmax) / self.Pmax)
+        G[:, 0] = np.max((P - self.Pmax_k) / self.Pmax_k, axis=1)
 
-        # g[1] Tip Mach constraint (softer)
-        g[1] = max(0, (M_tip - M_TIP_LIMIT) / M_TIP_LIMIT)
+        # g[1] Tip Mach constraint (softer), constant for a given config
+        G[:, 1] = np.max((self.M_tip_k - M_TIP_LIMIT) / M_TIP_LIMIT)
 
         # g[2] Required thrust (very soft early)
         # Normalize by abs(T_req) to handle negative requirements correctly
-        g[2] = max(0, (self.T_req - T) / (abs(self.T_req) + 1e-6))
+        G[:, 2] = np.max((self.T_req_k - T) / (np.abs(self.T_req_k) + 1e-6), axis=1)
 
         # g[3] Minimum efficiency
-        # eta = T * V / P (if P > 0)
-        if P > 1e-6:
-            eta = T * V / P
-        else:
-            eta = 0.0
-        
-        # We want eta >= min_eta  =>  min_eta - eta <= 0
-        g[3] = max(0, self.min_eta - eta)
+        # eta = T * V / P (if P > 0), we want eta >= min_eta
+        powered = P > 1e-6
+        eta = np.zeros_like(T)
+        eta[powered] = (T * self.V_k)[powered] / P[powered]
+        G[:, 3] = np.max(self.min_eta_k - eta, axis=1)
 
         # --- Geometric Constraints ---
-        
-        # g[4] Taper Constraint: Tip Chord <= 0.7 * Root Chord
+        G[:, 4:6] = self.geometry_constraints(chords, betas_le, clip=False)
+
+        if clip:
+            G = np.maximum(0.0, G)
+
+        # Objective: maximize (aggregated) thrust → minimize -T
+        if self.aggregate == "min":
+            F = -np.min(T, axis=1)
+        else:
+            F = -np.sum(T * self.weights, axis=1)
+
+        return F, G
+
+    @staticmethod
+    def geometry_constraints(chords, betas_le, clip=True):
+        """
+        Taper and washout constraints (N x 2), which depend only on the decoded
+        geometry. clip=False gives the signed margins (see evaluate_batch).
+        """
+        chords = np.atleast_2d(chords)
+        betas_le = np.atleast_2d(betas_le)
+        G = np.empty((chords.shape[0], 2))
+
+        # Taper Constraint: Tip Chord <= 0.7 * Root Chord
         # c_tip <= 0.7 * c_root  =>  c_tip - 0.7*c_root <= 0
-        c_root = chords[0]
-        c_tip = chords[-1]
-        g[4] = max(0, (c_tip - 0.7 * c_root) / c_root)
+        c_root = chords[:, 0]
+        c_tip = chords[:, -1]
+        G[:, 0] = (c_tip - 0.7 * c_root) / c_root
 
-        # g[5] Washout Constraint: Tip Pitch <= Root Pitch
+        # Washout Constraint: Tip Pitch <= Root Pitch
         # beta_tip <= beta_root  =>  beta_tip - beta_root <= 0
-        beta_root = betas_le[0]
-        beta_tip = betas_le[-1]
-        g[5] = max(0, (beta_tip - beta_root) / 10.0)  # Normalize by 10 deg
-
-        # Objective: maximize thrust → minimize -T
-        f = -T
+        beta_root = betas_le[:, 0]
+        beta_tip = betas_le[:, -1]
+        G[:, 1] = (beta_tip - beta_root) / 10.0  # Normalize by 10 deg
 
-        return f, g
+        return np.maximum(0.0, G) if clip else G
 
-    def get_performance(self, x):
+    def get_performance(self, x, point=0):
         """
-        Helper to retrieve full performance dict for a given design vector x.
+        Helper to retrieve full performance dict for a given design vector x
+        at one operating point.
         Used by the Display class to show efficiency.
         """
         chords, betas_le = decode_design(
             x, self.cfg["geometryBounds"], self.cfg["geometryGlobal"]
         )
-        return self.xr.evaluate(chords, betas_le)
+        return self.solvers[point].evaluate(chords, betas_le)
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+# Keys of an operatingPoints entry that are not operating conditions
+POINT_META_KEYS = ("name", "weight")
+
+AGGREGATES = ("weighted_sum", "min")
+
+
+def operating_points(cfg):
+    """
+    Operating points of the problem.
+
+    Each entry of the optional "operatingPoints" list overrides
+    operatingConditions (V, rho, rpm, maxPower, requiredThrust,
+    minEfficiency) and may carry a "name" and a "weight" (default 1.0).
+    Without the list the problem has the single point operatingConditions.
+    """
+    base = cfg["operatingConditions"]
+    entries = cfg.get("operatingPoints") or [{"name": "design"}]
+
+    points = []
+    for i, entry in enumerate(entries):
+        point = dict(base)
+        point.update(entry)
+        point.setdefault("name", f"point{i + 1}")
+        point.setdefault("weight", 1.0)
+        points.append(point)
+    return points
+
+
+def point_config(cfg, point):
+    """
+    Copy of cfg whose operatingConditions are those of one operating point,
+    so per-point solvers and caches see their own V/rpm/rho.
+    """
+    point_cfg = dict(cfg)
+    point_cfg["operatingConditions"] = {
+        key: value for key, value in point.items() if key not in POINT_META_KEYS
+    }
+    return point_cfg
+
+
+def point_weights(points):
+    """Normalized weights (K,) of the operating points."""
+    w = np.array([p["weight"] for p in points], dtype=float)
+    if np.any(w < 0) or w.sum() <= 0:
+        raise ValueError("operatingPoints: weights must be non-negative with a positive sum")
+    return w / w.sum()
@@ -1,9 +1,21 @@
+import time
+
 import numpy as np
 from pymoo.core.problem import Problem
-from pymoo.algorithms.soo.nonconvex.cmaes import CMAES
 from pymoo.optimize import minimize
 
-from .objective_function import ThrustCruiseObjective
+from .geometry_param import decode_population
+from .objective_function import ThrustCruiseObjective, check_tip_mach
+from .distributed import DistributedPool
+from .eval_cache import combined_stats
+from .parallel import EvaluationPool
+from .checkpoint import restore
+from .termination import ConvergenceTermination
+from .surrogate import RBFSurrogate
+from .history import HistoryCallback
+from .archive import initial_population
+from .async_de import AsyncDE
+from .fidelity import coarse_config, multi_fidelity_config
 
 
 class ThrustCruiseProblem(Problem):
@@ -22,49 +34,437 @@ class ThrustCruiseProblem(Problem):
         )
 
         self.obj = ThrustCruiseObjective(cfg)
+        # Stage timers and counters shared with the solver
+        self.profiler = self.obj.xr.profiler
+
+        # Optional pool of worker processes, each with its own XRotor instance
+        # (not needed for the vectorized BEMT backend). A per-solve timeout
+        # needs the pool's watchdog, so it implies a pool even with one worker.
+        self.n_workers = cfg.get("optimization", {}).get("n_workers", 1)
+        self.solve_timeout = cfg.get("optimization", {}).get("solve_timeout")
+        # With optimization.distributed, the designs go to worker daemons
+        # (main.py worker) on other machines instead.
+        batched = hasattr(self.obj.xr, "evaluate_batch")
+        self.pool = (
+            DistributedPool.from_config(cfg, timeout=self.solve_timeout, profiler=self.profiler)
+            if not batched else None
+        )
+        if self.pool is None and (self.n_workers > 1 or self.solve_timeout) and not batched:
+            self.pool = EvaluationPool(cfg, self.n_workers, timeout=self.solve_timeout, profiler=self.profiler)
+        self.n_timeouts = 0
+        self.n_crashes = 0
+
+        # Optional pre-screening on the geometry-only constraints (taper, washout)
+        prescreen_cfg = cfg.get("optimization", {}).get("prescreen", {})
+        self.prescreen = prescreen_cfg.get("enabled", bool(prescreen_cfg))
+        self.prescreen_margin = prescreen_cfg.get("margin", 0.0)
+        self.n_screened = 0
+        self.n_solved = 0
+
+        # Optional surrogate model: once trained on enough solved designs,
+        # only the most promising fraction of each generation is solved
+        sur_cfg = cfg.get("optimization", {}).get("surrogate", {})
+        self.surrogate = None
+        if sur_cfg.get("enabled", bool(sur_cfg)):
+            self.surrogate = RBFSurrogate.from_config(sur_cfg)
+        self.surrogate_keep = sur_cfg.get("keep_fraction", 0.3)
+        self.surrogate_min_points = sur_cfg.get("min_points", 50)
+        self.n_surrogate_skipped = 0
+
+        # Optional multi-fidelity evaluation: every design is solved on a
+        # coarse radial grid, and only the best fraction of each generation
+        # (plus any design that might be a new best) again on rStations
+        mf_cfg = multi_fidelity_config(cfg)
+        self.coarse = None
+        if mf_cfg is not None:
+            self.coarse_cfg = coarse_config(cfg)
+            self.coarse = ThrustCruiseObjective(self.coarse_cfg)
+            for solver in self.coarse.solvers:
+                solver.profiler = self.profiler
+            self.fine_fraction = mf_cfg.get("fine_fraction", 0.2)
+            self.best_margin = mf_cfg.get("best_margin", 0.02)
+        self.best_fine = None   # (CV, F) of the best design solved on the fine grid
+        self.n_fine = 0
+
+        # Designs started with submit(): key -> (chords, betas, perfs, missing points)
+        self._in_flight = {}
+        self._finished = []
 
     def _evaluate(self, X, out, *args, **kwargs):
-        F = []
-        G = []
-        for x in X:
-            f, g = self.obj(x)
-            F.append(f)
-            G.append(g)
+        prof = self.profiler
+        t0 = time.perf_counter()
+
+        # Decode the whole population at once
+        with prof.stage("decode"):
+            chords, betas = decode_population(
+                X, self.cfg["geometryBounds"], self.cfg["geometryGlobal"]
+            )
+
+        # Designs that already violate taper/washout by more than the margin
+        # get the hard-failure penalty without a solver call
+        solve = np.ones(len(chords), dtype=bool)
+        if self.prescreen:
+            with prof.stage("prescreen"):
+                G_geo = self.obj.geometry_constraints(chords, betas)
+                solve = ~(G_geo > self.prescreen_margin).any(axis=1)
+        self.n_screened += int((~solve).sum())
+
+        # Of the remaining designs, the surrogate picks the ones worth solving;
+        # the rest get the penalty and lose DE selection against their parents
+        if self.surrogate is not None and len(self.surrogate) >= self.surrogate_min_points:
+            with prof.stage("surrogate"):
+                candidates = np.flatnonzero(solve)
+                n_keep = max(1, int(np.ceil(self.surrogate_keep * len(candidates))))
+                skipped = candidates[self.surrogate.rank(X[candidates])[n_keep:]]
+                solve[skipped] = False
+                self.n_surrogate_skipped += len(skipped)
+
+        # Thrust and power per design and operating point
+        T_pen, P_pen = self.obj.penalty()
+        T = np.tile(T_pen, (len(chords), 1))
+        P = np.tile(P_pen, (len(chords), 1))
+        if self.coarse is None:
+            with prof.stage("solve"):
+                T[solve], P[solve] = self._solve(chords[solve], betas[solve])
+        else:
+            T[solve], P[solve] = self._solve_multi_fidelity(X[solve], chords[solve], betas[solve])
+
+        self.n_solved += int(solve.sum())
+
+        with prof.stage("objective"):
+            out["F"], out["G"] = self.obj.evaluate_batch(T, P, chords, betas)
+
+        if self.surrogate is not None and solve.any():
+            # Train on every real solve
+            with prof.stage("surrogate"):
+                CV = np.maximum(out["G"][solve], 0.0).sum(axis=1)
+                self.surrogate.add(X[solve], out["F"][solve], CV)
+
+        prof.generation(len(chords), int(solve.sum()), time.perf_counter() - t0)
+
+    def _solve_multi_fidelity(self, X, chords, betas):
+        """
+        (N x K) thrust and power of the designs X (decoded on the fine grid
+        as chords, betas): coarse-grid values, replaced by fine-grid values
+        for the best fine_fraction of the designs and for every design whose
+        coarse result comes within best_margin of the best fine result so
+        far. A design without a fine solve can therefore never be better than
+        one with, and the best design of a run always carries fine values.
+        """
+        prof = self.profiler
+        with prof.stage("decode"):
+            c_chords, c_betas = decode_population(
+                X, self.cfg["geometryBounds"], self.coarse_cfg["geometryGlobal"]
+            )
+        with prof.stage("coarse_solve"):
+            T, P = self._solve(c_chords, c_betas, self.coarse, len(self.obj.solvers))
+
+        # Coarse aerodynamics with the fine-grid geometry constraints
+        F, G = self.obj.evaluate_batch(T, P, chords, betas)
+        CV = np.maximum(G, 0.0).sum(axis=1)
+
+        def solve_fine(rows):
+            with prof.stage("fine_solve"):
+                T[rows], P[rows] = self._solve(chords[rows], betas[rows])
+            F_fine, G_fine = self.obj.evaluate_batch(T[rows], P[rows], chords[rows], betas[rows])
+            CV_fine = np.maximum(G_fine, 0.0).sum(axis=1)
+            best = np.lexsort((F_fine, CV_fine))[0]
+            if self.best_fine is None or (CV_fine[best], F_fine[best]) < self.best_fine:
+                self.best_fine = (CV_fine[best], F_fine[best])
+
+        # The top fraction first, so that the best fine result includes this
+        # generation before the other designs are compared with it
+        n_top = int(np.ceil(self.fine_fraction * len(X)))
+        fine = np.zeros(len(X), dtype=bool)
+        fine[np.lexsort((F, CV))[:n_top]] = True
+        if fine.any():
+            solve_fine(fine)
+
+        extra = ~fine & self._might_be_best(F, CV)
+        if extra.any():
+            solve_fine(extra)
+            fine |= extra
+
+        self.n_fine += int(fine.sum())
+        prof.count("fine_solves", int(fine.sum()))
+        return T, P
+
+    def _might_be_best(self, F, CV):
+        """Designs whose coarse (F, CV) come within best_margin of the best fine result."""
+        if self.best_fine is None:
+            return np.ones(len(F), dtype=bool)
+        cv_best, f_best = self.best_fine
+        if cv_best > 0.0:
+            return CV <= cv_best * (1.0 + self.best_margin)
+        return (CV <= self.best_margin) & (F <= f_best + self.best_margin * abs(f_best))
+
+    def _solve(self, chords, betas, obj=None, point_offset=0):
+        """
+        (N x K) thrust and power arrays for the given decoded designs at the
+        K operating points, using the vectorized backend, the worker pool or
+        the serial loop. obj selects the objective whose solvers are used
+        (default: the fine grid); point_offset is the index of its first
+        solver in the pool workers.
+        """
+        if obj is None:
+            obj = self.obj
+        if hasattr(obj.xr, "evaluate_batch"):
+            # Vectorized backend: one call per operating point for the whole population
+            return obj.solve_batch(chords, betas)
+
+        n_points = len(obj.solvers)
+        if self.pool is None:
+            # One output redirection for the whole batch; the solvers of the
+            # other points share it (see XRotorWrapper.quiet)
+            with obj.xr.quiet():
+                perfs = [
+                    [obj.run_solver(c, b, k) for c, b in zip(chords, betas)]
+                    for k in range(n_points)
+                ]
+        else:
+            # Only cache misses go out to the workers, all points in one batch
+            with self.profiler.stage("cache_lookup"):
+                perfs = [
+                    [solver.lookup(c, b) for c, b in zip(chords, betas)]
+                    for solver in obj.solvers
+                ]
+            todo = [
+                (k, i) for k in range(n_points) for i in range(len(chords))
+                if perfs[k][i] is None
+            ]
+            rows = [i for _, i in todo]
+            solved = self.pool.map(chords[rows], betas[rows], [point_offset + k for k, _ in todo])
+            for (k, i), perf in zip(todo, solved):
+                obj.solvers[k].remember(chords[i], betas[i], perf)
+                perfs[k][i] = perf
+
+        T = np.empty((len(chords), n_points))
+        P = np.empty_like(T)
+        for k in range(n_points):
+            T[:, k], P[:, k] = obj.thrust_power_batch(perfs[k], k)
+        return T, P
+
+    @property
+    def n_slots(self):
+        """Designs that can be solved at the same time."""
+        return 1 if self.pool is None else self.pool.n_slots
+
+    def submit(self, key, x):
+        """
+        Start the evaluation of one design vector x without waiting for it
+        (used by async_de); its objective and constraints come back from
+        collect() as (key, F, G). Without a worker pool, or when every
+        operating point is a cache hit, the design is finished right away.
+        """
+        chords, betas = decode_population(x, self.cfg["geometryBounds"], self.cfg["geometryGlobal"])
+
+        if self.prescreen:
+            G_geo = self.obj.geometry_constraints(chords, betas)
+            if (G_geo > self.prescreen_margin).any():
+                self.n_screened += 1
+                T_pen, P_pen = self.obj.penalty()
+                self._finish(key, chords, betas, T_pen[None, :], P_pen[None, :])
+                return
+
+        self.n_solved += 1
+        if self.pool is None:
+            with self.profiler.stage("solve"):
+                T, P = self._solve(chords, betas)
+            self._finish(key, chords, betas, T, P)
+            return
 
-        out["F"] = np.array(F)
-        out["G"] = np.array(G)
+        with self.profiler.stage("cache_lookup"):
+            perfs = [solver.lookup(chords[0], betas[0]) for solver in self.obj.solvers]
+        missing = {k for k, perf in enumerate(perfs) if perf is None}
+        if not missing:
+            self._finish_perfs(key, chords, betas, perfs)
+            return
+        self._in_flight[key] = (chords, betas, perfs, missing)
+        for k in sorted(missing):
+            self.pool.submit((key, k), chords[0], betas[0], k)
 
+    def collect(self):
+        """
+        (key, F, G) of the designs finished since the last call, waiting for
+        at least one if none has finished yet.
+        """
+        while not self._finished and self._in_flight:
+            for (key, k), perf in self.pool.collect():
+                chords, betas, perfs, missing = self._in_flight[key]
+                self.obj.solvers[k].remember(chords[0], betas[0], perf)
+                perfs[k] = perf
+                missing.discard(k)
+                if not missing:
+                    del self._in_flight[key]
+                    self._finish_perfs(key, chords, betas, perfs)
+        finished, self._finished = self._finished, []
+        return finished
+
+    def _finish_perfs(self, key, chords, betas, perfs):
+        T = np.empty((1, len(perfs)))
+        P = np.empty_like(T)
+        for k, perf in enumerate(perfs):
+            T[:, k], P[:, k] = self.obj.thrust_power_batch([perf], k)
+        self._finish(key, chords, betas, T, P)
+
+    def _finish(self, key, chords, betas, T, P):
+        with self.profiler.stage("objective"):
+            F, G = self.obj.evaluate_batch(T, P, chords, betas)
+        self._finished.append((key, F[0], G[0]))
+
+    def close(self):
+        """Shut down the worker pool, if any."""
+        if self.pool is not None:
+            self.n_timeouts = self.pool.n_timeouts
+            self.n_crashes = self.pool.n_crashes
+            self.pool.close()
+            self.pool = None
+
+
+def run_optimization(cfg, n_gen=60, pop_size=16, seed=None, verbose=True,
+                     checkpoint=None, resume=False, history=None, elites=None):
+    check_tip_mach(cfg)
+    opt_cfg = cfg.get("optimization", {})
+    algorithm = opt_cfg.get("algorithm", "de")
+    if algorithm not in ("de", "async_de"):
+        raise ValueError(f"optimization.algorithm must be 'de' or 'async_de', not {algorithm!r}")
+    if algorithm == "async_de":
+        # These hook into the generational loop
+        for block in ("surrogate", "multi_fidelity"):
+            if opt_cfg.get(block, {}).get("enabled", bool(opt_cfg.get(block))):
+                raise ValueError(f"optimization.{block} is not supported with the async_de algorithm")
+        if checkpoint is not None:
+            raise ValueError("checkpoints are not supported with the async_de algorithm")
 
-def run_optimization(cfg, n_gen=60, pop_size=16, seed=None):
     problem = ThrustCruiseProblem(cfg)
     # Use Differential Evolution (DE) for better global search robustness
     # DE is often better at finding the feasible region than CMA-ES for this type of problem.
     from pymoo.algorithms.soo.nonconvex.de import DE
 
+    # Elites from the archive replace part of the random initial population
+    sampling = {}
+    if elites is not None and len(elites) > 0:
+        sampling["sampling"] = initial_population(elites, pop_size, problem.n_var, seed)
+
     algo = DE(
         pop_size=pop_size,
         variant="DE/rand/1/bin",
         CR=0.9,
         F=0.8,
         dither="vector",
-        jitter=False
+        jitter=False,
+        **sampling
     )
 
-    print("\n" + "="*60)
-    print("OPTIMIZATION PROGRESS LEGEND")
-    print("="*60)
-    print("n_gen    : Generation Number")
-    print("n_eval   : Total Evaluations")
-    print("cv (min) : Best Constraint Violation (0.0 = Valid Design)")
-    print("f (min)  : Best Objective (-Thrust). E.g. -50.0 means 50N Thrust")
-    print("="*60 + "\n")
-
-    res = minimize(
-        problem,
-        algo,
-        ("n_gen", n_gen),
-        verbose=True,
-        seed=seed
-    )
+    if verbose:
+        print("\n" + "="*60)
+        print("OPTIMIZATION PROGRESS LEGEND")
+        print("="*60)
+        print("n_gen    : Generation Number")
+        print("n_eval   : Total Evaluations")
+        print("cv (min) : Best Constraint Violation (0.0 = Valid Design)")
+        print("f (min)  : Best Objective (-Thrust). E.g. -50.0 means 50N Thrust")
+        print("="*60 + "\n")
+
+    if sampling and verbose:
+        print(f"Seeding {len(elites)} of {pop_size} initial designs from the elite archive\n")
+
+    # Generation budget plus the optional convergence criteria
+    termination = ConvergenceTermination.from_config(cfg, n_gen)
+
+    # Optional per-generation population history streamed to disk
+    callback = {} if history is None else {"callback": HistoryCallback(history)}
+
+    try:
+        if algorithm == "async_de":
+            res = AsyncDE(
+                problem, pop_size, CR=0.9, F=0.8, seed=seed, sampling=sampling.get("sampling")
+            ).run(termination, callback=callback.get("callback"), verbose=verbose)
+        elif checkpoint is None:
+            res = minimize(
+                problem,
+                algo,
+                termination,
+                verbose=verbose,
+                seed=seed,
+                **callback
+            )
+        else:
+            res = _run_with_checkpoints(problem, algo, termination, seed, verbose, checkpoint, resume, callback)
+    finally:
+        problem.close()
+
+    res.termination_reason = res.algorithm.termination.reason
+    res.history_path = history
+    res.profile = problem.profiler.to_dict() if problem.profiler.enabled else None
+    if verbose:
+        print(
+            f"Stopped after {len(res.algorithm.termination.history)} generations, "
+            f"{res.algorithm.evaluator.n_eval} evaluations: {res.termination_reason}"
+        )
+
+    if problem.prescreen and verbose:
+        total = problem.n_solved + problem.n_screened + problem.n_surrogate_skipped
+        print(f"Pre-screening skipped the solver for {problem.n_screened} of {total} designs")
+
+    res.solver_calls = problem.n_solved
+    if problem.surrogate is not None and verbose:
+        total = problem.n_solved + problem.n_surrogate_skipped
+        print(
+            f"Surrogate skipped the solver for {problem.n_surrogate_skipped} of {total} designs "
+            f"({problem.surrogate.n_refits} full refits)"
+        )
+
+    if problem.coarse is not None and verbose:
+        print(
+            f"Multi-fidelity: {problem.n_solved} designs solved on {len(problem.coarse_cfg['geometryGlobal']['rStations'])} stations, "
+            f"{problem.n_fine} of them re-solved on {len(cfg['geometryGlobal']['rStations'])}"
+        )
+
+    if problem.solve_timeout and verbose:
+        print(
+            f"Solver watchdog: {problem.n_timeouts} timed-out solves, "
+            f"{problem.n_crashes} crashed workers replaced"
+        )
+
+    # Every operating point (and grid, with multi-fidelity) has its own cache
+    solvers = problem.obj.solvers + ([] if problem.coarse is None else problem.coarse.solvers)
+    stats = combined_stats(solver.cache for solver in solvers)
+    if stats is not None and verbose:
+        print(
+            f"Evaluation cache: {stats['hits']} hits ({stats['disk_hits']} from disk), "
+            f"{stats['misses']} misses, hit rate {100.0 * stats['hit_rate']:.1f}%"
+        )
+
+    return res
+
+
+def _run_with_checkpoints(problem, algo, termination, seed, verbose, checkpoint, resume, callback):
+    """
+    Same loop as pymoo's minimize(), with a Checkpointer snapshot after
+    every due generation and at the end. With resume=True, an existing
+    checkpoint is restored first and the run continues from it.
+    """
+    algo.setup(problem, termination=termination, verbose=verbose, seed=seed, **callback)
+
+    state = checkpoint.load() if resume else None
+    if state is not None:
+        restore(algo, state)
+        if "callback" in callback:
+            # History rows past the checkpoint are dropped and rewritten. pymoo
+            # logs a generation before counting it, so the checkpoint's n_gen
+            # is the next generation to be logged
+            callback["callback"].resume_gen = state["n_gen"] - 1
+        if verbose:
+            print(f"Resumed from {checkpoint.path} ({state['n_eval']} evaluations done)")
+
+    while algo.has_next():
+        algo.next()
+        if checkpoint.due(algo):
+            checkpoint.save(algo)
+
+    checkpoint.save(algo, finished=True)
 
+    res = algo.result()
+    res.algorithm = algo
     return res
@@ -1,8 +1,9 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import os
 from .geometry_param import decode_design
-from .xrotor_interface import XRotorWrapper
+from .history import HistoryReader
+from .operating_points import operating_points, point_config
+from .solvers import make_solver
 
 
 def save_results(res, cfg, outdir="processing/outputs"):
@@ -21,7 +22,7 @@ def save_results(res, cfg, outdir="processing/outputs"):
     )
 
     # Calculate efficiency
-    xr = XRotorWrapper(cfg)
+    xr = make_solver(cfg)
     perf = xr.evaluate(chords, betas)
     eta = perf.get("eta", 0.0)
 
@@ -34,8 +35,33 @@ def save_results(res, cfg, outdir="processing/outputs"):
         comments=""
     )
 
-    # Simple convergence plot if algorithm history is available
-    if hasattr(res.algorithm, "opt"):
+    # Performance of the best design at every operating point
+    points = operating_points(cfg)
+    if len(points) > 1:
+        rows = []
+        print("\nPerformance at each operating point:")
+        for point in points:
+            p_perf = make_solver(point_config(cfg, point)).evaluate(chords, betas)
+            rows.append([point["V"], point["rpm"], p_perf["T"], p_perf["P"], p_perf["eta"]])
+            print(
+                f"  {point['name']:<12} V = {point['V']:.2f} m/s, rpm = {point['rpm']:.0f}: "
+                f"T = {p_perf['T']:.2f} N, P = {p_perf['P']:.1f} W, eta = {p_perf['eta']:.3f}"
+            )
+        np.savetxt(
+            os.path.join(outdir, "best_operating_points.csv"),
+            np.array(rows),
+            delimiter=",",
+            header="Points:" + ";".join(point["name"] for point in points) + "\nV(m/s),RPM,T(N),P(W),eta",
+            comments=""
+        )
+
+    # Convergence and feasibility plots from the on-disk history, if recorded;
+    # otherwise a simple convergence plot of the final optimum
+    history_path = getattr(res, "history_path", None)
+    if history_path and os.path.exists(history_path):
+        plot_history(history_path, outdir)
+    elif hasattr(res.algorithm, "opt"):
+        import matplotlib.pyplot as plt
         try:
             hist = res.algorithm.opt.get("F")
             hist = np.array(hist).flatten()
@@ -55,3 +81,43 @@ def save_results(res, cfg, outdir="processing/outputs"):
     print("\nOptimization Finished!")
     print("Optimal objective (max thrust) =", -res.F[0])
     print("Results saved to:", outdir)
+
+
+def plot_history(history_path, outdir):
+    """
+    thrust_convergence.png and feasibility.png from a run's history
+    directory. Only the per-generation summary is read (memory-mapped).
+    """
+    import matplotlib.pyplot as plt
+
+    gens = HistoryReader(history_path).generations()
+    if len(gens["gen"]) == 0:
+        return
+
+    gen = np.asarray(gens["gen"])
+    feasible = np.asarray(gens["best_cv"]) <= 0.0
+    thrust = np.where(feasible, -np.asarray(gens["best_f"]), np.nan)
+
+    fig, ax = plt.subplots()
+    ax.plot(gen, thrust)
+    ax.set_xlabel("Generation")
+    ax.set_ylabel("Best feasible thrust (N)")
+    ax.set_title("Thrust Convergence")
+    ax.grid(True)
+    fig.savefig(os.path.join(outdir, "thrust_convergence.png"))
+    plt.close(fig)
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True)
+    ax1.plot(gen, np.asarray(gens["n_feasible"]) / np.asarray(gens["pop_size"]))
+    ax1.set_ylabel("Feasible fraction")
+    ax1.set_ylim(-0.05, 1.05)
+    ax1.grid(True)
+    ax2.semilogy(gen, np.maximum(np.asarray(gens["mean_cv"]), 1e-12), label="population mean")
+    ax2.semilogy(gen, np.maximum(np.asarray(gens["best_cv"]), 1e-12), label="best design")
+    ax2.set_xlabel("Generation")
+    ax2.set_ylabel("Constraint violation")
+    ax2.legend()
+    ax2.grid(True)
+    fig.suptitle("Feasibility")
+    fig.savefig(os.path.join(outdir, "feasibility.png"))
+    plt.close(fig)
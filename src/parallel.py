@@ -0,0 +1,210 @@
+import multiprocessing as mp
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from .fidelity import fidelity_configs
+from .solvers import make_point_solvers
+from .xrotor_interface import PENALTY_RESULT
+
+
+def _worker_loop(conn, cfg, parent_conn=None):
+    """
+    Worker process body: owns one solver instance per operating point for
+    its whole lifetime and answers (index, point, chords, betas_le) tasks
+    until it receives None. With multi-fidelity evaluation, points K to
+    2K - 1 are the coarse-grid solvers of the K operating points.
+    """
+    # Without the parent's end of the pipe here, a parent that is killed
+    # shows up as EOF instead of leaving this process orphaned
+    if parent_conn is not None:
+        parent_conn.close()
+    # Caching is handled by the parent process before dispatch
+    solvers = [
+        solver for grid_cfg in fidelity_configs(cfg)
+        for solver in make_point_solvers(grid_cfg, use_cache=False)
+    ]
+    xr = solvers[0]
+    for solver in solvers[1:]:
+        solver.profiler = xr.profiler
+    # Solver output stays suppressed for the lifetime of the worker
+    with xr.quiet():
+        while True:
+            try:
+                task = conn.recv()
+            except (EOFError, OSError):
+                break
+            if task is None:
+                break
+
+            idx, point, chords, betas_le = task
+            try:
+                perf = solvers[point].evaluate(chords, betas_le)
+            except Exception:
+                # Hard failure: let the objective apply its penalty
+                xr.profiler.count("solver_errors")
+                perf = None
+            # Stage timings since the last task travel back with the result
+            try:
+                conn.send((idx, perf, xr.profiler.drain()))
+            except OSError:
+                break
+
+    conn.close()
+
+
+class EvaluationPool:
+    """
+    Pool of long-lived worker processes, each holding its own XRotor instance.
+
+    Designs are handed out one at a time to whichever worker is free, and
+    results are stored by row index so the output order never depends on
+    which worker finished first. map() evaluates a whole batch; submit() and
+    collect() let a caller keep the workers busy one design at a time.
+
+    With a solve timeout, a watchdog kills any worker that has been on
+    one design for longer than `timeout` seconds, starts a replacement and
+    records the penalty result for that design. Workers that die mid-solve
+    are replaced the same way.
+    """
+
+    def __init__(self, cfg, n_workers, timeout=None, profiler=None):
+        self.cfg = cfg
+        self.n_workers = int(n_workers)
+        self.timeout = timeout
+        self.profiler = profiler
+        self.n_timeouts = 0
+        self.n_crashes = 0
+
+        self._queue = deque()   # (key, point, chords, betas_le) not yet dispatched
+        self._busy = {}         # slot -> (key, dispatch time)
+
+        self._ctx = mp.get_context()
+        self._procs = [None] * self.n_workers
+        self._conns = [None] * self.n_workers
+        for slot in range(self.n_workers):
+            self._spawn(slot)
+
+    def _spawn(self, slot):
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_worker_loop, args=(child_conn, self.cfg, parent_conn), daemon=True
+        )
+        proc.start()
+        child_conn.close()
+        self._procs[slot] = proc
+        self._conns[slot] = parent_conn
+
+    def _respawn(self, slot):
+        """Kill the worker in this slot (if still alive) and start a fresh one."""
+        proc = self._procs[slot]
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        self._conns[slot].close()
+        self._spawn(slot)
+
+    @property
+    def n_slots(self):
+        """Number of designs solved at the same time."""
+        return self.n_workers
+
+    def submit(self, key, chords, betas_le, point=0):
+        """
+        Queue one design at one operating point without waiting for it; its
+        result comes back from collect() as (key, perf). Queued designs start
+        as soon as a worker is free.
+        """
+        self._queue.append((key, point, chords, betas_le))
+        self._dispatch()
+
+    def _dispatch(self):
+        for slot in range(self.n_workers):
+            if not self._queue:
+                return
+            if slot not in self._busy:
+                key, point, chords, betas_le = self._queue.popleft()
+                self._conns[slot].send((key, point, chords, betas_le))
+                self._busy[slot] = (key, time.monotonic())
+
+    def collect(self):
+        """
+        (key, perf) of the designs finished since the last call, waiting
+        for at least one if none has finished yet. Returns an empty list
+        only when nothing is outstanding.
+        """
+        done = []
+        while self._busy and not done:
+            wait_for = None
+            if self.timeout:
+                oldest = min(t0 for _, t0 in self._busy.values())
+                wait_for = max(0.0, oldest + self.timeout - time.monotonic())
+
+            ready = wait([self._conns[slot] for slot in self._busy], timeout=wait_for)
+            for conn in ready:
+                slot = self._conns.index(conn)
+                key, _ = self._busy.pop(slot)
+                try:
+                    _, perf, stats = conn.recv()
+                    if self.profiler is not None:
+                        self.profiler.merge(stats)
+                except (EOFError, OSError):
+                    # Worker died mid-solve (e.g. a crash inside XROTOR)
+                    self.n_crashes += 1
+                    if self.profiler is not None:
+                        self.profiler.count("worker_crashes")
+                    self._respawn(slot)
+                    perf = dict(PENALTY_RESULT)
+                done.append((key, perf))
+
+            if self.timeout:
+                now = time.monotonic()
+                for slot, (key, t0) in list(self._busy.items()):
+                    if now - t0 >= self.timeout:
+                        # Hung solve: kill the worker and score the design as a failure
+                        self.n_timeouts += 1
+                        if self.profiler is not None:
+                            self.profiler.count("timeouts")
+                        del self._busy[slot]
+                        self._respawn(slot)
+                        done.append((key, dict(PENALTY_RESULT)))
+
+            self._dispatch()
+        return done
+
+    def map(self, chords, betas_le, points=None):
+        """
+        Evaluate row i of (chords, betas_le) for every i, at operating point
+        points[i] (default: the first point for every row).
+        Returns the list of XROTOR performance dicts (None on failure) in row order.
+        """
+        n = len(chords)
+        if points is None:
+            points = [0] * n
+        results = [None] * n
+        for i in range(n):
+            self.submit(i, chords[i], betas_le[i], points[i])
+        while self._busy:
+            for i, perf in self.collect():
+                results[i] = perf
+        return results
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5.0)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+        self._conns = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
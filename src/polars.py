@@ -0,0 +1,314 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+def clark_y_polar():
+    """
+    Clark Y polar data (Re ~ 500k, Mach ~ 0.35).
+    Columns: Alpha(deg), CL, CD, Cm
+    """
+    data = np.array([
+        [-10.0, -0.3448, 0.10501, -0.0385],
+        [-9.5, -0.3361, 0.09944, -0.0397],
+        [-9.0, -0.3247, 0.08659, -0.0508],
+        [-8.5, -0.3143, 0.07447, -0.0628],
+        [-8.0, -0.3190, 0.05814, -0.0826],
+        [-7.5, -0.3695, 0.02932, -0.1075],
+        [-7.0, -0.3436, 0.02184, -0.1071],
+        [-6.5, -0.2838, 0.01800, -0.1079],
+        [-6.0, -0.2385, 0.01526, -0.1052],
+        [-5.5, -0.1727, 0.01395, -0.1054],
+        [-5.0, -0.1242, 0.01240, -0.1024],
+        [-4.5, -0.0653, 0.01184, -0.1012],
+        [-4.0, -0.0089, 0.01091, -0.0997],
+        [-3.5, 0.0431, 0.01026, -0.0973],
+        [-3.0, 0.0999, 0.00995, -0.0959],
+        [-2.5, 0.1545, 0.00948, -0.0941],
+        [-2.0, 0.2072, 0.00901, -0.0920],
+        [-1.5, 0.2587, 0.00856, -0.0899],
+        [-0.5, 0.3550, 0.00754, -0.0845],
+        [0.0, 0.4047, 0.00676, -0.0814],
+        [0.5, 0.5314, 0.00709, -0.0948],
+        [1.0, 0.6309, 0.00750, -0.1025],
+        [1.5, 0.7175, 0.00771, -0.1081],
+        [2.0, 0.7579, 0.00793, -0.1038],
+        [2.5, 0.7981, 0.00821, -0.0995],
+        [3.0, 0.8358, 0.00861, -0.0946],
+        [3.5, 0.8735, 0.00907, -0.0897],
+        [4.0, 0.9102, 0.00960, -0.0846],
+        [4.5, 0.9452, 0.01021, -0.0792],
+        [5.0, 0.9817, 0.01080, -0.0741],
+        [5.5, 1.0202, 0.01135, -0.0694],
+        [6.0, 1.0550, 0.01188, -0.0639],
+        [6.5, 1.0897, 0.01246, -0.0584],
+        [7.0, 1.1243, 0.01315, -0.0531],
+        [7.5, 1.1629, 0.01379, -0.0486],
+        [8.0, 1.1957, 0.01472, -0.0435],
+        [8.5, 1.2170, 0.01630, -0.0371],
+        [9.0, 1.2275, 0.01869, -0.0301],
+        [9.5, 1.2439, 0.02102, -0.0244],
+        [10.0, 1.2688, 0.02306, -0.0201],
+        [10.5, 1.2824, 0.02600, -0.0154],
+        [11.0, 1.2922, 0.02948, -0.0112],
+        [11.5, 1.3109, 0.03261, -0.0082],
+        [12.0, 1.3231, 0.03646, -0.0055],
+        [12.5, 1.3200, 0.04191, -0.0032],
+        [13.0, 1.3237, 0.04707, -0.0016],
+        [13.5, 1.3324, 0.05221, -0.0010],
+        [14.0, 1.3333, 0.05846, -0.0011],
+        [14.5, 1.3133, 0.06695, -0.0018],
+        [15.0, 1.3119, 0.07404, -0.0029],
+        [15.5, 1.3048, 0.08208, -0.0049],
+        [16.0, 1.2916, 0.09107, -0.0077],
+        [16.5, 1.2671, 0.10158, -0.0112],
+        [17.0, 1.2522, 0.11127, -0.0147],
+        [17.5, 1.2331, 0.12165, -0.0190],
+        [18.0, 1.2133, 0.13257, -0.0241],
+        [18.5, 1.1914, 0.14417, -0.0300],
+        [19.0, 1.1614, 0.15750, -0.0373],
+        [19.5, 1.1295, 0.17217, -0.0459],
+        [20.0, 1.0784, 0.19284, -0.0585]
+    ])
+    return data
+
+
+# Compiled polar tables: one per (config block, source files), mapped once per process
+_DATABASES = {}
+
+
+def read_polar_file(path):
+    """
+    One airfoil polar from a text file: '#' header lines giving the
+    Reynolds and Mach numbers ("# Re = 500000", "# Mach = 0.35"), then
+    rows of Alpha(deg), CL, CD[, Cm], comma or whitespace separated.
+    Returns (Re, Mach, table) with table columns Alpha, CL, CD, Cm.
+    """
+    meta = {}
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                key, sep, value = line[1:].replace(":", "=").partition("=")
+                if sep:
+                    meta[key.strip().lower()] = float(value)
+                continue
+            try:
+                rows.append([float(v) for v in line.replace(",", " ").split()])
+            except ValueError:
+                continue   # column header
+
+    if "re" not in meta or "mach" not in meta:
+        raise ValueError(f"{path}: polar files need '# Re = ...' and '# Mach = ...' header lines")
+    table = np.array(rows, dtype=float)
+    if table.ndim != 2 or table.shape[1] not in (3, 4) or len(table) < 2:
+        raise ValueError(f"{path}: expected rows of Alpha, CL, CD[, Cm]")
+    if table.shape[1] == 3:
+        table = np.column_stack((table, np.zeros(len(table))))
+    return meta["re"], meta["mach"], table[np.argsort(table[:, 0])]
+
+
+def _uniform_resample(values, axis_in, axis_out, axis):
+    """Linear resampling of values along one axis onto axis_out (clamped at the ends)."""
+    if len(axis_in) == 1:
+        return np.repeat(values, len(axis_out), axis=axis)
+    idx = np.clip(np.searchsorted(axis_in, axis_out) - 1, 0, len(axis_in) - 2)
+    w = np.clip((axis_out - axis_in[idx]) / (axis_in[idx + 1] - axis_in[idx]), 0.0, 1.0)
+    shape = [1] * values.ndim
+    shape[axis] = len(axis_out)
+    w = w.reshape(shape)
+    return np.take(values, idx, axis=axis) * (1.0 - w) + np.take(values, idx + 1, axis=axis) * w
+
+
+def compile_polars(paths, re_steps=32, mach_steps=16, alpha_step=0.25):
+    """
+    Tables of CL, CD and Cm on uniform grids in log10(Re), Mach and alpha,
+    built from polar files that together cover a full Re x Mach grid.
+
+    Returns (data, meta): data is (n_re x n_mach x n_alpha x 3) float32,
+    meta holds the first value and step of each axis. Alpha spans the range
+    covered by every file; Re and Mach outside the files' range are clamped.
+    """
+    polars = {}
+    for path in paths:
+        re, mach, table = read_polar_file(path)
+        polars[(re, mach)] = table
+    re_in = np.array(sorted({re for re, _ in polars}))
+    mach_in = np.array(sorted({mach for _, mach in polars}))
+    missing = [(re, m) for re in re_in for m in mach_in if (re, m) not in polars]
+    if missing:
+        raise ValueError(f"polar files must cover every (Re, Mach) pair; missing {missing}")
+
+    a_lo = max(t[0, 0] for t in polars.values())
+    a_hi = min(t[-1, 0] for t in polars.values())
+    alpha = np.arange(a_lo, a_hi + 0.5 * alpha_step, alpha_step)
+
+    raw = np.empty((len(re_in), len(mach_in), len(alpha), 3))
+    for i, re in enumerate(re_in):
+        for j, mach in enumerate(mach_in):
+            t = polars[(re, mach)]
+            for c in range(3):
+                raw[i, j, :, c] = np.interp(alpha, t[:, 0], t[:, c + 1])
+
+    # Uniform axes make the lookup of a station's cell an O(1) index computation
+    log_re = np.log10(re_in)
+    n_re = 1 if len(re_in) == 1 else int(re_steps)
+    n_mach = 1 if len(mach_in) == 1 else int(mach_steps)
+    log_re_out = np.linspace(log_re[0], log_re[-1], n_re)
+    mach_out = np.linspace(mach_in[0], mach_in[-1], n_mach)
+    data = _uniform_resample(raw, log_re, log_re_out, axis=0)
+    data = _uniform_resample(data, mach_in, mach_out, axis=1)
+
+    meta = {
+        "log_re": [float(log_re_out[0]), float(log_re_out[1] - log_re_out[0]) if n_re > 1 else 1.0],
+        "mach": [float(mach_out[0]), float(mach_out[1] - mach_out[0]) if n_mach > 1 else 1.0],
+        "alpha": [float(alpha[0]), float(alpha_step)],
+        "shape": list(data.shape),
+    }
+    return data.astype(np.float32), meta
+
+
+def _axis_cell(x, x0, dx, n):
+    """Lower grid index and weight of x on the uniform axis x0 + dx * i, i < n (clamped)."""
+    u = np.clip((x - x0) / dx, 0.0, n - 1)
+    i = np.minimum(u.astype(np.intp), max(n - 2, 0))
+    return i, u - i
+
+
+class PolarDatabase:
+    """
+    Read-only Re/Mach-dependent airfoil polars.
+
+    The polar files in processing/inputs/polars/<name> are compiled once into
+    a .npy table (plus a small JSON header) under processing/cache/polars, and
+    recompiled only when the files change. The table is memory-mapped, so all
+    worker processes share one copy in the OS page cache and their memory
+    does not grow with the size of the library. All three axes are uniform
+    (log10 Re, Mach, alpha), so finding a station's polar, or a coefficient
+    at a given alpha, is a constant-time index computation plus a blend of
+    the neighbouring grid points.
+    """
+
+    def __init__(self, table_path, meta):
+        self.path = table_path
+        self.meta = meta
+        self.data = np.load(table_path, mmap_mode="r")
+        self.n_re, self.n_mach, self.n_alpha, _ = self.data.shape
+        self.alpha = meta["alpha"][0] + meta["alpha"][1] * np.arange(self.n_alpha)
+
+    @classmethod
+    def from_config(cls, cfg):
+        """
+        The database named in the optional "polarDatabase" config block
+        (compiled if needed), or None when the block is absent.
+        """
+        db_cfg = cfg.get("polarDatabase")
+        if not db_cfg:
+            return None
+
+        src_dir = os.path.join(db_cfg.get("dir", "processing/inputs/polars"), db_cfg["name"])
+        paths = sorted(
+            os.path.join(src_dir, f) for f in os.listdir(src_dir)
+            if os.path.splitext(f)[1] in (".csv", ".dat", ".txt")
+        )
+        settings = {
+            "re_steps": db_cfg.get("reSteps", 32),
+            "mach_steps": db_cfg.get("machSteps", 16),
+            "alpha_step": db_cfg.get("alphaStep", 0.25),
+        }
+        # Source file names, sizes and times plus the grid settings
+        source = hashlib.sha1(json.dumps([
+            [(os.path.basename(p), os.path.getsize(p), os.path.getmtime(p)) for p in paths], settings
+        ]).encode()).hexdigest()
+
+        out_dir = db_cfg.get("cacheDir", "processing/cache/polars")
+        table_path = os.path.join(out_dir, f"{db_cfg['name']}.npy")
+        meta_path = os.path.join(out_dir, f"{db_cfg['name']}.json")
+
+        if (table_path, source) in _DATABASES:
+            return _DATABASES[(table_path, source)]
+
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(table_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        if meta is None or meta.get("source") != source:
+            data, meta = compile_polars(paths, **settings)
+            meta["source"] = source
+            if not os.path.exists(out_dir):
+                os.makedirs(out_dir)
+            # Written to temporary files and moved into place, so a worker
+            # never maps a half-written table
+            with open(table_path + ".tmp", "wb") as f:
+                np.save(f, data)
+            os.replace(table_path + ".tmp", table_path)
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump(meta, f, indent=4)
+            os.replace(meta_path + ".tmp", meta_path)
+
+        _DATABASES[(table_path, source)] = cls(table_path, meta)
+        return _DATABASES[(table_path, source)]
+
+    @property
+    def signature(self):
+        """Identifies the compiled tables (for evaluation cache keys)."""
+        return self.meta["source"]
+
+    def locate(self, Re, M):
+        """
+        Grid cells of the local (Re, M) of each station, for station_polars
+        and coefficients: the flat offsets of the four surrounding (Re, Mach)
+        tables, (4 x ...), and their bilinear weights, (4 x ...).
+        """
+        Re, M = np.broadcast_arrays(np.asarray(Re, dtype=float), np.asarray(M, dtype=float))
+        i_re, w_re = _axis_cell(np.log10(np.maximum(Re, 1.0)), *self.meta["log_re"], self.n_re)
+        i_m, w_m = _axis_cell(M, *self.meta["mach"], self.n_mach)
+        i_re1 = np.minimum(i_re + 1, self.n_re - 1)
+        i_m1 = np.minimum(i_m + 1, self.n_mach - 1)
+
+        table = self.n_alpha * 3
+        offsets = np.stack([
+            (i_re * self.n_mach + i_m) * table,
+            (i_re * self.n_mach + i_m1) * table,
+            (i_re1 * self.n_mach + i_m) * table,
+            (i_re1 * self.n_mach + i_m1) * table,
+        ])
+        weights = np.stack([
+            (1.0 - w_re) * (1.0 - w_m),
+            (1.0 - w_re) * w_m,
+            w_re * (1.0 - w_m),
+            w_re * w_m,
+        ])
+        return offsets, weights
+
+    def station_polars(self, Re, M):
+        """
+        Full polar of each station at its (Re, M): (... x n_alpha x 4) with
+        columns Alpha(deg), CL, CD, Cm, the layout XROTOR expects.
+        """
+        offsets, weights = self.locate(Re, M)
+        flat = self.data.reshape(-1)
+        entries = np.arange(self.n_alpha * 3).reshape(self.n_alpha, 3)
+        coeffs = sum(
+            w[..., None, None] * flat[o[..., None, None] + entries]
+            for o, w in zip(offsets, weights)
+        )
+        alpha = np.broadcast_to(self.alpha[:, None], coeffs.shape[:-1] + (1,))
+        return np.concatenate((alpha, coeffs), axis=-1)
+
+    def coefficients(self, cell, alpha):
+        """(CL, CD) at angle of attack alpha (deg) for stations located with locate()."""
+        offsets, weights = cell
+        i_a, w_a = _axis_cell(np.asarray(alpha, dtype=float), *self.meta["alpha"], self.n_alpha)
+        flat = self.data.reshape(-1)
+        idx = offsets + 3 * i_a
+        # Next alpha row, unless the table has a single angle
+        step = 3 if self.n_alpha > 1 else 0
+        cl = (weights * (flat[idx] * (1.0 - w_a) + flat[idx + step] * w_a)).sum(axis=0)
+        cd = (weights * (flat[idx + 1] * (1.0 - w_a) + flat[idx + 1 + step] * w_a)).sum(axis=0)
+        return cl, cd
@@ -0,0 +1,143 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+    """
+    Lightweight instrumentation for the evaluation pipeline.
+
+    - stage(name)   : context manager accumulating call count and wall time
+    - count(name)   : event counters (solver errors, NaNs, cache hits, ...)
+    - generation()  : designs per generation and evaluations per second
+
+    When disabled every method is a no-op, so the hooks can stay in the
+    hot path. Worker processes hand their numbers back with drain() and the
+    parent folds them in with merge().
+    """
+
+    def __init__(self, enabled=False, live=False):
+        self.enabled = enabled
+        self.live = live
+        self.stages = {}        # name -> [calls, seconds]
+        self.counters = {}      # name -> count
+        self.generations = []   # one dict per generation
+
+    @classmethod
+    def from_config(cls, cfg):
+        prof_cfg = cfg.get("profiling", {})
+        return cls(
+            enabled=prof_cfg.get("enabled", bool(prof_cfg)),
+            live=prof_cfg.get("live", False),
+        )
+
+    def stage(self, name):
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name, seconds, calls=1):
+        if not self.enabled:
+            return
+        entry = self.stages.setdefault(name, [0, 0.0])
+        entry[0] += calls
+        entry[1] += seconds
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def generation(self, n_designs, n_solved, seconds):
+        """Record one call of the problem's _evaluate (one DE generation)."""
+        if not self.enabled:
+            return
+        gen = {
+            "gen": len(self.generations) + 1,
+            "designs": n_designs,
+            "solved": n_solved,
+            "seconds": seconds,
+            "evals_per_sec": n_designs / seconds if seconds > 0 else 0.0,
+        }
+        self.generations.append(gen)
+        if self.live:
+            failures = self.counters.get("solver_errors", 0) + self.counters.get("explosions", 0)
+            print(
+                f"  [profile] gen {gen['gen']}: {n_designs} designs ({n_solved} solved) "
+                f"in {seconds:.3f} s, {gen['evals_per_sec']:.1f} evals/s, "
+                f"{failures} solver failures so far"
+            )
+
+    def drain(self):
+        """Return the stage/counter totals since the last drain and reset them."""
+        if not self.enabled:
+            return None
+        snapshot = {"stages": self.stages, "counters": self.counters}
+        self.stages = {}
+        self.counters = {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """Fold in stage/counter totals from drain() or to_dict()."""
+        if not self.enabled or not snapshot:
+            return
+        for name, (calls, seconds) in snapshot["stages"].items():
+            self.add(name, seconds, calls)
+        for name, n in snapshot["counters"].items():
+            self.count(name, n)
+
+    def to_dict(self):
+        return {
+            "stages": {name: list(entry) for name, entry in self.stages.items()},
+            "counters": dict(self.counters),
+            "generations": list(self.generations),
+        }
+
+
+def merge_profiles(profiles):
+    """
+    Combine the to_dict() reports of several runs (e.g. restarts) into one.
+    Generation records are kept per run under "runs". Returns None if no
+    run was profiled.
+    """
+    profiles = [p for p in profiles if p]
+    if not profiles:
+        return None
+
+    total = Profiler(enabled=True)
+    for p in profiles:
+        total.merge(p)
+    report = total.to_dict()
+    report["runs"] = [p["generations"] for p in profiles]
+    del report["generations"]
+    return report
+
+
+def write_profile_report(report, outdir="processing/outputs"):
+    """
+    Write profile.json (full report) and profile_stages.csv (one row per
+    stage and counter) to outdir.
+    """
+    if not os.path.exists(outdir):
+        os.makedirs(outdir)
+
+    with open(os.path.join(outdir, "profile.json"), "w") as f:
+        json.dump(report, f, indent=4)
+
+    with open(os.path.join(outdir, "profile_stages.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "kind", "calls", "total_s", "mean_ms"])
+        stages = sorted(report["stages"].items(), key=lambda item: -item[1][1])
+        for name, (calls, seconds) in stages:
+            writer.writerow([name, "stage", calls, f"{seconds:.6f}", f"{1e3 * seconds / max(calls, 1):.4f}"])
+        for name, n in sorted(report["counters"].items()):
+            writer.writerow([name, "counter", n, "", ""])
@@ -0,0 +1,173 @@
+import copy
+import time
+
+import numpy as np
+from scipy.optimize import minimize as scipy_minimize
+
+from .geometry_param import decode_population
+
+
+# Constraint values up to this are treated as satisfied (SLSQP round-off)
+FEASIBILITY_TOL = 1e-9
+
+
+class RefineResult:
+    def __init__(self, x0, F0, G0, x, F, G, n_iter, n_batches, n_designs, seconds, message):
+        self.x0 = x0
+        self.F0 = F0
+        self.G0 = G0
+        self.x = x
+        self.F = F
+        self.G = G
+        self.n_iter = n_iter
+        self.n_batches = n_batches
+        self.n_designs = n_designs
+        self.seconds = seconds
+        self.message = message
+
+    @property
+    def improved(self):
+        """True when the refined design is feasible and better than the start."""
+        return bool(np.all(self.G <= FEASIBILITY_TOL) and self.F < self.F0)
+
+    @property
+    def thrust_gain(self):
+        return float(self.F0 - self.F) if self.improved else 0.0
+
+
+class _StencilEvaluator:
+    """
+    Objective, signed constraint margins and their finite-difference
+    gradients for SLSQP. A point alone is solved when only its values are
+    needed (e.g. along a line search); the 2 * n_var neighbours of an
+    iterate are solved in one batch, across the worker pool, only when its
+    gradient is requested. The last point and the last gradient are kept,
+    so SLSQP's separate requests for the same iterate are not solved twice.
+    The best feasible point solved so far is kept as well.
+    """
+
+    def __init__(self, problem, step):
+        self.problem = problem
+        self.step = step
+        self.n_batches = 0
+        self.n_designs = 0
+        self._x = None
+        self._grad_x = None
+        self.best = None    # (F, x, G) of the best feasible point
+
+    def _evaluate(self, X):
+        """F and signed G of the rows of X, in one batch."""
+        problem = self.problem
+        chords, betas = decode_population(X, problem.cfg["geometryBounds"], problem.cfg["geometryGlobal"])
+        with problem.profiler.stage("solve"):
+            T, P = problem._solve(chords, betas)
+        self.n_batches += 1
+        self.n_designs += len(X)
+        return problem.obj.evaluate_batch(T, P, chords, betas, clip=False)
+
+    def _point(self, x):
+        if self._x is not None and np.array_equal(x, self._x):
+            return
+        F, G = self._evaluate(x[None, :])
+        self._x = x.copy()
+        self.F = F[0]
+        self.G = G[0]
+        if np.all(self.G <= FEASIBILITY_TOL) and (self.best is None or self.F < self.best[0]):
+            self.best = (self.F, self._x, self.G)
+
+    def _stencil(self, x):
+        if self._grad_x is not None and np.array_equal(x, self._grad_x):
+            return
+
+        n = len(x)
+        lo = np.tile(x, (n, 1))
+        hi = np.tile(x, (n, 1))
+        idx = np.arange(n)
+        # One-sided at the bounds, central elsewhere
+        hi[idx, idx] = np.minimum(x + self.step, 1.0)
+        lo[idx, idx] = np.maximum(x - self.step, 0.0)
+
+        F, G = self._evaluate(np.vstack((hi, lo)))
+        dx = (hi[idx, idx] - lo[idx, idx])[:, None]
+        self._grad_x = x.copy()
+        self.dF = (F[:n] - F[n:]) / dx[:, 0]
+        self.dG = (G[:n] - G[n:]) / dx
+
+    def objective(self, x):
+        self._point(x)
+        return self.F
+
+    def objective_grad(self, x):
+        self._stencil(x)
+        return self.dF
+
+    def constraints(self, x):
+        self._point(x)
+        return self.G
+
+    def constraints_jac(self, x):
+        self._stencil(x)
+        return self.dG.T
+
+
+def refine(cfg, x0, max_iter=20, fd_step=1e-3, ftol=1e-6, n_workers=None):
+    """
+    Local SLSQP refinement of the design vector x0 within the [0, 1] bounds,
+    subject to the problem's six constraints (g <= 0, as signed margins so
+    that SLSQP sees a constraint before it becomes active), with gradients
+    from finite differences of the full objective.
+
+    Pre-screening, the surrogate and multi-fidelity evaluation are switched
+    off: every point is solved on the fine grid. Returns a RefineResult; the
+    refined design is the final SLSQP iterate, or the best feasible point
+    solved along the way if that is better, and only counts as an
+    improvement when it is feasible and better than x0.
+    """
+    from .optimizer import ThrustCruiseProblem
+
+    cfg = copy.deepcopy(cfg)
+    opt_cfg = cfg.setdefault("optimization", {})
+    opt_cfg.pop("prescreen", None)
+    opt_cfg.pop("surrogate", None)
+    opt_cfg.pop("multi_fidelity", None)
+    if n_workers is not None:
+        opt_cfg["n_workers"] = n_workers
+
+    t0 = time.perf_counter()
+    problem = ThrustCruiseProblem(cfg)
+    evaluator = _StencilEvaluator(problem, fd_step)
+    try:
+        x0 = np.clip(np.asarray(x0, dtype=float), 0.0, 1.0)
+        F0 = evaluator.objective(x0)
+        G0 = evaluator.constraints(x0)
+        scale = max(abs(F0), 1.0)
+
+        res = scipy_minimize(
+            lambda x: evaluator.objective(x) / scale,
+            x0,
+            jac=lambda x: evaluator.objective_grad(x) / scale,
+            method="SLSQP",
+            bounds=[(0.0, 1.0)] * len(x0),
+            # SLSQP expects c(x) >= 0
+            constraints=[{
+                "type": "ineq",
+                "fun": lambda x: -evaluator.constraints(x),
+                "jac": lambda x: -evaluator.constraints_jac(x),
+            }],
+            options={"maxiter": max_iter, "ftol": ftol},
+        )
+
+        x = np.clip(res.x, 0.0, 1.0)
+        F = evaluator.objective(x)
+        G = evaluator.constraints(x)
+        if evaluator.best is not None and not (np.all(G <= FEASIBILITY_TOL) and F <= evaluator.best[0]):
+            # Stopped outside the feasible region (e.g. at the iteration
+            # limit): fall back to the best feasible point of the search
+            F, x, G = evaluator.best
+    finally:
+        problem.close()
+
+    return RefineResult(
+        x0, F0, G0, x, F, G, res.nit, evaluator.n_batches, evaluator.n_designs,
+        time.perf_counter() - t0, res.message,
+    )
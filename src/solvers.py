@@ -0,0 +1,35 @@
+SOLVER_BACKENDS = ("xrotor", "bemt")
+
+
+def make_solver(cfg, use_cache=True):
+    """
+    Build the aerodynamic solver selected by cfg["solver"]["backend"].
+
+    Both backends expose evaluate(chords, betas_le, V=None, rpm=None, warm=False)
+    returning {"T", "P", "Q", "RPM", "eta", "J"}; the BEMT backend also has
+    evaluate_batch for whole populations.
+    """
+    backend = cfg.get("solver", {}).get("backend", "xrotor")
+
+    if backend == "xrotor":
+        from .xrotor_interface import XRotorWrapper
+        return XRotorWrapper(cfg, use_cache=use_cache)
+    if backend == "bemt":
+        from .bemt import BEMTSolver
+        return BEMTSolver(cfg, use_cache=use_cache)
+
+    raise ValueError(f"Unknown solver backend '{backend}', expected one of {SOLVER_BACKENDS}")
+
+
+def make_point_solvers(cfg, use_cache=True):
+    """
+    One solver per operating point (see operating_points), sharing a single
+    profiler. Each solver, and its evaluation cache, is bound to its own
+    operating conditions.
+    """
+    from .operating_points import operating_points, point_config
+
+    solvers = [make_solver(point_config(cfg, p), use_cache=use_cache) for p in operating_points(cfg)]
+    for solver in solvers[1:]:
+        solver.profiler = solvers[0].profiler
+    return solvers
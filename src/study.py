@@ -0,0 +1,253 @@
+import copy
+import csv
+import glob
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .archive import EliteArchive
+from .multistart import n_seeded, restart_seeds, run_restart, select_best
+from .objective_function import check_tip_mach
+
+
+RESULTS_NAME = "results.csv"
+
+
+def set_path(cfg, path, value):
+    """Set cfg["a"]["b"] = value for path "a.b"."""
+    keys = path.split(".")
+    node = cfg
+    for key in keys[:-1]:
+        node = node.setdefault(key, {})
+    node[keys[-1]] = value
+
+
+def cases_from_dir(config_dir):
+    """One case per *.json file in config_dir, named after the file."""
+    cases = []
+    for path in sorted(glob.glob(os.path.join(config_dir, "*.json"))):
+        with open(path) as f:
+            cfg = json.load(f)
+        case_id = os.path.splitext(os.path.basename(path))[0]
+        cases.append({"case_id": case_id, "cfg": cfg, "params": {}})
+    return cases
+
+
+def cases_from_grid(grid, base_cfg):
+    """
+    One case per combination of the grid's "parameters", a dict of dotted
+    config paths (e.g. "geometryGlobal.diameter") to lists of values,
+    applied on top of base_cfg.
+    """
+    names = list(grid["parameters"])
+    cases = []
+    for i, values in enumerate(itertools.product(*(grid["parameters"][n] for n in names))):
+        cfg = copy.deepcopy(base_cfg)
+        params = dict(zip(names, values))
+        for name, value in params.items():
+            set_path(cfg, name, value)
+        cases.append({"case_id": f"case_{i:04d}", "cfg": cfg, "params": params})
+    return cases
+
+
+def _case_path(out_dir, case_id):
+    return os.path.join(out_dir, "cases", f"{case_id}.json")
+
+
+def _write_json(path, data):
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname)
+    with open(path + ".tmp", "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def load_case_results(out_dir, cases):
+    """Finished case records (from an earlier run of the study), by case id."""
+    done = {}
+    for case in cases:
+        path = _case_path(out_dir, case["case_id"])
+        if os.path.exists(path):
+            with open(path) as f:
+                done[case["case_id"]] = json.load(f)
+    return done
+
+
+def write_results_table(out_dir, cases, records):
+    """
+    results.csv: one row per finished case, in case order, indexed by the
+    case's position in the study and its id.
+    """
+    param_names = []
+    for case in cases:
+        for name in case["params"]:
+            if name not in param_names:
+                param_names.append(name)
+    n_var = max((len(r["X"]) for r in records.values() if r["X"] is not None), default=0)
+
+    header = (
+        ["index", "case_id"] + param_names
+        + ["status", "thrust", "cv", "best_run", "best_seed", "master_seed", "n_restarts", "seconds", "error"]
+        + [f"x{j}" for j in range(n_var)]
+    )
+    with open(os.path.join(out_dir, RESULTS_NAME), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for index, case in enumerate(cases):
+            r = records.get(case["case_id"])
+            if r is None:
+                continue
+            X = r["X"] if r["X"] is not None else [""] * n_var
+            writer.writerow(
+                [index, case["case_id"]] + [case["params"].get(n, "") for n in param_names]
+                + [r["status"], r["thrust"], r["cv"], r["best_run"], r["best_seed"],
+                   r["master_seed"], r["n_restarts"], f"{r['seconds']:.2f}", r.get("error") or ""]
+                + list(X)
+            )
+
+
+def _case_record(case, results, master_seed, seconds, status=None, error=None):
+    best = select_best(results)
+    if status is None:
+        status = "ok" if best is not None else "no_feasible"
+    return {
+        "case_id": case["case_id"],
+        "params": case["params"],
+        "status": status,
+        "thrust": None if best is None else float(-best.F[0]),
+        "cv": None if best is None else float(np.ravel(best.CV)[0]),
+        "best_run": None if best is None else best.run_id,
+        "best_seed": None if best is None else best.seed,
+        "master_seed": master_seed,
+        "n_restarts": len(results),
+        "seconds": seconds,
+        "X": None if best is None else [float(x) for x in best.X],
+        "error": error,
+    }
+
+
+def run_study(cases, out_dir, n_workers=1, master_seed=0, resume=False):
+    """
+    Optimize every case, with all restarts of all cases scheduled on one
+    shared pool of n_workers processes (each restart evaluates serially).
+
+    Each case gets its master seed from the case config's optimization.seed,
+    or else from (master_seed, case index), so results do not depend on
+    scheduling. A finished case is written to out_dir/cases/<case_id>.json
+    and the results table is rewritten. A case whose setup or any restart
+    raises is recorded with status "failed" and the error, and the study
+    goes on with the other cases. With resume=True, cases that already have
+    a record are skipped, except failed ones, which are run again.
+    Returns the records of all finished cases, by case id.
+    """
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    records = load_case_results(out_dir, cases) if resume else {}
+    case_seeds = restart_seeds(master_seed, len(cases))
+
+    tasks = {}       # future -> case id
+    pending = {}     # case id -> [case, restart results, n_restarts, start time, master seed, archive]
+
+    def fail(case, seed, t_start, e):
+        case_id = case["case_id"]
+        print(f"  {case_id}: failed ({type(e).__name__}: {e})")
+        records[case_id] = _case_record(
+            case, [], seed, time.time() - t_start, status="failed", error=f"{type(e).__name__}: {e}"
+        )
+        _write_json(_case_path(out_dir, case_id), records[case_id])
+
+    executor = ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        for index, case in enumerate(cases):
+            case_id = case["case_id"]
+            if case_id in records and records[case_id]["status"] != "failed":
+                print(f"  {case_id}: already done, skipping")
+                continue
+            records.pop(case_id, None)
+
+            cfg = copy.deepcopy(case["cfg"])
+            opt_cfg = cfg.setdefault("optimization", {})
+            # The shared pool is the only level of parallelism
+            opt_cfg["n_workers"] = 1
+            opt_cfg.pop("distributed", None)
+            opt_cfg.pop("checkpoint", None)
+            seed = opt_cfg.get("seed", case_seeds[index])
+
+            try:
+                check_tip_mach(cfg)
+            except ValueError as e:
+                print(f"  {case_id}: skipped ({e})")
+                records[case_id] = _case_record(case, [], seed, 0.0, status="tip_mach")
+                _write_json(_case_path(out_dir, case_id), records[case_id])
+                continue
+
+            n_restarts = opt_cfg.get("n_restarts", 5)
+            n_gen = opt_cfg.get("n_gen", 100)
+            pop_size = opt_cfg.get("pop_size", 50)
+
+            # Elites are looked up when the case is queued, from the archive
+            # as it stood at the start of the study
+            try:
+                archive = EliteArchive.from_config(cfg)
+                elites = None if archive is None else archive.lookup(cfg, n_seeded(cfg, pop_size))
+            except Exception as e:
+                fail(case, seed, time.time(), e)
+                continue
+
+            pending[case_id] = [case, [], n_restarts, time.time(), seed, archive]
+            for run_id, run_seed in enumerate(restart_seeds(seed, n_restarts), start=1):
+                future = executor.submit(
+                    run_restart, cfg, run_id, run_seed, n_gen, pop_size, False, elites=elites
+                )
+                tasks[future] = case_id
+
+        write_results_table(out_dir, cases, records)
+
+        for future in as_completed(tasks):
+            case_id = tasks[future]
+            if case_id not in pending:
+                # Another restart of this case failed already
+                continue
+            case, results, n_restarts, t_start, seed, archive = pending[case_id]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                del pending[case_id]
+                for other, other_id in tasks.items():
+                    if other_id == case_id:
+                        other.cancel()
+                fail(case, seed, t_start, e)
+                write_results_table(out_dir, cases, records)
+                continue
+            if len(results) < n_restarts:
+                continue
+
+            results.sort(key=lambda r: r.run_id)
+            if archive is not None:
+                try:
+                    for res in results:
+                        archive.add(case["cfg"], res.elites_X, res.elites_F)
+                    archive.save()
+                except Exception as e:
+                    fail(case, seed, t_start, e)
+                    write_results_table(out_dir, cases, records)
+                    continue
+            records[case_id] = _case_record(case, results, seed, time.time() - t_start)
+            _write_json(_case_path(out_dir, case_id), records[case_id])
+            write_results_table(out_dir, cases, records)
+
+            r = records[case_id]
+            if r["thrust"] is not None:
+                print(f"  {case_id}: T = {r['thrust']:.2f} N (run {r['best_run']}) [{len(records)}/{len(cases)} done]")
+            else:
+                print(f"  {case_id}: no feasible solution [{len(records)}/{len(cases)} done]")
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    return records
@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.linalg import cholesky, solve_triangular
+
+
+class RBFSurrogate:
+    """
+    Gaussian-kernel interpolation model (the mean of a GP with fixed
+    hyperparameters) of the objective F and constraint violation CV over
+    the normalized design vector.
+
+    Training points are added incrementally: the Cholesky factor of the
+    kernel matrix is extended by one block per update rather than
+    refactorized. Once max_points is exceeded, the oldest half of the data
+    is dropped and the factor rebuilt, so full refits happen only once per
+    max_points / 2 new points.
+    """
+
+    def __init__(self, length_scale=0.5, nugget=1e-6, max_points=1000):
+        self.length_scale = length_scale
+        self.nugget = nugget
+        self.max_points = int(max_points)
+
+        self.X = None          # (n x d) training inputs
+        self.Y = None          # (n x 2) training targets [F, CV]
+        self.L = None          # lower Cholesky factor of K + nugget * I
+        self.n_refits = 0
+
+    @classmethod
+    def from_config(cls, sur_cfg):
+        return cls(
+            length_scale=sur_cfg.get("length_scale", 0.5),
+            nugget=sur_cfg.get("nugget", 1e-6),
+            max_points=sur_cfg.get("max_points", 1000),
+        )
+
+    def __len__(self):
+        return 0 if self.X is None else len(self.X)
+
+    def _kernel(self, A, B):
+        d2 = (
+            np.sum(A**2, axis=1)[:, None]
+            + np.sum(B**2, axis=1)[None, :]
+            - 2.0 * A @ B.T
+        )
+        return np.exp(-np.maximum(d2, 0.0) / (2.0 * self.length_scale**2))
+
+    def _factor(self, K):
+        """Cholesky factor of K + nugget * I, raising the nugget if K is near-singular."""
+        jitter = self.nugget
+        for _ in range(6):
+            try:
+                return cholesky(K + jitter * np.eye(len(K)), lower=True)
+            except np.linalg.LinAlgError:
+                jitter *= 10.0
+        raise np.linalg.LinAlgError("surrogate kernel matrix is not positive definite")
+
+    def add(self, X, F, CV):
+        """Add evaluated designs (X: m x d, F and CV: m) to the model."""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        Y = np.column_stack((F, CV)).astype(float)
+
+        # Exact duplicates add nothing and would make the kernel singular
+        X, first = np.unique(X, axis=0, return_index=True)
+        Y = Y[first]
+        if self.X is not None:
+            new = self._kernel(X, self.X).max(axis=1) < 1.0 - 1e-12
+            X, Y = X[new], Y[new]
+        if len(X) == 0:
+            return
+
+        if self.X is None:
+            self.X, self.Y = X, Y
+            self.L = self._factor(self._kernel(X, X))
+        elif len(self.X) + len(X) > self.max_points:
+            # Keep the newest data: drop the oldest half and refactorize
+            keep = max(self.max_points // 2 - len(X), 0)
+            self.X = np.vstack((self.X[len(self.X) - keep:], X))
+            self.Y = np.vstack((self.Y[len(self.Y) - keep:], Y))
+            self.L = self._factor(self._kernel(self.X, self.X))
+            self.n_refits += 1
+        else:
+            # Block update: [[L, 0], [L21, L22]]
+            K12 = self._kernel(self.X, X)
+            L21 = solve_triangular(self.L, K12, lower=True).T
+            L22 = self._factor(self._kernel(X, X) - L21 @ L21.T)
+            n, m = len(self.X), len(X)
+            L = np.zeros((n + m, n + m))
+            L[:n, :n] = self.L
+            L[n:, :n] = L21
+            L[n:, n:] = L22
+            self.L = L
+            self.X = np.vstack((self.X, X))
+            self.Y = np.vstack((self.Y, Y))
+
+    def predict(self, X):
+        """Predicted (F, CV) for the rows of X."""
+        mean = self.Y.mean(axis=0)
+        scale = self.Y.std(axis=0)
+        scale[scale == 0.0] = 1.0
+
+        Z = (self.Y - mean) / scale
+        alpha = solve_triangular(self.L.T, solve_triangular(self.L, Z, lower=True), lower=False)
+        pred = self._kernel(np.atleast_2d(X), self.X) @ alpha * scale + mean
+        return pred[:, 0], pred[:, 1]
+
+    def rank(self, X, cv_tol=1e-3):
+        """
+        Indices of the rows of X from most to least promising: predicted
+        feasible designs (CV below cv_tol) first by F, then the rest by CV.
+        """
+        F, CV = self.predict(X)
+        CV = np.where(CV < cv_tol, 0.0, CV)
+        return np.lexsort((F, CV))
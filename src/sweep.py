@@ -0,0 +1,190 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .evaluate import N_CONTROL_POINTS, parse_designs
+from .geometry_param import decode_population
+from .solvers import make_solver
+from .xrotor_interface import PENALTY_RESULT
+
+
+SWEEP_KEYS = ("T", "P", "Q", "eta")
+
+# Solver owned by each sweep worker process
+_solver = None
+
+
+def _axis(spec, default):
+    """
+    Grid axis from a config entry: a list of values, a
+    {"start", "stop", "num"} dict, or None for the single default value.
+    """
+    if spec is None:
+        return np.array([float(default)])
+    if isinstance(spec, dict):
+        return np.linspace(spec["start"], spec["stop"], int(spec["num"]))
+    return np.asarray(spec, dtype=float)
+
+
+def sweep_grid(cfg):
+    """
+    (rpm, V) grid of operating points from cfg["sweep"].
+
+    The grid is rpm x (V or J): with "J" given, the airspeed of each point is
+    V = J * n * D for its rpm. Missing axes fall back to the design point in
+    operatingConditions. Returns (rpm, V, J), each of shape (n_rpm, n_col).
+    """
+    sweep_cfg = cfg.get("sweep", {})
+    oc = cfg["operatingConditions"]
+    D = cfg["geometryGlobal"]["diameter"]
+
+    if "V" in sweep_cfg and "J" in sweep_cfg:
+        raise ValueError("sweep: give either 'V' or 'J', not both")
+
+    rpm_axis = _axis(sweep_cfg.get("rpm"), oc["rpm"])
+    n = rpm_axis[:, None] / 60.0
+
+    if "J" in sweep_cfg:
+        J = _axis(sweep_cfg["J"], None)[None, :] * np.ones_like(n)
+        V = J * n * D
+    else:
+        V = _axis(sweep_cfg.get("V"), oc["V"])[None, :] * np.ones_like(n)
+        J = V / (n * D)
+
+    rpm = rpm_axis[:, None] * np.ones_like(V)
+    return rpm, V, J
+
+
+def _init_worker(cfg):
+    global _solver
+    # Off-design points are never cached, so the worker needs no cache
+    _solver = make_solver(cfg, use_cache=False)
+
+
+def _sweep_line(chords, betas_le, rpm, V):
+    """
+    Solve one design along one grid row (fixed rpm, increasing V).
+
+    Every point after the first starts from the converged solution of its
+    neighbor; a warm solve that fails is retried from a cold start.
+    Returns an (n_col x len(SWEEP_KEYS)) array, NaN where the solver failed.
+    """
+    out = np.full((len(V), len(SWEEP_KEYS)), np.nan)
+    warm = False
+    with _solver.quiet():
+        for j, (rpm_j, V_j) in enumerate(zip(rpm, V)):
+            perf = _solver.evaluate(chords, betas_le, V=V_j, rpm=rpm_j, warm=warm)
+            if warm and perf == PENALTY_RESULT:
+                perf = _solver.evaluate(chords, betas_le, V=V_j, rpm=rpm_j, warm=False)
+
+            warm = perf != PENALTY_RESULT
+            if warm:
+                out[j] = [perf[key] for key in SWEEP_KEYS]
+    return out
+
+
+def _sweep_batch(chords, betas_le, rpm, V):
+    """
+    Vectorized backend: solve all designs at once for every grid point.
+    Returns an (N x n_rpm x n_col x len(SWEEP_KEYS)) array.
+    """
+    out = np.full(chords.shape[:1] + rpm.shape + (len(SWEEP_KEYS),), np.nan)
+    for i, j in np.ndindex(rpm.shape):
+        perf = _solver.evaluate_batch(chords, betas_le, V=V[i, j], rpm=rpm[i, j])
+        failed = perf["P"] == PENALTY_RESULT["P"]
+        for k, key in enumerate(SWEEP_KEYS):
+            out[:, i, j, k] = np.where(failed, np.nan, perf[key])
+    return out
+
+
+def run_sweep(cfg, chords, betas_le, n_workers=1):
+    """
+    Performance maps of one or more designs over the operating grid of cfg["sweep"].
+
+    chords, betas_le : (N x Ns) decoded geometry
+    Returns a dict with the grid (rpm, V, J: n_rpm x n_col) and one
+    (N x n_rpm x n_col) array per quantity in SWEEP_KEYS (NaN where the
+    solver failed).
+
+    Each (design, rpm) row is one task: its points are solved in order of
+    increasing V, warm-started from the previous point. Rows are spread
+    over n_workers processes. The vectorized BEMT backend instead solves
+    all designs per grid point in one call.
+    """
+    chords = np.atleast_2d(chords)
+    betas_le = np.atleast_2d(betas_le)
+    rpm, V, J = sweep_grid(cfg)
+    n_designs, n_rpm = len(chords), rpm.shape[0]
+
+    # Solve each row in order of increasing airspeed
+    order = np.argsort(V, axis=1, kind="stable")
+    V_sorted = np.take_along_axis(V, order, axis=1)
+    rpm_sorted = np.take_along_axis(rpm, order, axis=1)
+
+    _init_worker(cfg)
+    if hasattr(_solver, "evaluate_batch"):
+        # Vectorized backend: all designs at once per grid point
+        sorted_maps = _sweep_batch(chords, betas_le, rpm_sorted, V_sorted)
+    elif n_workers <= 1:
+        sorted_maps = np.stack([
+            np.stack([_sweep_line(chords[d], betas_le[d], rpm_sorted[i], V_sorted[i]) for i in range(n_rpm)])
+            for d in range(n_designs)
+        ])
+    else:
+        tasks = [(d, i) for d in range(n_designs) for i in range(n_rpm)]
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(cfg,)) as executor:
+            lines = executor.map(
+                _sweep_line,
+                [chords[d] for d, _ in tasks],
+                [betas_le[d] for d, _ in tasks],
+                [rpm_sorted[i] for _, i in tasks],
+                [V_sorted[i] for _, i in tasks],
+                chunksize=max(1, len(tasks) // (4 * n_workers)),
+            )
+            sorted_maps = np.stack(list(lines)).reshape(n_designs, n_rpm, -1, len(SWEEP_KEYS))
+
+    # Back to the grid's own column order
+    maps = np.empty_like(sorted_maps)
+    np.put_along_axis(maps, order[None, :, :, None], sorted_maps, axis=2)
+
+    result = {"rpm": rpm, "V": V, "J": J, "chords": chords, "betas_le": betas_le}
+    for k, key in enumerate(SWEEP_KEYS):
+        result[key] = maps[..., k]
+    return result
+
+
+def load_designs(path, cfg):
+    """
+    Decoded (chords, betas_le) of the designs to sweep, read from:
+    - a .npy file of design vectors, one row per design, or
+    - a best_chord_pitch.csv or text file of design vectors, in any of the
+      forms accepted by `main.py evaluate` (see parse_designs).
+    Raises ValueError, naming the file, when it does not hold such designs.
+    """
+    if path.endswith(".npy"):
+        X = np.atleast_2d(np.load(path))
+        if X.ndim != 2 or X.shape[1] != 2 * N_CONTROL_POINTS:
+            raise ValueError(
+                f"{path}: expected an array of designs x {2 * N_CONTROL_POINTS} control-point values, "
+                f"got shape {X.shape}"
+            )
+        chords, betas_le = decode_population(X, cfg["geometryBounds"], cfg["geometryGlobal"])
+    else:
+        with open(path) as f:
+            try:
+                chords, betas_le = parse_designs(f.readlines(), cfg)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+
+    if len(chords) == 0:
+        raise ValueError(f"{path}: no designs found")
+    return chords, betas_le
+
+
+def save_sweep(result, path):
+    """Write a run_sweep() result as a compressed .npz file."""
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname)
+    np.savez_compressed(path, **result)
@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+from pymoo.core.termination import Termination
+
+
+class ConvergenceTermination(Termination):
+    """
+    Stop a run on the first of:
+    - n_gen           : generation budget
+    - max_evals       : evaluation budget
+    - max_time        : wall-clock budget in seconds
+    - stall           : best objective and constraint violation improved by
+                        less than f_tol / cv_tol over the last stall_window generations
+    - diversity       : mean per-variable std of the population (in the
+                        normalized [0,1] design space) fell below x_tol
+
+    The criterion that fired is kept in `reason`.
+    """
+
+    def __init__(self, n_gen, max_evals=None, max_time=None,
+                 stall_window=None, f_tol=1e-4, cv_tol=1e-8, x_tol=None):
+        super().__init__()
+        self.n_gen = n_gen
+        self.max_evals = max_evals
+        self.max_time = max_time
+        self.stall_window = stall_window
+        self.f_tol = f_tol
+        self.cv_tol = cv_tol
+        self.x_tol = x_tol
+
+        self.reason = None
+        # (best cv, best f) per generation, for the stall check
+        self.history = []
+
+    @classmethod
+    def from_config(cls, cfg, n_gen):
+        term_cfg = cfg.get("optimization", {}).get("termination", {})
+        return cls(
+            n_gen,
+            max_evals=term_cfg.get("max_evals"),
+            max_time=term_cfg.get("max_time"),
+            stall_window=term_cfg.get("stall_window"),
+            f_tol=term_cfg.get("f_tol", 1e-4),
+            cv_tol=term_cfg.get("cv_tol", 1e-8),
+            x_tol=term_cfg.get("x_tol"),
+        )
+
+    def _update(self, algorithm):
+        opt = algorithm.opt[0]
+        self.history.append((float(opt.CV[0]), float(opt.F[0])))
+
+        progress = {"n_gen": algorithm.n_gen / self.n_gen}
+        if self.max_evals:
+            progress["max_evals"] = algorithm.evaluator.n_eval / self.max_evals
+        if self.max_time:
+            progress["max_time"] = (time.time() - algorithm.start_time) / self.max_time
+        if self.stall_window and self._stalled():
+            progress["stall"] = 1.0
+        if self.x_tol is not None and self._diversity(algorithm) < self.x_tol:
+            progress["diversity"] = 1.0
+
+        reason = max(progress, key=progress.get)
+        if progress[reason] >= 1.0:
+            self.reason = reason
+
+        return min(progress[reason], 1.0)
+
+    def _stalled(self):
+        if len(self.history) <= self.stall_window:
+            return False
+
+        cv_old, f_old = self.history[-1 - self.stall_window]
+        cv_new, f_new = self.history[-1]
+
+        cv_gain = cv_old - cv_new
+        f_gain = f_old - f_new
+        return cv_gain <= self.cv_tol and f_gain <= self.f_tol * max(1.0, abs(f_old))
+
+    @staticmethod
+    def _diversity(algorithm):
+        X = algorithm.pop.get("X")
+        return float(np.mean(np.std(X, axis=0)))
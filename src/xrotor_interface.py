@@ -1,10 +1,52 @@
+import copy
+import os
+import sys
+import time
+from contextlib import contextmanager
+
 import numpy as np
-from xrotor import XRotor
-from xrotor.model import Case
+
+try:
+    from xrotor import XRotor
+    from xrotor.model import Case
+except ImportError:
+    # XROTOR is optional when the BEMT backend is selected
+    XRotor = None
+    Case = None
+
+from .eval_cache import EvaluationCache
+from .polars import PolarDatabase, clark_y_polar
+from .profiling import Profiler
+
+
+# Result returned when XROTOR fails to produce a usable solution
+PENALTY_RESULT = {
+    "T": 0.0,
+    "P": 1e9,
+    "Q": 0.0,
+    "RPM": 0.0,
+    "eta": 0.0,
+    "J": 0.0
+}
+
+
+# stdout/stderr redirection of quiet(). The file descriptors belong to the
+# process, so the nesting depth is shared by every solver instance in it.
+_quiet_depth = 0
+_saved_fds = None
+
+
+class NumericalExplosion(ValueError):
+    """XROTOR converged to thrust/power values outside any physical range."""
 
 
 class XRotorWrapper:
-    def __init__(self, cfg):
+    def __init__(self, cfg, use_cache=True):
+        if XRotor is None:
+            raise ImportError(
+                "The xrotor package is not installed. "
+                "Install it, or select the 'bemt' solver backend in the config."
+            )
         self.cfg = cfg
         self.geom = cfg["geometryGlobal"]
         self.oc = cfg["operatingConditions"]
@@ -25,75 +67,38 @@ class XRotorWrapper:
         self.mu = 1.789e-5
         self.alt = 0.0
 
+        # Optional memoization of solver results
+        self.cache = EvaluationCache.from_config(cfg) if use_cache else None
+
+        # Optional stage timers and failure counters
+        self.profiler = Profiler.from_config(cfg)
+
+        # Optional Re/Mach-dependent polars, set per station for each design
+        self.polar_db = PolarDatabase.from_config(cfg)
+
+        # Persistent solver session, built on first use:
+        # polar data once per config, XRotor instance and base Case once per wrapper
+        self.polars = self._make_polars()
+        self._xr = None
+        self._case = None
 
     def _make_polars(self):
         """
         Return user-provided Clark Y polar data (Re ~ 500k, Mach ~ 0.35).
         Columns: Alpha(deg), CL, CD, Cm
         """
-        data = np.array([
-            [-10.0, -0.3448, 0.10501, -0.0385],
-            [-9.5, -0.3361, 0.09944, -0.0397],
-            [-9.0, -0.3247, 0.08659, -0.0508],
-            [-8.5, -0.3143, 0.07447, -0.0628],
-            [-8.0, -0.3190, 0.05814, -0.0826],
-            [-7.5, -0.3695, 0.02932, -0.1075],
-            [-7.0, -0.3436, 0.02184, -0.1071],
-            [-6.5, -0.2838, 0.01800, -0.1079],
-            [-6.0, -0.2385, 0.01526, -0.1052],
-            [-5.5, -0.1727, 0.01395, -0.1054],
-            [-5.0, -0.1242, 0.01240, -0.1024],
-            [-4.5, -0.0653, 0.01184, -0.1012],
-            [-4.0, -0.0089, 0.01091, -0.0997],
-            [-3.5, 0.0431, 0.01026, -0.0973],
-            [-3.0, 0.0999, 0.00995, -0.0959],
-            [-2.5, 0.1545, 0.00948, -0.0941],
-            [-2.0, 0.2072, 0.00901, -0.0920],
-            [-1.5, 0.2587, 0.00856, -0.0899],
-            [-0.5, 0.3550, 0.00754, -0.0845],
-            [0.0, 0.4047, 0.00676, -0.0814],
-            [0.5, 0.5314, 0.00709, -0.0948],
-            [1.0, 0.6309, 0.00750, -0.1025],
-            [1.5, 0.7175, 0.00771, -0.1081],
-            [2.0, 0.7579, 0.00793, -0.1038],
-            [2.5, 0.7981, 0.00821, -0.0995],
-            [3.0, 0.8358, 0.00861, -0.0946],
-            [3.5, 0.8735, 0.00907, -0.0897],
-            [4.0, 0.9102, 0.00960, -0.0846],
-            [4.5, 0.9452, 0.01021, -0.0792],
-            [5.0, 0.9817, 0.01080, -0.0741],
-            [5.5, 1.0202, 0.01135, -0.0694],
-            [6.0, 1.0550, 0.01188, -0.0639],
-            [6.5, 1.0897, 0.01246, -0.0584],
-            [7.0, 1.1243, 0.01315, -0.0531],
-            [7.5, 1.1629, 0.01379, -0.0486],
-            [8.0, 1.1957, 0.01472, -0.0435],
-            [8.5, 1.2170, 0.01630, -0.0371],
-            [9.0, 1.2275, 0.01869, -0.0301],
-            [9.5, 1.2439, 0.02102, -0.0244],
-            [10.0, 1.2688, 0.02306, -0.0201],
-            [10.5, 1.2824, 0.02600, -0.0154],
-            [11.0, 1.2922, 0.02948, -0.0112],
-            [11.5, 1.3109, 0.03261, -0.0082],
-            [12.0, 1.3231, 0.03646, -0.0055],
-            [12.5, 1.3200, 0.04191, -0.0032],
-            [13.0, 1.3237, 0.04707, -0.0016],
-            [13.5, 1.3324, 0.05221, -0.0010],
-            [14.0, 1.3333, 0.05846, -0.0011],
-            [14.5, 1.3133, 0.06695, -0.0018],
-            [15.0, 1.3119, 0.07404, -0.0029],
-            [15.5, 1.3048, 0.08208, -0.0049],
-            [16.0, 1.2916, 0.09107, -0.0077],
-            [16.5, 1.2671, 0.10158, -0.0112],
-            [17.0, 1.2522, 0.11127, -0.0147],
-            [17.5, 1.2331, 0.12165, -0.0190],
-            [18.0, 1.2133, 0.13257, -0.0241],
-            [18.5, 1.1914, 0.14417, -0.0300],
-            [19.0, 1.1614, 0.15750, -0.0373],
-            [19.5, 1.1295, 0.17217, -0.0459],
-            [20.0, 1.0784, 0.19284, -0.0585]
-        ])
-        return data
+        return clark_y_polar()
+
+    def _station_polars(self, chords, V, rpm):
+        """
+        {r/R: polar} for each station, from the polar database at the
+        station's local Reynolds and Mach numbers (geometric relative speed).
+        """
+        r = self.rStations * self.R
+        W = np.sqrt(V**2 + (2.0 * np.pi * rpm / 60.0 * r)**2)
+        Re = self.rho * W * np.asarray(chords) / self.mu
+        polars = self.polar_db.station_polars(Re, W / self.vso)
+        return {float(rr): polar for rr, polar in zip(self.rStations, polars)}
 
 
     def _build_case_dict(self, chords, betas_le):
@@ -117,11 +122,7 @@ class XRotorWrapper:
         r_tip_dim = float(self.R)
 
         # Advance ratio
-        omega = 2.0 * np.pi * self.rpm / 60.0
-        adv = self.V / (omega * self.R) if omega * self.R > 0 else 0.0
-
-        # Synthetic polar data
-        polars = self._make_polars()
+        adv = self._advance_ratio(self.V, self.rpm)
 
         case = {
             "conditions": {
@@ -158,43 +159,138 @@ class XRotorWrapper:
         return case
 
 
-    def evaluate(self, chords, betas_le):
-        xr = XRotor()
-        
-        # 1. Create Case object from dict (without polars)
-        case_obj = Case.from_dict(self._build_case_dict(chords, betas_le))
-
-        # 2. Manually inject polars to avoid TypeError in from_dict
-        # and ValueError in xr.case setter
-        polars = self._make_polars()
-        if hasattr(case_obj, 'disk') and hasattr(case_obj.disk, 'blade'):
-             # Assign as a dictionary {radial_pos: polar_array}
-             # Using 0.0 implies it applies to the whole blade (or root)
-             case_obj.disk.blade.polars = {0.0: polars}
-
-        xr.case = case_obj
-
-        # Suppress XROTOR output
-        import os
-        STDOUT_FD = 1
-        STDERR_FD = 2
-        saved_stdout = os.dup(STDOUT_FD)
-        saved_stderr = os.dup(STDERR_FD)
+    def _advance_ratio(self, V, rpm):
+        """XROTOR advance ratio V / (omega R)."""
+        omega = 2.0 * np.pi * rpm / 60.0
+        return V / (omega * self.R) if omega * self.R > 0 else 0.0
 
-        try:
+    def lookup(self, chords, betas_le):
+        """
+        Return the cached result for this geometry, or None if not cached.
+        """
+        if self.cache is None:
+            return None
+        perf = self.cache.get(chords, betas_le)
+        self.profiler.count("cache_hits" if perf is not None else "cache_misses")
+        return perf
+
+    def remember(self, chords, betas_le, perf):
+        """
+        Store a solver result in the cache. Penalty results are not cached.
+        """
+        if self.cache is not None and perf is not None and perf != PENALTY_RESULT:
+            self.cache.put(chords, betas_le, perf)
+
+    @contextmanager
+    def quiet(self):
+        """
+        Redirect stdout/stderr to /dev/null while XROTOR runs.
+        Nested uses are free, also across solver instances (e.g. one per
+        operating point), so a whole batch can share one redirection.
+        """
+        global _quiet_depth, _saved_fds
+        t0 = time.perf_counter()
+        if _quiet_depth == 0:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            STDOUT_FD = 1
+            STDERR_FD = 2
+            saved_stdout = os.dup(STDOUT_FD)
+            saved_stderr = os.dup(STDERR_FD)
             devnull = os.open(os.devnull, os.O_WRONLY)
             os.dup2(devnull, STDOUT_FD)
             os.dup2(devnull, STDERR_FD)
-            
-            try:
-                xr.operate(rpm=self.rpm)
-            finally:
-                os.dup2(saved_stdout, STDOUT_FD)
-                os.dup2(saved_stderr, STDERR_FD)
+            _saved_fds = (saved_stdout, saved_stderr, devnull)
+            self.profiler.add("redirect", time.perf_counter() - t0)
+
+        _quiet_depth += 1
+        try:
+            yield
+        finally:
+            _quiet_depth -= 1
+            if _quiet_depth == 0:
+                t0 = time.perf_counter()
+                saved_stdout, saved_stderr, devnull = _saved_fds
+                os.dup2(saved_stdout, 1)
+                os.dup2(saved_stderr, 2)
                 os.close(saved_stdout)
                 os.close(saved_stderr)
                 os.close(devnull)
-            
+                _saved_fds = None
+                self.profiler.add("redirect", time.perf_counter() - t0, calls=0)
+
+    def _session(self, chords, betas_le):
+        """
+        Return the persistent (XRotor, Case) pair, creating it on first use.
+        """
+        if self._xr is None:
+            t0 = time.perf_counter()
+
+            # 1. Create Case object from dict (without polars).
+            # Case() shares its default sub-objects between instances,
+            # so take a private copy before keeping it for the session.
+            case_obj = copy.deepcopy(Case.from_dict(self._build_case_dict(chords, betas_le)))
+
+            # 2. Manually inject polars to avoid TypeError in from_dict
+            # and ValueError in xr.case setter
+            if hasattr(case_obj, 'disk') and hasattr(case_obj.disk, 'blade'):
+                 # Assign as a dictionary {radial_pos: polar_array}
+                 # Using 0.0 implies it applies to the whole blade (or root)
+                 case_obj.disk.blade.polars = {0.0: self.polars}
+
+            self._xr = XRotor()
+            self._case = case_obj
+            self.profiler.add("session_setup", time.perf_counter() - t0)
+
+        return self._xr, self._case
+
+    def evaluate(self, chords, betas_le, V=None, rpm=None, warm=False):
+        """
+        Performance of one design at the configured operating point, or at
+        V / rpm when given (off-design points are not cached).
+        With warm=True, XROTOR starts from the previous converged solution.
+        """
+        if V is not None or rpm is not None:
+            return self._solve(chords, betas_le, warm=warm, V=V, rpm=rpm)
+
+        perf = self.lookup(chords, betas_le)
+        if perf is not None:
+            return perf
+
+        perf = self._solve(chords, betas_le, warm=warm)
+        self.remember(chords, betas_le, perf)
+        return perf
+
+    def _solve(self, chords, betas_le, warm=False, V=None, rpm=None):
+        xr, case_obj = self._session(chords, betas_le)
+        prof = self.profiler
+        V = self.V if V is None else V
+        rpm = self.rpm if rpm is None else rpm
+
+        with prof.stage("set_case"):
+            # Only the blade shape changes between solves
+            geometry = case_obj.disk.blade.geometry
+            geometry.chord = np.asarray(chords) / self.R     # c/R
+            geometry.twist = np.asarray(betas_le)             # deg
+
+            # Operating point (differs from the config only in sweeps)
+            case_obj.conditions.vel = V
+            case_obj.conditions.adv = self._advance_ratio(V, rpm)
+
+            if self.polar_db is not None:
+                case_obj.disk.blade.polars = self._station_polars(chords, V, rpm)
+
+            if not warm:
+                # Reset the Fortran state so each design is solved from a cold
+                # start, exactly as with a fresh XRotor() instance
+                xr._lib.init()
+
+            xr.case = case_obj
+
+        try:
+            with self.quiet(), prof.stage("operate"):
+                xr.operate(rpm=rpm)
+
             perf = xr.performance
             
             # Sign flip
@@ -208,31 +304,29 @@ class XRotorWrapper:
             # Sanity Check
             # 0.1m prop -> T ~ 1-10 N. P ~ 10-100 W.
             if abs(T_val) > 2000.0 or abs(P_val) > 100000.0:
-                raise ValueError(f"Numerical Explosion: T={T_val}, P={P_val}")
+                raise NumericalExplosion(f"Numerical Explosion: T={T_val}, P={P_val}")
 
             # Calculate Torque
-            omega = 2.0 * np.pi * self.rpm / 60.0
+            omega = 2.0 * np.pi * rpm / 60.0
             Q_val = P_val / omega if omega > 0 else 0.0
 
-            n = self.rpm / 60.0
-            J = self.V / (n * self.D) if (n * self.D) > 0 else 0.0
+            n = rpm / 60.0
+            J = V / (n * self.D) if (n * self.D) > 0 else 0.0
 
             return {
                 "T": T_val,
                 "P": P_val,
                 "Q": Q_val,
-                "RPM": self.rpm,
+                "RPM": rpm,
                 "eta": float(perf.efficiency),
                 "J": J
             }
 
-        except Exception as e:
-            # print("\n XROTOR ERROR — Using penalty:", e)
-            return {
-                "T": 0.0,
-                "P": 1e9,
-                "Q": 0.0,
-                "RPM": 0.0,
-                "eta": 0.0,
-                "J": 0.0
-            }
+        except NumericalExplosion:
+            prof.count("explosions")
+            return dict(PENALTY_RESULT)
+
+        except Exception:
+            # XROTOR failed to converge or raised inside the Fortran layer
+            prof.count("solver_errors")
+            return dict(PENALTY_RESULT)
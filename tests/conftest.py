@@ -0,0 +1,49 @@
+"""
+The tests run on the deterministic stand-in for the xrotor package in
+benchmarks/stub, so they need neither XROTOR nor its Fortran build.
+"""
+import copy
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUB_DIR = os.path.join(ROOT, "benchmarks", "stub")
+
+sys.path.insert(0, STUB_DIR)
+sys.path.insert(0, ROOT)
+# Worker processes import the stand-in too
+os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [STUB_DIR, ROOT, os.environ.get("PYTHONPATH")]))
+
+with open(os.path.join(ROOT, "processing", "inputs", "thrust-cruise.json")) as f:
+    BASE_CFG = json.load(f)
+
+
+@pytest.fixture
+def cfg():
+    """The example config, with a thrust requirement so constraints are active."""
+    cfg = copy.deepcopy(BASE_CFG)
+    cfg["operatingConditions"]["requiredThrust"] = 12.0
+    return cfg
+
+
+@pytest.fixture
+def designs():
+    """A fixed population of 24 normalized design vectors."""
+    return np.random.default_rng(0).random((24, 10))
+
+
+def evaluate_population(cfg, X):
+    """F and G of ThrustCruiseProblem for the population X."""
+    from src.optimizer import ThrustCruiseProblem
+
+    problem = ThrustCruiseProblem(cfg)
+    out = {}
+    try:
+        problem._evaluate(X, out)
+    finally:
+        problem.close()
+    return out["F"], out["G"]
@@ -0,0 +1,72 @@
+import numpy as np
+
+from src.archive import EliteArchive, config_signature, initial_population
+from src.optimizer import run_optimization
+
+
+def test_signature_ignores_spelling_and_non_problem_settings(cfg):
+    key, structure, _ = config_signature(cfg)
+
+    other = {name: cfg[name] for name in reversed(list(cfg))}
+    other["optimization"] = dict(cfg["optimization"], n_workers=8)
+    other["operatingConditions"] = dict(cfg["operatingConditions"], rpm=float(cfg["operatingConditions"]["rpm"]))
+    assert config_signature(other)[:2] == (key, structure)
+
+    other["operatingConditions"]["rpm"] += 500
+    assert config_signature(other)[:2] != (key, structure)
+    assert config_signature(other)[1] == structure
+
+    other["solver"] = {"backend": "bemt"}
+    assert config_signature(other)[1] != structure
+
+
+def test_add_keeps_best_distinct_elites(cfg, tmp_path):
+    archive = EliteArchive(str(tmp_path / "elites.json"), max_elites=3)
+    X = np.eye(4)
+    archive.add(cfg, X, [-1.0, -4.0, -2.0, -3.0])
+    archive.add(cfg, X[1:2], [-4.0])
+
+    assert np.array_equal(archive.lookup(cfg, 10), X[[1, 3, 2]])
+    assert np.array_equal(archive.lookup(cfg, 2), X[[1, 3]])
+
+
+def test_lookup_falls_back_to_nearby_configs(cfg, tmp_path):
+    archive = EliteArchive(str(tmp_path / "elites.json"), max_distance=0.01)
+    near, far = [dict(cfg, geometryGlobal=dict(cfg["geometryGlobal"])) for _ in range(2)]
+    near["geometryGlobal"]["diameter"] *= 1.05
+    far["geometryGlobal"]["diameter"] *= 100.0
+    for i, c in enumerate((cfg, near, far)):
+        archive.add(c, np.full((1, 4), float(i)), [-1.0])
+
+    assert np.array_equal(archive.lookup(cfg, 5), [[0.0] * 4, [1.0] * 4])
+    assert np.array_equal(archive.lookup(near, 1), [[1.0] * 4])
+    assert archive.lookup(dict(cfg, solver={"backend": "bemt"}), 5).shape == (0, 0)
+
+
+def test_saves_of_two_runs_are_merged(cfg, tmp_path):
+    path = str(tmp_path / "archive" / "elites.json")
+    first, second = EliteArchive(path), EliteArchive(path)
+    first.add(cfg, np.zeros((1, 4)), [-1.0])
+    second.add(cfg, np.ones((1, 4)), [-2.0])
+    first.save()
+    second.save()
+
+    assert np.array_equal(EliteArchive(path).lookup(cfg, 5), [[1.0] * 4, [0.0] * 4])
+
+
+def test_initial_population_starts_with_the_elites():
+    elites = np.full((2, 3), 0.5)
+    pop = initial_population(elites, 6, 3, seed=9)
+
+    assert pop.shape == (6, 3)
+    assert np.array_equal(pop[:2], elites)
+    assert np.array_equal(pop, initial_population(elites, 6, 3, seed=9))
+    assert np.array_equal(initial_population(np.empty((0, 0)), 4, 3, seed=9), np.random.default_rng(9).random((4, 3)))
+
+
+def test_seeded_run_is_at_least_as_good_as_its_elite(cfg):
+    best = run_optimization(cfg, n_gen=8, pop_size=10, seed=1, verbose=False)
+    assert best.X is not None
+
+    seeded = run_optimization(cfg, n_gen=1, pop_size=10, seed=2, verbose=False, elites=best.X[None, :])
+    assert seeded.F[0] <= best.F[0]
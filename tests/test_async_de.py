@@ -0,0 +1,50 @@
+import copy
+
+import numpy as np
+
+from src.async_de import is_better
+from src.optimizer import run_optimization
+
+
+def _run(cfg, seed, n_gen=5, pop_size=10):
+    cfg = copy.deepcopy(cfg)
+    cfg["optimization"]["algorithm"] = "async_de"
+    return run_optimization(cfg, n_gen=n_gen, pop_size=pop_size, seed=seed, verbose=False)
+
+
+def test_serial_run_is_reproducible_from_seed(cfg):
+    first = _run(cfg, seed=5)
+    second = _run(cfg, seed=5)
+
+    assert np.array_equal(first.X, second.X)
+    assert np.array_equal(first.F, second.F)
+    assert np.array_equal(first.pop.get("X"), second.pop.get("X"))
+    assert np.array_equal(first.pop.get("F"), second.pop.get("F"))
+
+    other = _run(cfg, seed=6)
+    assert not np.array_equal(first.pop.get("X"), other.pop.get("X"))
+
+
+def test_budget_counts_generations_of_pop_size(cfg):
+    res = _run(cfg, seed=5, n_gen=4, pop_size=10)
+
+    assert res.algorithm.evaluator.n_eval == 40
+    assert res.algorithm.n_gen == 4
+
+
+def test_pool_run_spends_the_same_budget(cfg):
+    cfg["optimization"]["n_workers"] = 3
+    res = _run(cfg, seed=5, n_gen=4, pop_size=10)
+
+    assert res.algorithm.evaluator.n_eval == 40
+    assert len(res.pop) == 10
+
+
+def test_replacement_rule():
+    # Infeasible target: lower violation wins
+    assert is_better(0.0, 0.5, -10.0, 1.0)
+    assert not is_better(-10.0, 1.5, 0.0, 1.0)
+    # Feasible target: only a feasible trial with lower F wins
+    assert is_better(-2.0, 0.0, -1.0, 0.0)
+    assert not is_better(-2.0, 0.1, -1.0, 0.0)
+    assert not is_better(-1.0, 0.0, -1.0, 0.0)
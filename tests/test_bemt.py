@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from conftest import evaluate_population
+from src.bemt import BEMTSolver
+from src.geometry_param import decode_population
+from src.xrotor_interface import PENALTY_RESULT
+
+
+@pytest.fixture
+def bemt_cfg(cfg):
+    cfg["solver"] = {"backend": "bemt"}
+    return cfg
+
+
+@pytest.fixture
+def geometry(bemt_cfg, designs):
+    return decode_population(designs, bemt_cfg["geometryBounds"], bemt_cfg["geometryGlobal"])
+
+
+def test_batch_matches_single_designs(bemt_cfg, geometry):
+    solver = BEMTSolver(bemt_cfg)
+    chords, betas = geometry
+    batch = solver.evaluate_batch(chords, betas)
+
+    for i in (0, 7, 23):
+        single = solver.evaluate(chords[i], betas[i])
+        assert single == {key: float(value[i]) for key, value in batch.items()}
+
+
+def test_loads_are_physical(bemt_cfg, geometry):
+    solver = BEMTSolver(bemt_cfg)
+    chords, betas = geometry
+    perf = solver.evaluate_batch(chords, betas)
+
+    assert (perf["T"] > 0.0).all() and (perf["P"] > 0.0).all()
+    assert ((perf["eta"] > 0.0) & (perf["eta"] < 1.0)).all()
+    assert np.allclose(perf["P"], perf["Q"] * 2.0 * np.pi * solver.rpm / 60.0)
+
+    # More pitch gives more thrust; flying faster gives less
+    assert (solver.evaluate_batch(chords, betas + 2.0)["T"] > perf["T"]).all()
+    assert (solver.evaluate_batch(chords, betas, V=2.0 * solver.V)["T"] < perf["T"]).all()
+
+
+def test_bisection_has_converged(bemt_cfg, geometry):
+    chords, betas = geometry
+    perf = BEMTSolver(bemt_cfg).evaluate_batch(chords, betas)
+
+    bemt_cfg["solver"]["bisectionSteps"] = 60
+    finer = BEMTSolver(bemt_cfg).evaluate_batch(chords, betas)
+    for key in ("T", "P", "eta"):
+        assert np.allclose(perf[key], finer[key], rtol=1e-9)
+
+
+def test_failed_designs_get_the_penalty(bemt_cfg, geometry):
+    bemt_cfg["profiling"] = {"enabled": True}
+    solver = BEMTSolver(bemt_cfg)
+    chords, betas = geometry
+    chords = chords[:3].copy()
+    chords[1, 2] = np.nan
+    perf = solver.evaluate_batch(chords, betas[:3])
+
+    for key, value in PENALTY_RESULT.items():
+        assert perf[key][1] == value
+    assert perf["T"][0] > 0.0 and perf["T"][2] > 0.0
+    assert solver.profiler.counters["nan_results"] == 1
+
+
+def test_problem_runs_on_bemt_backend(bemt_cfg, designs):
+    F, G = evaluate_population(bemt_cfg, designs)
+
+    assert F.shape == (len(designs),) and np.isfinite(F).all()
+    assert np.isfinite(G).all()
+
+
+def test_unknown_backend_is_rejected(cfg):
+    from src.solvers import make_solver
+
+    cfg["solver"] = {"backend": "vortex"}
+    with pytest.raises(ValueError, match="Unknown solver backend"):
+        make_solver(cfg)
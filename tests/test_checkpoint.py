@@ -0,0 +1,47 @@
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+
+from src.checkpoint import Checkpointer
+from src.optimizer import run_optimization
+
+N_GEN = 12
+POP_SIZE = 10
+SEED = 3
+
+
+def _run(cfg, path):
+    run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False,
+                     checkpoint=Checkpointer(path, every_gen=2))
+
+
+def test_resume_after_kill_matches_uninterrupted_run(cfg, tmp_path, monkeypatch):
+    path = str(tmp_path / "restart_001.npz")
+
+    # Slow the solves down so the run can be killed part-way through
+    monkeypatch.setenv("XROTOR_STUB_LATENCY", "0.01")
+    proc = mp.get_context("fork").Process(target=_run, args=(cfg, path))
+    proc.start()
+    deadline = time.monotonic() + 60.0
+    while not os.path.exists(path) and proc.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    proc.kill()
+    proc.join()
+    monkeypatch.delenv("XROTOR_STUB_LATENCY")
+
+    state = Checkpointer(path).load()
+    assert state is not None and not state["finished"]
+    assert 0 < state["n_gen"] < N_GEN
+
+    resumed = run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False,
+                               checkpoint=Checkpointer(path, every_gen=2), resume=True)
+    reference = run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False)
+
+    assert resumed.algorithm.n_gen == reference.algorithm.n_gen
+    assert resumed.algorithm.evaluator.n_eval == reference.algorithm.evaluator.n_eval
+    assert np.array_equal(resumed.X, reference.X)
+    assert np.array_equal(resumed.F, reference.F)
+    assert np.array_equal(resumed.pop.get("X"), reference.pop.get("X"))
+    assert Checkpointer(path).load()["finished"]
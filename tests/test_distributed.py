@@ -0,0 +1,130 @@
+import multiprocessing as mp
+import os
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from conftest import evaluate_population
+
+AUTHKEY = "test-key"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port, latency):
+    from src.distributed import serve
+
+    os.environ["XROTOR_STUB_LATENCY"] = str(latency)
+    serve("127.0.0.1", port, AUTHKEY, verbose=False)
+
+
+@pytest.fixture
+def daemons():
+    """Two worker daemons on this machine, the second one slower."""
+    ctx = mp.get_context("fork")
+    procs, addresses = [], []
+    for latency in (0.002, 0.008):
+        port = _free_port()
+        proc = ctx.Process(target=_serve, args=(port, latency))
+        proc.start()
+        procs.append(proc)
+        addresses.append(f"127.0.0.1:{port}")
+
+    for address in addresses:
+        deadline = time.monotonic() + 30.0
+        while True:
+            try:
+                socket.create_connection(address.split(":")).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    yield procs, addresses
+    for proc in procs:
+        proc.kill()
+        proc.join()
+
+
+def _distributed(cfg, addresses):
+    cfg["optimization"]["distributed"] = {
+        "workers": addresses, "authkey": AUTHKEY, "batch_size": 3, "batch_seconds": 0.05,
+    }
+    return cfg
+
+
+def test_distributed_matches_serial(cfg, designs, daemons):
+    _, addresses = daemons
+    F_serial, G_serial = evaluate_population(cfg, designs)
+    F_dist, G_dist = evaluate_population(_distributed(cfg, addresses), designs)
+
+    assert np.array_equal(F_serial, F_dist)
+    assert np.array_equal(G_serial, G_dist)
+
+
+def test_killed_worker_designs_are_reassigned(cfg, designs, daemons):
+    from src.optimizer import ThrustCruiseProblem
+
+    procs, addresses = daemons
+    F_serial, G_serial = evaluate_population(cfg, designs)
+
+    problem = ThrustCruiseProblem(_distributed(cfg, addresses))
+    try:
+        assert problem.pool.n_slots == 2
+        procs[1].kill()
+        procs[1].join()
+
+        out = {}
+        problem._evaluate(designs, out)
+        assert problem.pool.n_disconnects == 1
+        assert problem.pool.n_slots == 1
+    finally:
+        problem.close()
+
+    assert np.array_equal(F_serial, out["F"])
+    assert np.array_equal(G_serial, out["G"])
+
+
+def test_refuses_to_start_without_key(cfg, monkeypatch):
+    from src.distributed import AUTHKEY_ENV, DistributedPool
+
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    cfg["optimization"]["distributed"] = {"workers": ["127.0.0.1:1"]}
+    with pytest.raises(ValueError, match="shared key"):
+        DistributedPool.from_config(cfg)
+
+
+def test_hello_does_not_send_the_authkey(cfg, monkeypatch):
+    import pickle
+
+    import src.distributed as distributed
+
+    sent = []
+
+    class FakeConnection:
+        def send(self, message):
+            sent.append(pickle.dumps(message))
+            if message is not None and message[0] == "hello":
+                self.fingerprint = message[2]
+
+        def recv(self):
+            return ("ready", self.fingerprint, "fake")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(distributed, "Client", lambda address, authkey: FakeConnection())
+    _distributed(cfg, ["127.0.0.1:1"])
+    pool = distributed.DistributedPool.from_config(cfg)
+    pool.close()
+
+    assert sent and not any(AUTHKEY.encode() in message for message in sent)
+    assert "distributed" not in pool.cfg["optimization"]
+    assert cfg["optimization"]["distributed"]["authkey"] == AUTHKEY
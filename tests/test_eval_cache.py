@@ -0,0 +1,93 @@
+import re
+
+import numpy as np
+
+from conftest import evaluate_population
+from src.eval_cache import EvaluationCache, combined_stats, conditions_hash
+
+POINTS = [
+    {"name": "takeoff", "V": 2.0, "rpm": 11000, "requiredThrust": 40.0, "minEfficiency": 0.0},
+    {"name": "cruise", "V": 20.0},
+]
+
+
+def test_multi_point_run_reports_every_cache(cfg, tmp_path, capsys):
+    from src.optimizer import run_optimization
+
+    cfg["operatingPoints"] = POINTS
+    cfg["evaluationCache"] = {"path": str(tmp_path / "cache.sqlite")}
+    res = run_optimization(cfg, n_gen=3, pop_size=10, seed=1)
+
+    line = next(l for l in capsys.readouterr().out.splitlines() if l.startswith("Evaluation cache:"))
+    hits, misses = map(int, re.match(r"Evaluation cache: (\d+) hits .*?, (\d+) misses", line).groups())
+    assert hits + misses == len(POINTS) * res.algorithm.evaluator.n_eval
+
+
+def test_combined_stats_counts_shared_caches_once():
+    a = EvaluationCache("a")
+    b = EvaluationCache("b")
+    x = np.ones(3)
+    a.put(x, x, {"T": 1.0})
+    a.get(x, x)
+    b.get(x, x)
+
+    stats = combined_stats([a, b, a, None])
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert combined_stats([None]) is None
+
+
+def test_lru_evicts_least_recently_used():
+    cache = EvaluationCache("c", max_entries=2)
+    designs = [np.full(3, float(i)) for i in range(3)]
+    cache.put(designs[0], designs[0], {"T": 0.0})
+    cache.put(designs[1], designs[1], {"T": 1.0})
+    cache.get(designs[0], designs[0])
+    cache.put(designs[2], designs[2], {"T": 2.0})
+
+    assert cache.get(designs[1], designs[1]) is None
+    assert cache.get(designs[0], designs[0]) == {"T": 0.0}
+    assert cache.get(designs[2], designs[2]) == {"T": 2.0}
+    assert cache.stats()["entries"] == 2
+
+
+def test_key_quantization():
+    cache = EvaluationCache("c", decimals=6)
+    x = np.array([0.1, 0.0, 0.3])
+
+    assert cache.key(x, x) == cache.key(x + 1e-9, x)
+    assert cache.key(x, x) == cache.key(x, np.array([0.1, -0.0, 0.3]))
+    assert cache.key(x, x) != cache.key(x + 1e-5, x)
+    assert cache.key(x, x) != EvaluationCache("other", decimals=6).key(x, x)
+
+
+def test_sqlite_tier_persists_across_caches(tmp_path):
+    path = str(tmp_path / "sub" / "cache.sqlite")
+    x = np.linspace(0.0, 1.0, 4)
+    EvaluationCache("c", path=path).put(x, x, {"T": 1.5, "P": 20.0})
+
+    cache = EvaluationCache("c", path=path)
+    assert cache.get(x, x) == {"T": 1.5, "P": 20.0}
+    assert cache.get(x, x) == {"T": 1.5, "P": 20.0}
+    assert (cache.hits, cache.disk_hits, cache.misses) == (2, 1, 0)
+    assert EvaluationCache("other", path=path).get(x, x) is None
+
+
+def test_conditions_hash_tracks_operating_conditions(cfg):
+    before = conditions_hash(cfg)
+    cfg["optimization"]["n_workers"] = 4
+    assert conditions_hash(cfg) == before
+    cfg["operatingConditions"]["rpm"] += 100
+    assert conditions_hash(cfg) != before
+
+
+def test_cached_evaluation_matches_uncached(cfg, designs, tmp_path):
+    F_ref, G_ref = evaluate_population(cfg, designs)
+    cfg["evaluationCache"] = {"path": str(tmp_path / "cache.sqlite")}
+    for _ in range(2):
+        F, G = evaluate_population(cfg, designs)
+        assert np.array_equal(F, F_ref)
+        assert np.array_equal(G, G_ref)
+
+    cache = EvaluationCache.from_config(cfg)
+    assert cache.hits == len(designs) and cache.misses == len(designs)
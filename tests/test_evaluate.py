@@ -0,0 +1,46 @@
+import io
+
+import numpy as np
+
+from src.evaluate import DesignEvaluator, parse_designs, stream_designs
+from src.xrotor_interface import PENALTY_RESULT
+
+
+def test_failed_solves_give_nan(cfg, designs, monkeypatch):
+    from src.geometry_param import decode_population
+
+    chords, betas = decode_population(designs, cfg["geometryBounds"], cfg["geometryGlobal"])
+    reference = DesignEvaluator(cfg)
+    expected = [reference.evaluate(c, b)[0] for c, b in zip(chords, betas)]
+
+    monkeypatch.setenv("XROTOR_STUB_FAILURE_RATE", "0.5")
+    evaluator = DesignEvaluator(cfg)
+    failed = []
+    for c, b, exp in zip(chords, betas, expected):
+        with evaluator.solvers[0].quiet():
+            failed.append(evaluator.solvers[0].evaluate(c, b) == PENALTY_RESULT)
+        row = evaluator.evaluate(c, b)[0]
+        if failed[-1]:
+            assert np.isnan([row["T"], row["P"], row["eta"]]).all()
+        else:
+            assert row == exp
+
+    assert any(failed) and not all(failed)
+
+
+def test_parse_designs_accepts_commas_and_whitespace(cfg, designs):
+    comma = [",".join(map(str, x)) for x in designs[:3]]
+    space = [" ".join(map(str, x)) for x in designs[:3]]
+
+    for a, b in zip(parse_designs(comma, cfg), parse_designs(space, cfg)):
+        assert np.array_equal(a, b)
+
+
+def test_stream_reports_bad_lines_as_nan(cfg, designs):
+    lines = [" ".join(map(str, designs[0])) + "\n", "0.1 0.2\n"]
+    out = io.StringIO()
+    stream_designs(DesignEvaluator(cfg), lines, out)
+
+    first, second = out.getvalue().splitlines()
+    assert first.startswith("0,") and "nan" not in first
+    assert second.startswith("1,") and second.endswith("nan,nan,nan")
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from conftest import evaluate_population
+from src.fidelity import coarse_stations, fidelity_configs
+from src.optimizer import ThrustCruiseProblem, run_optimization
+
+
+def _multi_fidelity(cfg, **settings):
+    cfg["optimization"]["multi_fidelity"] = dict({"coarse_stations": 4}, **settings)
+    return cfg
+
+
+def test_coarse_grid_spans_the_fine_grid(cfg):
+    fine = cfg["geometryGlobal"]["rStations"]
+    _multi_fidelity(cfg)
+    assert np.allclose(coarse_stations(cfg), np.linspace(fine[0], fine[-1], 4))
+
+    cfg["optimization"]["multi_fidelity"]["coarse_stations"] = [fine[0], 0.5, fine[-1]]
+    assert [len(c["geometryGlobal"]["rStations"]) for c in fidelity_configs(cfg)] == [len(fine), 3]
+
+    cfg["optimization"]["multi_fidelity"]["coarse_stations"] = [fine[0], 0.5, 0.9 * fine[-1]]
+    with pytest.raises(ValueError, match="must start at"):
+        coarse_stations(cfg)
+    cfg["optimization"]["multi_fidelity"]["coarse_stations"] = 1
+    with pytest.raises(ValueError, match="at least 2"):
+        coarse_stations(cfg)
+
+
+def test_fine_fraction_one_matches_single_fidelity(cfg, designs):
+    F_ref, G_ref = evaluate_population(cfg, designs)
+    F, G = evaluate_population(_multi_fidelity(cfg, fine_fraction=1.0), designs)
+
+    assert np.array_equal(F, F_ref)
+    assert np.array_equal(G, G_ref)
+
+
+def test_best_design_carries_fine_values(cfg, designs):
+    F_ref, G_ref = evaluate_population(cfg, designs)
+
+    problem = ThrustCruiseProblem(_multi_fidelity(cfg, fine_fraction=0.25))
+    out = {}
+    try:
+        problem._evaluate(designs, out)
+    finally:
+        problem.close()
+    CV = np.maximum(out["G"], 0.0).sum(axis=1)
+    fine = (out["F"] == F_ref) & np.all(out["G"] == G_ref, axis=1)
+    assert problem.n_fine == fine.sum() and 6 <= fine.sum() < len(designs)
+
+    best = np.lexsort((out["F"], CV))[0]
+    assert out["F"][best] == F_ref[best]
+    assert np.array_equal(out["G"][best], G_ref[best])
+
+
+def test_run_reports_fine_grid_result(cfg):
+    res = run_optimization(_multi_fidelity(cfg), n_gen=4, pop_size=10, seed=2, verbose=False)
+    cfg["optimization"].pop("multi_fidelity")
+    F, G = evaluate_population(cfg, res.X[None, :])
+
+    assert F[0] == res.F[0]
+    assert np.array_equal(G[0], res.G)
@@ -0,0 +1,42 @@
+from math import comb
+
+import numpy as np
+
+from src.geometry_param import bezier_curve, decode_design, decode_population
+
+
+def _decode_reference(x, bounds, geom):
+    """Per-design decoding as originally written: Bernstein polynomials and np.dot."""
+    n_cp = len(x) // 2
+    r = np.array(geom["rStations"])
+    t = (r - r[0]) / (r[-1] - r[0])
+    basis = np.array([comb(n_cp - 1, i) * t**(n_cp - 1 - i) * (1 - t)**i for i in range(n_cp)])
+    D = geom["diameter"]
+    chords = bounds["chordMin"] * D + np.dot(x[:n_cp], basis) * (bounds["chordMax"] * D - bounds["chordMin"] * D)
+    betas = bounds["pitchDegMin"] + np.dot(x[n_cp:], basis) * (bounds["pitchDegMax"] - bounds["pitchDegMin"])
+    return chords, betas
+
+
+def test_population_decoding_matches_per_design(cfg):
+    bounds, geom = cfg["geometryBounds"], cfg["geometryGlobal"]
+    X = np.random.default_rng(2).random((64, 10))
+
+    chords, betas = decode_population(X, bounds, geom)
+    assert chords.shape == betas.shape == (64, len(geom["rStations"]))
+    for i, x in enumerate(X):
+        ref_chords, ref_betas = _decode_reference(x, bounds, geom)
+        assert np.allclose(chords[i], ref_chords, rtol=1e-12, atol=0.0)
+        assert np.allclose(betas[i], ref_betas, rtol=1e-12, atol=0.0)
+
+        single_chords, single_betas = decode_design(x, bounds, geom)
+        assert np.array_equal(single_chords, decode_population(x, bounds, geom)[0][0])
+        assert np.array_equal(single_betas, decode_population(x, bounds, geom)[1][0])
+
+
+def test_bezier_curve_interpolates_end_points():
+    points = [(0.0, 1.0), (0.3, 2.0), (0.7, -1.0), (1.0, 0.5)]
+    x, y = bezier_curve(points, nTimes=50)
+
+    assert x.shape == y.shape == (50,)
+    # The Bernstein basis used here runs from the last control point to the first
+    assert np.allclose((x[0], y[0]), points[-1]) and np.allclose((x[-1], y[-1]), points[0])
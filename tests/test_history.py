@@ -0,0 +1,73 @@
+import multiprocessing as mp
+import os
+import signal
+
+import numpy as np
+
+from src.checkpoint import Checkpointer
+from src.history import HistoryCallback, HistoryReader, HistoryWriter
+from src.optimizer import run_optimization
+
+N_GEN = 8
+POP_SIZE = 10
+SEED = 4
+
+
+def test_writer_appends_and_reader_maps(tmp_path):
+    path = str(tmp_path / "history")
+    writer = HistoryWriter(path, n_var=3, n_constr=2)
+    for gen in (1, 2):
+        X = np.full((4, 3), gen, dtype=float)
+        F = np.array([3.0, 1.0, 2.0, 0.0]) * gen
+        G = np.array([[0.0, -1.0], [0.0, 0.0], [-1.0, -1.0], [0.5, 0.0]])
+        writer.append(gen, 4 * gen, 0.1 * gen, X, F, G)
+
+    reader = HistoryReader(path)
+    gens = reader.generations()
+    assert list(gens["gen"]) == [1, 2]
+    assert list(gens["n_feasible"]) == [3, 3]
+    # Best feasible design, not the infeasible one with the lowest F
+    assert list(gens["best_f"]) == [1.0, 2.0]
+    assert list(reader.gen) == [1] * 4 + [2] * 4
+    assert reader.X.shape == (8, 3) and reader.G.shape == (8, 2)
+
+    # A new run in the same directory starts over
+    HistoryWriter(path, n_var=3, n_constr=2)
+    assert len(HistoryReader(path).generations()["gen"]) == 0
+
+
+def _run_and_die_after_gen(cfg, history, ckpt, last_gen):
+    import src.optimizer
+
+    class DyingCallback(HistoryCallback):
+        def notify(self, algorithm):
+            super().notify(algorithm)
+            if algorithm.n_gen == last_gen:
+                os.kill(os.getpid(), signal.SIGKILL)
+
+    src.optimizer.HistoryCallback = DyingCallback
+    run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False,
+                     checkpoint=Checkpointer(ckpt, every_gen=2), history=history)
+
+
+def test_resumed_history_has_every_generation_once(cfg, tmp_path):
+    history = str(tmp_path / "history")
+    ckpt = str(tmp_path / "restart_001.npz")
+
+    # Killed right after generation 4 was logged; the last checkpoint followed generation 3
+    proc = mp.get_context("fork").Process(target=_run_and_die_after_gen, args=(cfg, history, ckpt, 4))
+    proc.start()
+    proc.join()
+    assert proc.exitcode == -signal.SIGKILL
+    assert list(HistoryReader(history).generations()["gen"]) == [1, 2, 3, 4]
+
+    run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False,
+                     checkpoint=Checkpointer(ckpt, every_gen=2), resume=True, history=history)
+    reference = str(tmp_path / "reference")
+    run_optimization(cfg, n_gen=N_GEN, pop_size=POP_SIZE, seed=SEED, verbose=False, history=reference)
+
+    resumed, full = HistoryReader(history), HistoryReader(reference)
+    assert list(resumed.generations()["gen"]) == list(range(1, N_GEN + 1))
+    assert list(resumed.gen) == list(np.repeat(np.arange(1, N_GEN + 1), POP_SIZE))
+    assert np.array_equal(resumed.X, full.X)
+    assert np.array_equal(resumed.F, full.F)
@@ -0,0 +1,33 @@
+from src.archive import EliteArchive
+from src.multistart import restart_seeds, run_multistart
+
+
+class CountingArchive(EliteArchive):
+    """Archive that records how many waves looked it up."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.n_lookups = 0
+
+    def lookup(self, cfg, n):
+        self.n_lookups += 1
+        return super().lookup(cfg, n)
+
+
+def _restarts(cfg, archive, restart_workers):
+    seeds = restart_seeds(7, 4)
+    results = list(run_multistart(cfg, 2, 6, seeds, restart_workers, archive=archive))
+    return sorted(res.run_id for res in results)
+
+
+def test_archive_waves_default_to_restart_workers(cfg, tmp_path):
+    cfg["optimization"]["archive"] = {"path": str(tmp_path / "elites.json")}
+
+    archive = CountingArchive(cfg["optimization"]["archive"]["path"])
+    assert _restarts(cfg, archive, restart_workers=2) == [1, 2, 3, 4]
+    assert archive.n_lookups == 2
+
+    cfg["optimization"]["archive"]["wave_size"] = 1
+    archive = CountingArchive(cfg["optimization"]["archive"]["path"])
+    assert _restarts(cfg, archive, restart_workers=2) == [1, 2, 3, 4]
+    assert archive.n_lookups == 4
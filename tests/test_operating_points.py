@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+
+from conftest import evaluate_population
+
+POINTS = [
+    {"name": "takeoff", "V": 2.0, "rpm": 11000, "requiredThrust": 40.0, "minEfficiency": 0.0},
+    {"name": "climb", "V": 12.0, "weight": 1.0},
+    {"name": "cruise", "V": 20.0, "weight": 2.0, "maxPower": 20000.0},
+]
+
+
+def test_serial_batch_redirects_output_once(cfg, designs, monkeypatch):
+    cfg["operatingPoints"] = POINTS
+    calls = []
+    dup2 = os.dup2
+    monkeypatch.setattr(os, "dup2", lambda fd, fd2: calls.append(fd2) or dup2(fd, fd2))
+
+    evaluate_population(cfg, designs)
+
+    # stdout and stderr redirected once and restored once for all points
+    assert sorted(calls) == [1, 1, 2, 2]
+
+
+def test_points_are_aggregated(cfg, designs):
+    from src.geometry_param import decode_population
+    from src.optimizer import ThrustCruiseProblem
+
+    cfg["operatingPoints"] = POINTS
+    problem = ThrustCruiseProblem(cfg)
+    chords, betas = decode_population(designs, cfg["geometryBounds"], cfg["geometryGlobal"])
+    T, P = problem._solve(chords, betas)
+    assert T.shape == (len(designs), len(POINTS))
+
+    F, _ = evaluate_population(cfg, designs)
+    assert np.allclose(F, -T @ (np.array([1.0, 1.0, 2.0]) / 4.0))
+
+    cfg["optimization"]["aggregate"] = "min"
+    F_min, _ = evaluate_population(cfg, designs)
+    assert np.array_equal(F_min, -T.min(axis=1))
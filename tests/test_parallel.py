@@ -0,0 +1,57 @@
+import numpy as np
+
+from conftest import evaluate_population
+
+
+def test_pool_matches_serial(cfg, designs):
+    F_serial, G_serial = evaluate_population(cfg, designs)
+
+    cfg["optimization"]["n_workers"] = 3
+    F_pool, G_pool = evaluate_population(cfg, designs)
+
+    assert F_serial.shape == (len(designs),)
+    assert np.array_equal(F_serial, F_pool)
+    assert np.array_equal(G_serial, G_pool)
+
+
+def test_pool_submit_collect_matches_map(cfg, designs):
+    from src.geometry_param import decode_population
+    from src.parallel import EvaluationPool
+
+    chords, betas = decode_population(designs, cfg["geometryBounds"], cfg["geometryGlobal"])
+    with EvaluationPool(cfg, 3) as pool:
+        expected = pool.map(chords, betas)
+
+        for i in range(len(chords)):
+            pool.submit(("design", i), chords[i], betas[i])
+        results = {}
+        while True:
+            done = pool.collect()
+            if not done:
+                break
+            results.update(done)
+
+    assert [results[("design", i)] for i in range(len(chords))] == expected
+
+
+def test_watchdog_replaces_hung_worker(cfg, designs, monkeypatch):
+    from src.geometry_param import decode_population
+    from src.parallel import EvaluationPool
+    from src.xrotor_interface import PENALTY_RESULT
+
+    chords, betas = decode_population(designs[:2], cfg["geometryBounds"], cfg["geometryGlobal"])
+    with EvaluationPool(cfg, 1) as pool:
+        expected = pool.map(chords, betas)
+
+    # Every solve outlasts the timeout
+    monkeypatch.setenv("XROTOR_STUB_LATENCY", "0.5")
+    with EvaluationPool(cfg, 1, timeout=0.1) as pool:
+        pid = pool._procs[0].pid
+        assert pool.map(chords, betas) == [PENALTY_RESULT, PENALTY_RESULT]
+        assert pool.n_timeouts == 2
+        assert pool._procs[0].pid != pid
+
+        # The replacement worker solves normally once given enough time
+        pool.timeout = 10.0
+        assert pool.map(chords[:1], betas[:1]) == expected[:1]
+        assert pool.n_timeouts == 2
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.bemt import BEMTSolver
+from src.geometry_param import decode_population
+from src.polars import PolarDatabase, clark_y_polar, read_polar_file
+
+ALPHA = np.arange(-5.0, 10.01, 0.5)
+
+
+def _cl(alpha, re, mach):
+    return 0.1 * alpha + 0.2 * np.log10(re) + 0.5 * mach
+
+
+def _cd(alpha, re, mach):
+    return 0.02 + 0.001 * alpha - 0.002 * np.log10(re) + 0.01 * mach
+
+
+def _write_polar(path, re, mach):
+    with open(path, "w") as f:
+        f.write(f"# Synthetic\n# Re = {re}\n# Mach: {mach}\nAlpha,CL,CD\n")
+        for a in ALPHA[::-1]:
+            f.write(f"{a},{_cl(a, re, mach)},{_cd(a, re, mach)}\n")
+
+
+@pytest.fixture
+def polar_cfg(cfg, tmp_path):
+    src_dir = tmp_path / "polars" / "synthetic"
+    src_dir.mkdir(parents=True)
+    for re in (1e5, 1e6):
+        for mach in (0.1, 0.5):
+            _write_polar(src_dir / f"re{re:g}_m{mach}.csv", re, mach)
+    cfg["polarDatabase"] = {
+        "name": "synthetic", "dir": str(tmp_path / "polars"), "cacheDir": str(tmp_path / "cache"),
+        "reSteps": 5, "machSteps": 3,
+    }
+    return cfg
+
+
+def test_read_polar_file(polar_cfg, tmp_path):
+    re, mach, table = read_polar_file(str(tmp_path / "polars" / "synthetic" / "re1e+06_m0.5.csv"))
+
+    assert (re, mach) == (1e6, 0.5)
+    assert np.array_equal(table[:, 0], ALPHA)
+    assert np.allclose(table[:, 1], _cl(ALPHA, re, mach))
+    assert (table[:, 3] == 0.0).all()
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("# Re = 1e5\n0,0.1,0.01\n1,0.2,0.01\n")
+    with pytest.raises(ValueError, match="Mach"):
+        read_polar_file(str(bad))
+
+
+def test_coefficients_interpolate_between_polars(polar_cfg):
+    db = PolarDatabase.from_config(polar_cfg)
+    Re = np.array([[2e5, 7e5], [1e5, 3.3e5]])
+    M = np.array([[0.2, 0.45], [0.1, 0.3]])
+    alpha = np.array([[1.3, -2.1], [7.7, 0.0]])
+
+    cl, cd = db.coefficients(db.locate(Re, M), alpha)
+    assert np.allclose(cl, _cl(alpha, Re, M), atol=1e-5)
+    assert np.allclose(cd, _cd(alpha, Re, M), atol=1e-5)
+
+    polars = db.station_polars(Re, M)
+    assert polars.shape == (2, 2, len(db.alpha), 4)
+    assert np.allclose(polars[1, 0, :, 1], _cl(db.alpha, 1e5, 0.1), atol=1e-5)
+
+    # Outside the files' range Re and Mach are clamped
+    cl, _ = db.coefficients(db.locate(1e7, 0.9), 2.0)
+    assert np.isclose(cl, _cl(2.0, 1e6, 0.5), atol=1e-5)
+
+
+def test_compiled_table_is_reused_until_the_files_change(polar_cfg, tmp_path):
+    db = PolarDatabase.from_config(polar_cfg)
+    assert PolarDatabase.from_config(polar_cfg) is db
+    mtime = os.path.getmtime(db.path)
+
+    _write_polar(tmp_path / "polars" / "synthetic" / "re1e+05_m0.1.csv", 1e5, 0.2)
+    with pytest.raises(ValueError, match="missing"):
+        PolarDatabase.from_config(polar_cfg)
+
+    os.remove(tmp_path / "polars" / "synthetic" / "re1e+05_m0.1.csv")
+    _write_polar(tmp_path / "polars" / "synthetic" / "re1e+05_m0.1.csv", 1e5, 0.1)
+    os.utime(tmp_path / "polars" / "synthetic" / "re1e+05_m0.1.csv", (mtime + 10, mtime + 10))
+    rebuilt = PolarDatabase.from_config(polar_cfg)
+    assert rebuilt is not db and rebuilt.signature != db.signature
+
+
+def test_single_polar_database_matches_the_builtin_table(cfg, designs, tmp_path):
+    # The example database holds the built-in Clark Y table at one (Re, Mach)
+    cfg["solver"] = {"backend": "bemt"}
+    cfg["polarDatabase"] = {"name": "clark_y", "cacheDir": str(tmp_path / "cache")}
+    db = PolarDatabase.from_config(cfg)
+
+    table = clark_y_polar()
+    n = len(table)
+    cl, cd = db.coefficients(db.locate(np.full(n, 5e5), np.full(n, 0.35)), table[:, 0])
+    assert np.allclose(cl, table[:, 1], atol=1e-6)
+    assert np.allclose(cd, table[:, 2], atol=1e-6)
+
+    chords, betas = decode_population(designs, cfg["geometryBounds"], cfg["geometryGlobal"])
+    perf = BEMTSolver(cfg).evaluate_batch(chords, betas)
+    assert np.isfinite(perf["T"]).all() and (perf["T"] > 0.0).all()
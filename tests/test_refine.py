@@ -0,0 +1,55 @@
+import copy
+
+import numpy as np
+
+from src.optimizer import ThrustCruiseProblem, run_optimization
+from src.refine import _StencilEvaluator, refine
+
+
+def test_signed_margins_clip_to_pymoo_constraints(cfg, designs):
+    from src.geometry_param import decode_population
+
+    problem = ThrustCruiseProblem(cfg)
+    chords, betas = decode_population(designs, cfg["geometryBounds"], cfg["geometryGlobal"])
+    T, P = problem._solve(chords, betas)
+    F, G = problem.obj.evaluate_batch(T, P, chords, betas)
+    F_signed, G_signed = problem.obj.evaluate_batch(T, P, chords, betas, clip=False)
+
+    assert np.array_equal(F, F_signed)
+    assert np.array_equal(G, np.maximum(0.0, G_signed))
+    # Satisfied constraints keep their (negative) margin
+    assert (G_signed < 0.0).any()
+
+
+def test_stencil_is_solved_only_for_gradients(cfg, designs):
+    problem = ThrustCruiseProblem(cfg)
+    evaluator = _StencilEvaluator(problem, 1e-3)
+    x = designs[0]
+    n = len(x)
+
+    evaluator.objective(x)
+    evaluator.constraints(x)
+    assert (evaluator.n_batches, evaluator.n_designs) == (1, 1)
+
+    evaluator.objective_grad(x)
+    evaluator.constraints_jac(x)
+    assert (evaluator.n_batches, evaluator.n_designs) == (2, 1 + 2 * n)
+
+    # Central differences of the signed constraints
+    h = np.zeros(n)
+    h[3] = 1e-3
+    G_hi = evaluator.constraints(x + h)
+    G_lo = evaluator.constraints(x - h)
+    assert np.allclose(evaluator.dG[3], (G_hi - G_lo) / 2e-3)
+
+
+def test_refinement_with_active_power_constraint_stays_feasible(cfg):
+    cfg["operatingConditions"]["maxPower"] = 8000.0
+    res = run_optimization(copy.deepcopy(cfg), n_gen=30, pop_size=20, seed=4, verbose=False)
+    ref = refine(cfg, res.X)
+
+    assert ref.improved
+    assert np.all(ref.G <= 1e-9)
+    assert ref.thrust_gain > 0.0
+    # The power constraint limits the result
+    assert ref.G[0] > -1e-2
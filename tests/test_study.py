@@ -0,0 +1,62 @@
+import csv
+import os
+
+from src.study import RESULTS_NAME, cases_from_grid, run_study
+
+
+def _base(cfg):
+    cfg["optimization"].update({"n_restarts": 2, "n_gen": 3, "pop_size": 8})
+    return cfg
+
+
+def _table(out_dir):
+    with open(os.path.join(out_dir, RESULTS_NAME)) as f:
+        return list(csv.DictReader(f))
+
+
+def test_grid_cases_cover_every_combination(cfg):
+    grid = {"parameters": {"geometryGlobal.diameter": [0.2, 0.25], "operatingConditions.rpm": [9000, 10000, 11000]}}
+    rpm = cfg["operatingConditions"]["rpm"]
+    cases = cases_from_grid(grid, cfg)
+
+    assert [c["case_id"] for c in cases] == [f"case_{i:04d}" for i in range(6)]
+    assert cases[4]["params"] == {"geometryGlobal.diameter": 0.25, "operatingConditions.rpm": 10000}
+    assert cases[4]["cfg"]["geometryGlobal"]["diameter"] == 0.25
+    assert cases[4]["cfg"]["operatingConditions"]["rpm"] == 10000
+    assert cfg["operatingConditions"]["rpm"] == rpm
+
+
+def test_results_do_not_depend_on_workers(cfg, tmp_path):
+    cases = cases_from_grid({"parameters": {"operatingConditions.rpm": [11000, 12000]}}, _base(cfg))
+    serial = run_study(cases, str(tmp_path / "serial"), n_workers=1, master_seed=3)
+    pooled = run_study(cases, str(tmp_path / "pooled"), n_workers=3, master_seed=3)
+
+    for case_id, record in serial.items():
+        assert record["status"] == "ok"
+        assert (record["thrust"], record["best_seed"], record["X"]) == (
+            pooled[case_id]["thrust"], pooled[case_id]["best_seed"], pooled[case_id]["X"]
+        )
+
+
+def test_failing_case_is_recorded_and_rerun_on_resume(cfg, tmp_path, capsys):
+    out_dir = str(tmp_path / "study")
+    cases = cases_from_grid(
+        {"parameters": {"solver.backend": ["xrotor", "vortex"], "operatingConditions.rpm": [12000, 60000]}},
+        _base(cfg),
+    )
+    records = run_study(cases, out_dir, n_workers=2, master_seed=1)
+
+    statuses = {r["case_id"]: r["status"] for r in _table(out_dir)}
+    assert statuses == {"case_0000": "ok", "case_0001": "tip_mach", "case_0002": "failed", "case_0003": "tip_mach"}
+    assert "Unknown solver backend" in records["case_0002"]["error"]
+    assert [r["index"] for r in _table(out_dir)] == ["0", "1", "2", "3"]
+
+    # Resuming skips the finished cases and runs the failed one again
+    cases[2]["cfg"]["solver"]["backend"] = "bemt"
+    capsys.readouterr()
+    records = run_study(cases, out_dir, n_workers=2, master_seed=1, resume=True)
+
+    out = capsys.readouterr().out
+    assert out.count("already done, skipping") == 3
+    assert records["case_0002"]["status"] == "ok" and records["case_0002"]["error"] is None
+    assert {r["case_id"]: r["status"] for r in _table(out_dir)}["case_0002"] == "ok"